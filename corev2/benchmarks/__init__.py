@@ -0,0 +1 @@
+"""Micro-benchmarks (run as scripts: python -m corev2.benchmarks.<name>)."""
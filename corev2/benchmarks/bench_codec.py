@@ -0,0 +1,89 @@
+"""
+JSON codec micro-benchmark on a real plan artifact.
+
+Times stdlib json against orjson (when installed) for the plan file
+round-trip (indented and compact) and journal-style per-entry encoding.
+
+Usage:
+    python -m corev2.benchmarks.bench_codec [--plan corev2/artifacts/plan_X.json] [--repeat 5]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from corev2 import codec
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> float:
+    """Fastest of `repeat` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def _latest_plan() -> Path:
+    plans = sorted(Path("corev2/artifacts").glob("plan_*.json"))
+    if not plans:
+        raise SystemExit("No plan artifacts in corev2/artifacts - pass --plan")
+    return plans[-1]
+
+
+def run(plan_path: Path, repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmark encode/decode of one plan file.
+
+    Returns:
+        {case: {"json": ms, "orjson": ms}} (orjson omitted if not installed)
+    """
+    text = plan_path.read_text(encoding="utf-8")
+    plan = json.loads(text)
+    entries = [op for contact in plan.get("operations", []) for op in contact.get("operations", [])]
+
+    cases = {
+        "decode plan": (lambda: json.loads(text), lambda: codec.loads(text)),
+        "encode plan (indent=2)": (lambda: json.dumps(plan, indent=2), lambda: codec.dumps(plan, indent=True)),
+        "encode plan (compact)": (lambda: json.dumps(plan), lambda: codec.dumps(plan)),
+        f"encode {len(entries)} journal entries": (
+            lambda: [json.dumps(e) for e in entries],
+            lambda: [codec.dumps(e) for e in entries],
+        ),
+    }
+
+    results = {}
+    for name, (stdlib_fn, codec_fn) in cases.items():
+        results[name] = {"json": _best_of(stdlib_fn, repeat)}
+        if codec.BACKEND != "json":
+            results[name][codec.BACKEND] = _best_of(codec_fn, repeat)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the JSON codec on a plan artifact")
+    parser.add_argument("--plan", type=Path, help="Plan JSON (default: latest corev2/artifacts/plan_*.json)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (best is reported)")
+    args = parser.parse_args()
+
+    plan_path = args.plan or _latest_plan()
+    compact_size = len(codec.dumps_bytes(json.loads(plan_path.read_text(encoding="utf-8"))))
+    print(f"Plan: {plan_path} ({plan_path.stat().st_size / 1e6:.2f} MB indented, "
+          f"{compact_size / 1e6:.2f} MB compact)")
+    print(f"Codec backend: {codec.BACKEND}\n")
+
+    for name, timings in run(plan_path, args.repeat).items():
+        line = f"  {name:<34} json {timings['json']:8.2f} ms"
+        if codec.BACKEND in timings:
+            speedup = timings["json"] / timings[codec.BACKEND] if timings[codec.BACKEND] else float("inf")
+            line += f"   {codec.BACKEND} {timings[codec.BACKEND]:8.2f} ms   ({speedup:.1f}x)"
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Offline planning benchmark.
+
+Times PlannerEngine.plan - the whole plan, no API calls - on a synthetic
+population (HubSpot contacts + a Mailchimp audience holding most of them),
+or on planner inputs saved with `cli plan --snapshots PATH`.
+
+Usage:
+    python -m corev2.benchmarks.bench_planner [--config corev2/config/production.yaml] [--sizes 4000 40000]
+    python -m corev2.benchmarks.bench_planner --snapshots corev2/artifacts/snapshots.json
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from corev2.benchmarks.bench_membership import synthetic_contacts
+from corev2.config.loader import load_config
+from corev2.planner.planner_engine import (
+    HubSpotSnapshot, MailchimpSnapshot, PlannerEngine, load_snapshots
+)
+from corev2.planner.rules import compile_rules
+
+
+def synthetic_snapshots(config, count: int, seed: int = 7) -> Tuple[HubSpotSnapshot, MailchimpSnapshot]:
+    """
+    HubSpot contacts shaped like a real audience, ~90% already in Mailchimp
+    (half of those fully in sync), plus a few orphaned audience members.
+    """
+    rng = random.Random(seed)
+    rules = compile_rules(config)
+    tags = sorted(rules.source_tags)
+
+    contacts, audience = {}, []
+    for index, list_ids in enumerate(synthetic_contacts(rules, count, seed)):
+        email = f"contact{index}@example.com"
+        properties = {"email": email, "firstname": f"First{index}", "lastname": f"Last{index}",
+                      config.sync.ori_lists_field: ",".join(sorted(list_ids))}
+        contacts[email] = {"vid": str(index), "email": email, "properties": properties, "list_ids": list_ids}
+        if rng.random() < 0.9:
+            in_sync = rng.random() < 0.5
+            audience.append({
+                "email_address": email,
+                "status": "subscribed",
+                "tags": [rng.choice(tags)] if in_sync else [],
+                "merge_fields": {"FNAME": f"First{index}" if in_sync else "", "LNAME": f"Last{index}"},
+            })
+    for index in range(count // 100):
+        audience.append({"email_address": f"orphan{index}@example.com", "status": "subscribed",
+                         "tags": [rng.choice(tags)], "merge_fields": {}})
+
+    return HubSpotSnapshot(contacts=contacts), MailchimpSnapshot.from_audience(audience)
+
+
+def time_plan(
+    engine: PlannerEngine,
+    hubspot: HubSpotSnapshot,
+    mailchimp: MailchimpSnapshot,
+    stored_fingerprints: Optional[Dict[str, str]] = None,
+    repeat: int = 3
+) -> Tuple[float, Dict]:
+    """Fastest of `repeat` plans in ms, and the last plan."""
+    best, plan = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        plan = engine.plan(hubspot, mailchimp, stored_fingerprints)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, plan
+
+
+def run(config_path: str, sizes: List[int], repeat: int = 3, snapshots: Optional[str] = None) -> Dict:
+    """
+    Time offline planning for each population size (or for saved snapshots).
+
+    Returns:
+        {label: {"ms": best time, "contacts": n, "operations": n}}
+    """
+    # Benchmarks never call the APIs - placeholders satisfy ${...} resolution
+    for var in ("HUBSPOT_PRIVATE_APP_TOKEN", "MAILCHIMP_API_KEY", "MAILCHIMP_DC", "MAILCHIMP_LIST_ID"):
+        os.environ.setdefault(var, "benchmark")
+    config = load_config(config_path)
+    engine = PlannerEngine(config)
+
+    cases = []
+    if snapshots:
+        cases.append((snapshots, *load_snapshots(snapshots)))
+    else:
+        for size in sizes:
+            cases.append((f"{size:,} synthetic", *synthetic_snapshots(config, size), None))
+
+    results = {}
+    for label, hubspot, mailchimp, stored_fingerprints in cases:
+        elapsed, plan = time_plan(engine, hubspot, mailchimp, stored_fingerprints, repeat)
+        results[label] = {
+            "ms": elapsed,
+            "contacts": len(hubspot.contacts),
+            "operations": sum(plan["summary"]["operations_by_type"].values()),
+        }
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline planning benchmark")
+    parser.add_argument("--config", default="corev2/config/production.yaml", help="Config to plan with")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4_000, 40_000], help="Synthetic population sizes")
+    parser.add_argument("--snapshots", help="Planner inputs saved with `cli plan --snapshots` (replaces --sizes)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (fastest is reported)")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)  # per-contact logs would dominate the timing
+    results = run(args.config, args.sizes, args.repeat, args.snapshots)
+
+    print(f"{'case':>24} {'contacts':>9} {'operations':>11} {'plan':>10}")
+    for label, result in results.items():
+        print(f"{label:>24} {result['contacts']:>9,} {result['operations']:>11,} {result['ms']:>7.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,6 +17,7 @@ import argparse
 import sys
 import logging
 import os
+import time
 from pathlib import Path
 from typing import Optional
 
@@ -128,6 +129,97 @@ async def _refresh_list_names(config_path: Path, hs_client) -> None:
         logger.info("All config list names match HubSpot — no updates needed.")
 
 
+def _build_clients(config):
+    """Create HubSpot and Mailchimp clients with the configured rate limits and time budgets."""
+    from corev2.clients.http_base import ConnectionPoolSettings, RetryBudget
+    from corev2.clients.hubspot_client import HubSpotClient
+    from corev2.clients.mailchimp_client import MailchimpClient
+    
+    hs_rate = config.http.hubspot
+    mc_rate = config.http.mailchimp
+    pool = ConnectionPoolSettings(**config.http.pool.model_dump())
+    
+    budget = config.http.retry_budget
+    
+    def retry_budget():
+        # One budget per service: a flaky API shouldn't use up the other's retries
+        if not budget.enabled:
+            return None
+        return RetryBudget(ratio=budget.ratio, window=budget.window, min_retries=budget.min_retries)
+    
+    request_deadline = config.http.request_deadline or None
+    run_deadline = time.monotonic() + config.http.run_time_budget if config.http.run_time_budget else None
+    
+    hs_client = HubSpotClient(
+        api_key=config.hubspot.api_key.get_secret_value(),
+        rate_limit=hs_rate.rate,
+        adaptive_rate=hs_rate.adaptive,
+        min_rate=hs_rate.min_rate,
+        max_rate=hs_rate.max_rate,
+        pool=pool,
+        single_flight=config.http.single_flight,
+        response_cache_ttl=config.http.response_cache_ttl,
+        request_deadline=request_deadline,
+        retry_budget=retry_budget(),
+        run_deadline=run_deadline,
+        membership_prefetch=config.http.hubspot_membership_prefetch
+    )
+    mc_client = MailchimpClient(
+        api_key=config.mailchimp.api_key.get_secret_value(),
+        server_prefix=config.mailchimp.server_prefix,
+        audience_id=config.mailchimp.audience_id,
+        rate_limit=mc_rate.rate,
+        adaptive_rate=mc_rate.adaptive,
+        min_rate=mc_rate.min_rate,
+        max_rate=mc_rate.max_rate,
+        pool=pool,
+        single_flight=config.http.single_flight,
+        response_cache_ttl=config.http.response_cache_ttl,
+        request_deadline=request_deadline,
+        retry_budget=retry_budget(),
+        run_deadline=run_deadline
+    )
+    return hs_client, mc_client
+
+
+def _log_client_stats(*clients, top_endpoints: int = 5) -> None:
+    """Log per-client request totals, busiest endpoints, connection reuse and limiter state."""
+    for client in clients:
+        requests = client.metrics.summary()
+        logger.info(f"  {client.service_name} requests: {requests['requests']} "
+                    f"({requests['retries']} retries, {requests['throttled']} 429s, "
+                    f"{requests['server_errors']} 5xx, {requests['wait_seconds']:.1f}s rate-limit wait; "
+                    f"{requests['coalesced']} coalesced, {requests['cache_hits']} cached)")
+        for endpoint, stats in list(requests["endpoints"].items())[:top_endpoints]:
+            latency = stats["latency_ms"]
+            logger.info(f"    {endpoint}: {stats['count']} req, {latency['total'] / 1000:.1f}s total, "
+                        f"p50 {latency['p50']:.0f}ms / p95 {latency['p95']:.0f}ms / p99 {latency['p99']:.0f}ms")
+        connections = client.connection_metrics()
+        logger.info(f"  {client.service_name} connections: {connections['new']} new, "
+                    f"{connections['reused']} reused ({connections['reuse_ratio']:.0%} reuse)")
+        metrics = client.rate_limit_metrics()
+        if metrics:
+            logger.info(f"  {client.service_name} rate: {metrics['rate']} req/s "
+                        f"(ceiling {metrics['ceiling']}, {metrics['throttles']} throttled)")
+        budget = client.retry_budget_metrics()
+        if budget and budget["exhausted"]:
+            logger.warning(f"  {client.service_name} retry budget: {budget['exhausted']} retries refused")
+
+
+def _write_run_report(artifact_path: Path, phase: str, *clients) -> None:
+    """
+    Write the request metrics run report next to the plan artifact.
+    
+    Named run_report_<phase>_<plan stem>.json so it never matches the
+    workflow's plan_*.json lookup.
+    """
+    from corev2.clients.metrics import write_run_report
+    
+    report_path = artifact_path.with_name(f"run_report_{phase}_{artifact_path.stem}.json")
+    write_run_report(report_path, clients, phase)
+    logger.info(f"  Run report: {report_path}")
+
+
 def validate_config_mode(config_path: Path) -> int:
     """Validate config file and exit."""
     try:
@@ -147,15 +239,39 @@ def validate_config_mode(config_path: Path) -> int:
         return 1
 
 
-def plan_mode(config_path: Path, output_path: Path, only_email: Optional[str] = None, only_vid: Optional[str] = None) -> int:
+def plan_mode(
+    config_path: Path,
+    output_path: Path,
+    only_email: Optional[str] = None,
+    only_vid: Optional[str] = None,
+    compact: bool = False,
+    snapshots_path: Optional[Path] = None
+) -> int:
     """Generate operations plan (dry-run)."""
+    import asyncio
+    return asyncio.run(_plan(config_path, output_path, only_email=only_email, only_vid=only_vid,
+                             compact=compact, snapshots_path=snapshots_path))
+
+
+async def _plan(
+    config_path: Path,
+    output_path: Path,
+    only_email: Optional[str] = None,
+    only_vid: Optional[str] = None,
+    clients=None,
+    compact: bool = False,
+    snapshots_path: Optional[Path] = None
+) -> int:
+    """
+    Plan mode body; `clients` reuses an open (hs_client, mc_client) pair.
+    
+    The plan is written indented unless `compact` (one line, much smaller).
+    `snapshots_path` also saves the planner inputs (re-plan offline with PlannerEngine).
+    """
     try:
+        from corev2 import codec
         from corev2.config.loader import load_config, compute_config_hash
         from corev2.planner.primary import SyncPlanner
-        from corev2.clients.hubspot_client import HubSpotClient
-        from corev2.clients.mailchimp_client import MailchimpClient
-        import json
-        import asyncio
         
         logger.info(f"Loading config from: {config_path}")
         config = load_config(str(config_path))
@@ -164,64 +280,45 @@ def plan_mode(config_path: Path, output_path: Path, only_email: Optional[str] =
         logger.info(f"Config hash: {config_hash}")
         
         logger.info("Initializing API clients (read-only mode)...")
-        hs_client = HubSpotClient(
-            api_key=config.hubspot.api_key.get_secret_value(),
-            rate_limit=10.0
-        )
-        mc_client = MailchimpClient(
-            api_key=config.mailchimp.api_key.get_secret_value(),
-            server_prefix=config.mailchimp.server_prefix,
-            audience_id=config.mailchimp.audience_id,
-            rate_limit=10.0
-        )
+        hs_client, mc_client = clients or _build_clients(config)
         
-        logger.info("Generating operations plan...")
-        planner = SyncPlanner(config, hs_client, mc_client)
-
-        # Auto-refresh list names in YAML before planning
-        async def refresh_names():
-            async with hs_client:
-                await _refresh_list_names(config_path, hs_client)
-
-        asyncio.run(refresh_names())
-
-        # Reload config after potential name updates (hash must reflect current file)
-        config = load_config(str(config_path))
-        config_hash = compute_config_hash(config)
-        planner = SyncPlanner(config, hs_client, mc_client)
-
-        # Re-init client (session was closed by refresh_names)
-        hs_client = HubSpotClient(
-            api_key=config.hubspot.api_key.get_secret_value(),
-            rate_limit=10.0
-        )
-        mc_client = MailchimpClient(
-            api_key=config.mailchimp.api_key.get_secret_value(),
-            server_prefix=config.mailchimp.server_prefix,
-            audience_id=config.mailchimp.audience_id,
-            rate_limit=10.0
-        )
-        planner = SyncPlanner(config, hs_client, mc_client)
-        
-        # Use test_contact_limit if set
-        contact_limit = config.safety.test_contact_limit if config.safety.test_contact_limit > 0 else None
-        
-        # Log contact filters if set
-        if only_email:
-            logger.info(f"­ƒÄ» Filtering to single contact: {only_email}")
-        if only_vid:
-            logger.info(f"­ƒÄ» Filtering to single contact VID: {only_vid}")
-        
-        # Run async plan generation with context managers
-        async def generate_plan_with_clients():
-            async with hs_client, mc_client:
-                return await planner.generate_plan(
+        # One session per client for name refresh + planning (connections stay pooled)
+        async with hs_client, mc_client:
+            # Auto-refresh list names in YAML before planning
+            await _refresh_list_names(config_path, hs_client)
+
+            # Reload config after potential name updates (hash must reflect current file)
+            config = load_config(str(config_path))
+            config_hash = compute_config_hash(config)
+            
+            # Incremental runs: planner skips contacts unchanged since their last sync
+            state_store = None
+            if config.state.enabled:
+                from corev2.state import SyncStateStore
+                state_store = SyncStateStore(Path(config.state.path))
+                logger.info(f"Sync state: {config.state.path} ({len(state_store)} contacts)")
+            
+            logger.info("Generating operations plan...")
+            planner = SyncPlanner(config, hs_client, mc_client, state_store=state_store)
+            
+            # Use test_contact_limit if set
+            contact_limit = config.safety.test_contact_limit if config.safety.test_contact_limit > 0 else None
+            
+            # Log contact filters if set
+            if only_email:
+                logger.info(f"­ƒÄ» Filtering to single contact: {only_email}")
+            if only_vid:
+                logger.info(f"­ƒÄ» Filtering to single contact VID: {only_vid}")
+            
+            try:
+                plan = await planner.generate_plan(
                     contact_limit=contact_limit,
                     only_email=only_email,
                     only_vid=only_vid
                 )
-        
-        plan = asyncio.run(generate_plan_with_clients())
+            finally:
+                if state_store is not None:
+                    state_store.close()
         
         # Add config hash to metadata
         plan["metadata"]["config_hash"] = config_hash
@@ -230,12 +327,21 @@ def plan_mode(config_path: Path, output_path: Path, only_email: Optional[str] =
         # Save plan
         output_path.parent.mkdir(parents=True, exist_ok=True)
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(plan, f, indent=2)
+            codec.dump(plan, f, indent=not compact)
+        
+        if snapshots_path is not None:
+            from corev2.planner.planner_engine import save_snapshots
+            save_snapshots(snapshots_path, *planner.snapshots)
+            logger.info(f"Planner snapshots saved to: {snapshots_path}")
         
         logger.info(f"Ô£ô Plan saved to: {output_path}")
         logger.info(f"  Total contacts scanned: {plan['summary']['total_contacts_scanned']}")
         logger.info(f"  Contacts with operations: {plan['summary']['contacts_with_operations']}")
         logger.info(f"  Operations by type: {plan['summary']['operations_by_type']}")
+        logger.info(f"  No-ops skipped: {plan['summary'].get('noops_skipped', {})}")
+        logger.info(f"  Contacts unchanged since last sync: {plan['summary'].get('contacts_unchanged', 0)}")
+        _log_client_stats(hs_client, mc_client)
+        _write_run_report(output_path, "plan", hs_client, mc_client)
         
         return 0
     except Exception as e:
@@ -247,19 +353,22 @@ def plan_mode(config_path: Path, output_path: Path, only_email: Optional[str] =
 
 def apply_mode(plan_path: Path, dry_run: bool = False) -> int:
     """Execute operations from plan (LIVE MUTATIONS unless dry_run=True)."""
+    import asyncio
+    return asyncio.run(_apply(plan_path, dry_run=dry_run))
+
+
+async def _apply(plan_path: Path, dry_run: bool = False, clients=None) -> int:
+    """Apply mode body; `clients` reuses an open (hs_client, mc_client) pair."""
     try:
         from corev2.config.loader import load_config, compute_config_hash
         from corev2.config.schema import RunMode
         from corev2.executor.engine import SyncExecutor
-        from corev2.clients.hubspot_client import HubSpotClient
-        from corev2.clients.mailchimp_client import MailchimpClient
-        import json
-        import asyncio
+        from corev2 import codec
         
         # Load plan
         logger.info(f"Loading operations plan from: {plan_path}")
         with open(plan_path, encoding='utf-8') as f:
-            plan_data = json.load(f)
+            plan_data = codec.load(f)
         
         # Load config referenced in plan
         config_path = plan_data.get("metadata", {}).get("config_file")
@@ -330,16 +439,13 @@ def apply_mode(plan_path: Path, dry_run: bool = False) -> int:
         
         # Initialize clients
         logger.info("Initializing API clients...")
-        hs_client = HubSpotClient(
-            api_key=config.hubspot.api_key.get_secret_value(),
-            rate_limit=10.0
-        )
-        mc_client = MailchimpClient(
-            api_key=config.mailchimp.api_key.get_secret_value(),
-            server_prefix=config.mailchimp.server_prefix,
-            audience_id=config.mailchimp.audience_id,
-            rate_limit=10.0
-        )
+        hs_client, mc_client = clients or _build_clients(config)
+        
+        # Sync state store (updated as contacts complete)
+        state_store = None
+        if config.state.enabled and not dry_run:
+            from corev2.state import SyncStateStore
+            state_store = SyncStateStore(Path(config.state.path))
         
         # Execute plan
         async def run_execution():
@@ -364,6 +470,7 @@ def apply_mode(plan_path: Path, dry_run: bool = False) -> int:
                             "successful": 0,
                             "failed": 0,
                             "skipped": 0,
+                            "deferred": 0,
                             "contacts_processed": 0,
                             "dry_run": dry_run,
                             "audience_cap": {
@@ -375,13 +482,31 @@ def apply_mode(plan_path: Path, dry_run: bool = False) -> int:
                         }, None
                 # ── End cap pre-flight ─────────────────────────────────
 
-                # STEP 1: Sync unsubscribes from Mailchimp → HubSpot
+                # STEP 0: One shared Mailchimp audience scan for every detector below
+                audience_scan = None
+                run_secondary = config.secondary_sync.enabled and config.secondary_sync.mappings
                 if not dry_run:
-                    logger.info("🔄 Step 1: Syncing Mailchimp unsubscribes to HubSpot...")
+                    from corev2.sync.audience_scan import AudienceScan
                     from corev2.sync.unsubscribe_sync import UnsubscribeSyncEngine
+                    from corev2.planner.secondary import SecondaryPlanner
                     
                     unsub_engine = UnsubscribeSyncEngine(config, hs_client, mc_client)
-                    unsub_results = await unsub_engine.scan_and_sync()
+                    secondary_planner = SecondaryPlanner(config, hs_client, mc_client) if run_secondary else None
+                    
+                    logger.info("🔄 Step 0: Scanning Mailchimp audience...")
+                    audience_scan = AudienceScan(mc_client, concurrency=config.sync.audience_scan_concurrency)
+                    audience_scan.register("unsubscribed", unsub_engine.is_unsubscribed)
+                    audience_scan.register("cleaned", unsub_engine.is_cleaned)
+                    if secondary_planner is not None:
+                        audience_scan.register("exit_tags", secondary_planner.has_exit_tag)
+                    await audience_scan.run()
+                
+                # STEP 1: Sync unsubscribes from Mailchimp → HubSpot
+                if not dry_run:
+                    logger.info("🔄 Step 1: Syncing Mailchimp unsubscribes to HubSpot...")
+                    unsub_results = await unsub_engine.scan_and_sync(
+                        members=audience_scan.results("unsubscribed")
+                    )
                     
                     logger.info(f"✔ Unsubscribe sync complete:")
                     logger.info(f"  Mailchimp unsubscribed: {unsub_results['mailchimp_unsubscribed']}")
@@ -392,7 +517,9 @@ def apply_mode(plan_path: Path, dry_run: bool = False) -> int:
 
                     # STEP 1B: Sync cleaned (hard-bounced) contacts from Mailchimp → HubSpot
                     logger.info("🔄 Step 1B: Syncing Mailchimp cleaned (hard-bounce) contacts to HubSpot...")
-                    cleaned_results = await unsub_engine.scan_cleaned_and_sync()
+                    cleaned_results = await unsub_engine.scan_cleaned_and_sync(
+                        members=audience_scan.results("cleaned")
+                    )
                     logger.info(f"✔ Cleaned contact sync complete:")
                     logger.info(f"  Mailchimp cleaned: {cleaned_results['mailchimp_cleaned']}")
                     logger.info(f"  Tags stripped: {cleaned_results['tags_removed']}")
@@ -409,17 +536,23 @@ def apply_mode(plan_path: Path, dry_run: bool = False) -> int:
                 
                 # STEP 2: Execute primary sync operations
                 logger.info("🔄 Step 2: Executing primary sync operations...")
-                executor = SyncExecutor(config, hs_client, mc_client, dry_run=dry_run, cap_guard=cap_guard)
+                executor = SyncExecutor(
+                    config, hs_client, mc_client,
+                    dry_run=dry_run, cap_guard=cap_guard, state_store=state_store
+                )
                 primary_results = await executor.execute_plan(plan_data)
                 
                 # STEP 3: Secondary Sync (Mailchimp exit tags → HubSpot handover lists)
                 secondary_results = None
-                if not dry_run and config.secondary_sync.enabled and config.secondary_sync.mappings:
+                if not dry_run and run_secondary:
                     logger.info("Step 3: Secondary Sync (Mailchimp exit tags → HubSpot handover lists)...")
-                    from corev2.planner.secondary import SecondaryPlanner
                     
-                    secondary_planner = SecondaryPlanner(config, hs_client, mc_client)
-                    secondary_plan = await secondary_planner.generate_plan()
+                    # The shared scan predates Step 2 - ignore members Step 2 actually archived
+                    secondary_plan = await secondary_planner.generate_plan(
+                        members=audience_scan.results("exit_tags"),
+                        total_scanned=audience_scan.scanned,
+                        skip_emails=executor.archived_emails
+                    )
                     
                     sec_summary = secondary_plan["summary"]
                     logger.info(f"  Mailchimp scanned: {sec_summary['total_mailchimp_scanned']}")
@@ -437,7 +570,10 @@ def apply_mode(plan_path: Path, dry_run: bool = False) -> int:
                             logger.warning("Secondary sync has archive ops but allow_archive=false, skipping execution")
                         else:
                             logger.info("Executing secondary sync operations...")
-                            sec_executor = SyncExecutor(config, hs_client, mc_client, dry_run=False, cap_guard=cap_guard)
+                            sec_executor = SyncExecutor(
+                                config, hs_client, mc_client,
+                                dry_run=False, cap_guard=cap_guard, state_store=state_store
+                            )
                             secondary_results = await sec_executor.execute_plan(secondary_plan)
                             
                             logger.info("Secondary Sync Complete:")
@@ -457,7 +593,11 @@ def apply_mode(plan_path: Path, dry_run: bool = False) -> int:
         if not dry_run:
             logger.info("🚀 EXECUTING LIVE OPERATIONS 🚀")
         
-        result = asyncio.run(run_execution())
+        try:
+            result = await run_execution()
+        finally:
+            if state_store is not None:
+                state_store.close()
 
         # Preflight abort returns a single tuple element
         if isinstance(result, tuple) and len(result) == 2:
@@ -479,7 +619,11 @@ def apply_mode(plan_path: Path, dry_run: bool = False) -> int:
         logger.info(f"  Successful: {primary_results['successful']}")
         logger.info(f"  Failed: {primary_results['failed']}")
         logger.info(f"  Skipped: {primary_results['skipped']}")
+        if primary_results.get("deferred"):
+            logger.warning(f"  Deferred (retry/time budget, re-planned next run): {primary_results['deferred']}")
         logger.info(f"  Contacts processed: {primary_results['contacts_processed']}")
+        _log_client_stats(hs_client, mc_client)
+        _write_run_report(plan_path, "apply", hs_client, mc_client)
 
         # Log audience cap stats if present
         cap_info = primary_results.get("audience_cap")
@@ -504,7 +648,7 @@ def apply_mode(plan_path: Path, dry_run: bool = False) -> int:
 
 
 
-def sync_mode(config_path: Path, dry_run: bool = False) -> int:
+def sync_mode(config_path: Path, dry_run: bool = False, compact: bool = False) -> int:
     """Full sync pipeline: plan + apply + secondary in one command."""
     from datetime import datetime
     
@@ -515,13 +659,24 @@ def sync_mode(config_path: Path, dry_run: bool = False) -> int:
     logger.info("  Full Sync: Plan \u2192 Apply \u2192 Secondary")
     logger.info("=" * 70)
     
-    # Generate plan
-    result = plan_mode(config_path, output_path)
-    if result != 0:
-        return result
+    import asyncio
+    return asyncio.run(_sync(config_path, output_path, dry_run=dry_run, compact=compact))
+
+
+async def _sync(config_path: Path, output_path: Path, dry_run: bool = False, compact: bool = False) -> int:
+    """Plan then apply on one event loop, sharing one session per API client."""
+    from corev2.config.loader import load_config
+    
+    hs_client, mc_client = _build_clients(load_config(str(config_path)))
     
-    # Apply plan (includes unsubscribe sync + primary + secondary)
-    return apply_mode(output_path, dry_run=dry_run)
+    async with hs_client, mc_client:
+        # Generate plan
+        result = await _plan(config_path, output_path, clients=(hs_client, mc_client), compact=compact)
+        if result != 0:
+            return result
+        
+        # Apply plan (includes unsubscribe sync + primary + secondary)
+        return await _apply(output_path, dry_run=dry_run, clients=(hs_client, mc_client))
 
 
 def main():
@@ -561,6 +716,10 @@ Examples:
                        help="Filter to single contact by email (plan mode only)")
     parser.add_argument("--only-vid", type=str,
                        help="Filter to single contact by VID (plan mode only)")
+    parser.add_argument("--compact", action="store_true",
+                       help="Write the plan as compact (non-indented) JSON (plan/sync modes)")
+    parser.add_argument("--snapshots", type=Path,
+                       help="Also save the HubSpot/Mailchimp snapshots the plan was built from (plan mode only)")
     
     args = parser.parse_args()
     
@@ -573,7 +732,9 @@ Examples:
                 args.config,
                 args.output,
                 only_email=getattr(args, 'only_email', None),
-                only_vid=getattr(args, 'only_vid', None)
+                only_vid=getattr(args, 'only_vid', None),
+                compact=args.compact,
+                snapshots_path=args.snapshots
             )
         
         elif args.mode == "apply":
@@ -583,7 +744,7 @@ Examples:
             return apply_mode(args.plan, dry_run=args.dry_run)
         
         elif args.mode == "sync":
-            return sync_mode(args.config, dry_run=args.dry_run)
+            return sync_mode(args.config, dry_run=args.dry_run, compact=args.compact)
     
     except KeyboardInterrupt:
         logger.info("\nInterrupted by user")
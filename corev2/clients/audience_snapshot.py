@@ -0,0 +1,97 @@
+"""
+In-memory snapshot of the Mailchimp audience.
+
+Pages the full audience once (1,000 members per page) and indexes it by
+lowercase email, so the planner can read current status/tags/merge_fields
+without one GET per contact. Archived members are not part of the default
+listing, so they are paged in a second, status=archived pass - otherwise a
+returning archived member would be planned as brand new (losing first-tag
+priority on the source tag it still carries).
+"""
+
+import logging
+from typing import Dict, Any, Iterator, Optional
+
+from .mailchimp_client import MailchimpClient
+
+
+logger = logging.getLogger(__name__)
+
+
+class AudienceSnapshot:
+    """Mailchimp audience index keyed by lowercase email."""
+
+    def __init__(self):
+        self.members: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    async def load(cls, mc_client: MailchimpClient, count: int = 1000, concurrency: int = 1) -> "AudienceSnapshot":
+        """
+        Page the full audience (plus archived members) into a new snapshot.
+
+        Args:
+            mc_client: Mailchimp API client (inside async with)
+            count: Members per page (max 1000)
+            concurrency: Pages fetched in parallel
+
+        Returns:
+            Loaded AudienceSnapshot
+        """
+        snapshot = cls()
+        logger.info("Loading Mailchimp audience snapshot...")
+
+        async for member in mc_client.get_all_members(count=count, concurrency=concurrency):
+            snapshot.add(member)
+            if len(snapshot) % 1000 == 0:
+                logger.info(f"  Snapshot: {len(snapshot)} members loaded...")
+
+        archived = 0
+        async for member in mc_client.get_all_members(count=count, concurrency=concurrency, status="archived"):
+            snapshot.add(member)
+            archived += 1
+
+        logger.info(f"  Snapshot complete: {len(snapshot)} members ({archived} archived)")
+        return snapshot
+
+    def add(self, member: Dict[str, Any]):
+        """
+        Index one member (as yielded by MailchimpClient.get_all_members).
+
+        Args:
+            member: {"email_address", "status", "tags", "merge_fields"}
+        """
+        email = (member.get("email_address") or "").lower()
+        if not email:
+            return
+        self.members[email] = {
+            "email_address": member.get("email_address"),
+            "status": member.get("status"),
+            "tags": list(member.get("tags", [])),
+            "merge_fields": member.get("merge_fields", {}) or {},
+        }
+
+    def get(self, email: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a member in the same shape as MailchimpClient.get_member.
+
+        Args:
+            email: Member email address (any case)
+
+        Returns:
+            {"found": True, "status", "tags", "merge_fields", "email_address"},
+            or None if the email is not in the snapshot
+        """
+        member = self.members.get(email.lower())
+        if member is None:
+            return None
+        return {"found": True, **member}
+
+    def iter_members(self) -> Iterator[Dict[str, Any]]:
+        """Iterate members in get_all_members shape (for in-memory scans; archived members excluded, as in a live scan)."""
+        return (member for member in self.members.values() if member["status"] != "archived")
+
+    def __contains__(self, email: str) -> bool:
+        return email.lower() in self.members
+
+    def __len__(self) -> int:
+        return len(self.members)
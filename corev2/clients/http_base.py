@@ -3,15 +3,20 @@ Base HTTP client with retry/backoff, rate limiting, and circuit breaker.
 """
 
 import asyncio
+import copy
 import logging
 import time
 import random
+from collections import deque
 from enum import Enum
 from typing import Optional, Dict, Any
 from dataclasses import dataclass, field
 
 import aiohttp
 
+from corev2 import codec
+from .metrics import RequestCall, RequestMetrics
+
 
 logger = logging.getLogger(__name__)
 
@@ -108,11 +113,196 @@ class TokenBucket:
             await asyncio.sleep(wait_time)
 
 
+@dataclass
+class AdaptiveTokenBucket(TokenBucket):
+    """
+    Token bucket whose rate follows the server's rate-limit signals (AIMD).
+    
+    Each successful response adds `increase` req/s, up to the ceiling. A 429,
+    or a quota window that is nearly used up, multiplies the rate by
+    `decrease` - the latter at most once per quota window, since every
+    response near the end of a window reports low remaining. The ceiling
+    starts at max_rate and is lowered to the quota the server advertises
+    (e.g. HubSpot's X-HubSpot-RateLimit-* headers).
+    """
+    min_rate: float = 1.0
+    max_rate: float = 10.0
+    increase: float = 0.1  # req/s added per successful response
+    decrease: float = 0.5  # rate multiplier on throttle
+    low_remaining_ratio: float = 0.1  # back off when this share of the window is left
+    
+    ceiling: float = field(init=False)
+    throttles: int = field(default=0, init=False)
+    quota_decreased_at: float = field(default=float("-inf"), init=False)  # monotonic time of last quota back-off
+    
+    def __post_init__(self):
+        super().__post_init__()
+        self.ceiling = self.max_rate
+        self.rate = min(max(self.rate, self.min_rate), self.ceiling)
+    
+    def record_success(self):
+        """Additive increase after a successful response."""
+        self.rate = min(self.ceiling, self.rate + self.increase)
+    
+    def record_throttle(self):
+        """Multiplicative decrease after a 429 (and drop any saved-up burst)."""
+        self.throttles += 1
+        self._decrease()
+        self.tokens = 0.0
+    
+    def observe_quota(self, remaining: int, maximum: int, interval_seconds: float):
+        """
+        Apply a server-reported quota window.
+        
+        Args:
+            remaining: Requests left in the current window
+            maximum: Requests allowed per window
+            interval_seconds: Window length
+        """
+        if maximum <= 0 or interval_seconds <= 0:
+            return
+        
+        self.ceiling = max(self.min_rate, min(self.max_rate, maximum / interval_seconds))
+        self.rate = min(self.rate, self.ceiling)
+        
+        if remaining <= maximum * self.low_remaining_ratio:
+            now = time.monotonic()
+            if now - self.quota_decreased_at >= interval_seconds:
+                self.quota_decreased_at = now
+                self._decrease()
+    
+    def _decrease(self):
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Current limiter state for run reports."""
+        return {
+            "rate": round(self.rate, 2),
+            "ceiling": round(self.ceiling, 2),
+            "throttles": self.throttles,
+        }
+
+
+@dataclass
+class ConnectionPoolSettings:
+    """Connection pool, keep-alive and timeout settings for a client session."""
+    limit: int = 100  # Max open connections
+    limit_per_host: int = 10  # Max connections per host
+    keepalive_timeout: float = 30.0  # Seconds an idle connection is kept for reuse
+    dns_cache_ttl: int = 300  # Seconds DNS lookups are cached
+    connect_timeout: float = 10.0
+    read_timeout: float = 60.0  # Max seconds between received bytes
+    total_timeout: float = 300.0  # Max seconds per request attempt
+
+
+class PauseGate:
+    """
+    Client-wide pause after a 429.
+    
+    pause() holds back every request to the service until the window
+    passes (extending, never shortening, an active pause). Waiters are then
+    let through `release_interval` seconds apart instead of all at once.
+    """
+    
+    def __init__(self, release_interval: float = 0.1):
+        self.release_interval = release_interval
+        self.paused_until = 0.0
+        self.pauses = 0
+        self._next_release = 0.0
+    
+    def pause(self, seconds: float):
+        """Block new requests for `seconds` from now."""
+        until = time.monotonic() + seconds
+        if until > self.paused_until:
+            self.paused_until = until
+            self.pauses += 1
+    
+    @property
+    def is_paused(self) -> bool:
+        return time.monotonic() < self.paused_until
+    
+    async def wait(self):
+        """Return once the gate is open and this caller's release slot has come."""
+        while True:
+            now = time.monotonic()
+            if now >= self.paused_until and now >= self._next_release:
+                return
+            
+            slot = max(self.paused_until, self._next_release)
+            self._next_release = slot + self.release_interval
+            await asyncio.sleep(slot - now)
+            
+            # Re-paused while waiting (another 429) - queue again
+            if time.monotonic() >= self.paused_until:
+                return
+
+
+class RetryBudgetExhausted(RuntimeError):
+    """
+    A request could not be retried within its deadline or retry budget.
+    
+    Raised instead of sleeping, so callers can defer the work and move on.
+    """
+
+
+class RetryBudget:
+    """
+    Caps a service's retries at a share of its recent requests.
+    
+    Within a sliding `window` (seconds), retries may not exceed `ratio` of
+    the requests started, except that `min_retries` are always allowed so a
+    quiet client can still ride out a single blip.
+    """
+    
+    def __init__(self, ratio: float = 0.2, window: float = 60.0, min_retries: int = 10):
+        self.ratio = ratio
+        self.window = window
+        self.min_retries = min_retries
+        self.exhausted = 0
+        self._requests: deque = deque()
+        self._retries: deque = deque()
+    
+    def _trim(self, now: float):
+        for times in (self._requests, self._retries):
+            while times and times[0] <= now - self.window:
+                times.popleft()
+    
+    def record_request(self):
+        """Count a new logical request."""
+        now = time.monotonic()
+        self._trim(now)
+        self._requests.append(now)
+    
+    def try_retry(self) -> bool:
+        """Spend one retry if the window allows it."""
+        now = time.monotonic()
+        self._trim(now)
+        if len(self._retries) + 1 > max(self.min_retries, self.ratio * len(self._requests)):
+            self.exhausted += 1
+            return False
+        self._retries.append(now)
+        return True
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Current window state for run reports."""
+        self._trim(time.monotonic())
+        return {
+            "requests": len(self._requests),
+            "retries": len(self._retries),
+            "exhausted": self.exhausted,
+        }
+
+
 class HTTPBaseClient:
     """
     Base HTTP client with resilience features:
     - Exponential backoff with jitter
     - Rate limiting (token bucket)
+    - Client-wide pause on 429 (PauseGate)
+    - Per-request and run deadlines, per-service retry budget (fail fast, no sleep)
+    - Pooled keep-alive connections; one session shared by nested `async with`
+    - Per-endpoint request metrics (self.metrics)
+    - Single-flight GETs and an optional short-TTL response cache
     - Circuit breaker
     - Request/response logging
     """
@@ -125,7 +315,16 @@ class HTTPBaseClient:
         rate_limit: Optional[float] = None,  # requests per second
         rate_burst: Optional[float] = None,  # burst capacity
         circuit_threshold: int = 5,
-        circuit_timeout: float = 60.0
+        circuit_timeout: float = 60.0,
+        adaptive_rate: bool = False,
+        min_rate: Optional[float] = None,  # adaptive floor (default: rate_limit / 10)
+        max_rate: Optional[float] = None,  # adaptive ceiling (default: rate_limit)
+        pool: Optional[ConnectionPoolSettings] = None,
+        single_flight: bool = True,  # concurrent identical GETs share one request
+        response_cache_ttl: float = 0.0,  # seconds to reuse GET responses (0 = off)
+        request_deadline: Optional[float] = None,  # seconds per request incl. retries
+        retry_budget: Optional[RetryBudget] = None,
+        run_deadline: Optional[float] = None  # time.monotonic() after which requests fail fast
     ):
         self.service_name = service_name
         self.base_url = base_url.rstrip("/")
@@ -133,23 +332,146 @@ class HTTPBaseClient:
         self.default_headers: Dict[str, str] = {}  # Child classes can set this
         
         self.session: Optional[aiohttp.ClientSession] = None
+        self.pool = pool or ConnectionPoolSettings()
+        self.connection_stats = {"new": 0, "reused": 0}
+        self._session_users = 0
         self.circuit_breaker = CircuitBreaker(threshold=circuit_threshold, timeout=circuit_timeout)
+        self.pause_gate = PauseGate()
+        self.metrics = RequestMetrics(service_name)
+        
+        # Time/retry limits: exceeding them raises RetryBudgetExhausted instead of waiting
+        self.request_deadline = request_deadline
+        self.retry_budget = retry_budget
+        self.run_deadline = run_deadline
+        
+        # GET sharing: in-flight futures and cached responses, keyed by request;
+        # every write bumps the generation so older GETs are never reused after it
+        self.single_flight = single_flight
+        self.response_cache_ttl = response_cache_ttl
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._response_cache: Dict[tuple, tuple] = {}
+        self._write_generation = 0
         
         # Rate limiter (optional)
         self.rate_limiter: Optional[TokenBucket] = None
         if rate_limit:
             capacity = rate_burst if rate_burst else rate_limit * 2
-            self.rate_limiter = TokenBucket(rate=rate_limit, capacity=capacity)
+            if adaptive_rate:
+                self.rate_limiter = AdaptiveTokenBucket(
+                    rate=rate_limit,
+                    capacity=capacity,
+                    min_rate=min_rate or rate_limit / 10,
+                    max_rate=max_rate or rate_limit
+                )
+            else:
+                self.rate_limiter = TokenBucket(rate=rate_limit, capacity=capacity)
     
     async def __aenter__(self):
-        """Async context manager entry."""
-        self.session = aiohttp.ClientSession()
+        """
+        Async context manager entry.
+        
+        Nested entries share one session (and its pooled connections); it is
+        closed when the outermost block exits.
+        """
+        if self.session is None or self.session.closed:
+            self.session = self._create_session()
+        self._session_users += 1
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
-        if self.session:
+        self._session_users = max(0, self._session_users - 1)
+        if self._session_users == 0 and self.session:
             await self.session.close()
+            self.session = None
+    
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Session with a tuned connector, explicit timeouts and connection tracing."""
+        connector = aiohttp.TCPConnector(
+            limit=self.pool.limit,
+            limit_per_host=self.pool.limit_per_host,
+            keepalive_timeout=self.pool.keepalive_timeout,
+            ttl_dns_cache=self.pool.dns_cache_ttl,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=self.pool.total_timeout,
+            connect=self.pool.connect_timeout,
+            sock_read=self.pool.read_timeout,
+        )
+        
+        trace = aiohttp.TraceConfig()
+        
+        async def on_connection_create_end(session, context, params):
+            self.connection_stats["new"] += 1
+        
+        async def on_connection_reuseconn(session, context, params):
+            self.connection_stats["reused"] += 1
+        
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            trace_configs=[trace],
+            json_serialize=codec.dumps
+        )
+    
+    def connection_metrics(self) -> Dict[str, Any]:
+        """New vs reused connections over this client's lifetime."""
+        new, reused = self.connection_stats["new"], self.connection_stats["reused"]
+        total = new + reused
+        return {
+            "new": new,
+            "reused": reused,
+            "reuse_ratio": round(reused / total, 3) if total else 0.0,
+        }
+    
+    def _observe_rate_limit(self, status: int, headers: Dict[str, str]):
+        """
+        Feed a response's rate-limit signals to an adaptive limiter.
+        
+        Subclasses extend this to read service-specific quota headers.
+        """
+        if not isinstance(self.rate_limiter, AdaptiveTokenBucket):
+            return
+        if status == 429:
+            self.rate_limiter.record_throttle()
+        elif status < 400:
+            self.rate_limiter.record_success()
+    
+    def rate_limit_metrics(self) -> Optional[Dict[str, Any]]:
+        """Adaptive limiter state ({"rate", "ceiling", "throttles"}), or None if fixed."""
+        if isinstance(self.rate_limiter, AdaptiveTokenBucket):
+            return self.rate_limiter.metrics()
+        return None
+    
+    def retry_budget_metrics(self) -> Optional[Dict[str, Any]]:
+        """Retry budget window ({"requests", "retries", "exhausted"}), or None if unlimited."""
+        if self.retry_budget is not None:
+            return self.retry_budget.metrics()
+        return None
+    
+    def _deadline(self, call: RequestCall) -> Optional[float]:
+        """Monotonic time a request must finish by (request or run deadline), if any."""
+        deadlines = [self.run_deadline]
+        if self.request_deadline:
+            deadlines.append(call.started + self.request_deadline)
+        deadlines = [d for d in deadlines if d is not None]
+        return min(deadlines) if deadlines else None
+    
+    def _check_retry(self, method: str, path: str, call: RequestCall, wait_time: float):
+        """Raise RetryBudgetExhausted rather than wait `wait_time`s for a retry that can't be afforded."""
+        deadline = self._deadline(call)
+        if deadline is not None and time.monotonic() + wait_time > deadline:
+            raise RetryBudgetExhausted(
+                f"{self.service_name} {method} {path}: retry in {wait_time:.1f}s would pass the deadline"
+            )
+        if self.retry_budget is not None and not self.retry_budget.try_retry():
+            raise RetryBudgetExhausted(
+                f"{self.service_name} {method} {path}: retry budget exhausted "
+                f"({self.retry_budget.ratio:.0%} of requests in {self.retry_budget.window:.0f}s)"
+            )
     
     def _calculate_backoff(self, attempt: int) -> float:
         """
@@ -217,8 +539,155 @@ class HTTPBaseClient:
             
         Raises:
             aiohttp.ClientError: After max retries exhausted
+            RetryBudgetExhausted: A retry would pass a deadline or exceed the retry budget
             RuntimeError: Circuit breaker open
         """
+        if method == "GET":
+            key = self._get_key(path, headers, expect_json, kwargs)
+            if key is not None and (self.single_flight or self.response_cache_ttl > 0):
+                return await self._shared_get(key, path, headers, expect_json, **kwargs)
+            return await self._record(method, path, headers, expect_json, **kwargs)
+        
+        # Writes invalidate cached GETs of the resource before and after they run
+        self._invalidate(path)
+        try:
+            return await self._record(method, path, headers, expect_json, **kwargs)
+        finally:
+            self._invalidate(path)
+    
+    async def _record(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]],
+        expect_json: bool,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Send one request and add it to self.metrics."""
+        call = RequestCall(bytes_sent=self._payload_size(kwargs))
+        try:
+            return await self._send(method, path, headers, expect_json, call, **kwargs)
+        finally:
+            self.metrics.record(method, path, call)
+    
+    @staticmethod
+    def _get_key(
+        path: str,
+        headers: Optional[Dict[str, str]],
+        expect_json: bool,
+        kwargs: Dict[str, Any]
+    ) -> Optional[tuple]:
+        """Identity of a GET for sharing (None if it carries anything beyond params)."""
+        if set(kwargs) - {"params"}:
+            return None
+        identity = codec.dumps({"params": kwargs.get("params"), "headers": headers}, sort_keys=True, default=str)
+        return (path, expect_json, identity)
+    
+    async def _shared_get(
+        self,
+        key: tuple,
+        path: str,
+        headers: Optional[Dict[str, str]],
+        expect_json: bool,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        GET through the response cache and single-flight layer.
+        
+        Callers joining an in-flight request or hitting the cache get their
+        own copy of the result. If the caller that owns the request is
+        cancelled, its joiners issue the request again instead.
+        """
+        if self.response_cache_ttl > 0:
+            cached = self._response_cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self.metrics.record_shared("GET", path, "cache_hits")
+                return copy.deepcopy(cached[1])
+        
+        generation = self._write_generation
+        flight_key = (generation, key)
+        
+        while self.single_flight and flight_key in self._inflight:
+            shared = self._inflight[flight_key]
+            self.metrics.record_shared("GET", path, "coalesced")
+            try:
+                return copy.deepcopy(await asyncio.shield(shared))
+            except asyncio.CancelledError:
+                # Only the owner was cancelled (e.g. a stopped worker) - take over the request
+                if not shared.cancelled() or asyncio.current_task().cancelling():
+                    raise
+        
+        flight = asyncio.get_running_loop().create_future()
+        flight.add_done_callback(lambda f: f.cancelled() or f.exception())  # no "never retrieved" warnings
+        if self.single_flight:
+            self._inflight[flight_key] = flight
+        
+        try:
+            result = await self._record("GET", path, headers, expect_json, **kwargs)
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(flight_key, None)
+        
+        flight.set_result(result)
+        # Only cache if no write to this client happened while the GET was in flight
+        if self.response_cache_ttl > 0 and generation == self._write_generation:
+            self._response_cache[key] = (time.monotonic() + self.response_cache_ttl, copy.deepcopy(result))
+        return result
+    
+    def _invalidation_root(self, path: str) -> Optional[str]:
+        """
+        Resource path whose cached GETs a write to `path` invalidates.
+        
+        Subclasses widen it for resources reachable by several paths, or
+        return None for read-only POSTs.
+        """
+        return path.split("?", 1)[0]
+    
+    def _invalidate(self, path: str):
+        """Drop cached GETs at, above or below the written resource."""
+        root = self._invalidation_root(path)
+        if root is None:
+            return
+        
+        self._write_generation += 1
+        for key in list(self._response_cache):
+            cached = key[0].split("?", 1)[0]
+            if cached == root or cached.startswith(root + "/") or root.startswith(cached + "/"):
+                del self._response_cache[key]
+    
+    @staticmethod
+    def _payload_size(kwargs: Dict[str, Any]) -> int:
+        """Approximate request body size in bytes (json= or data=)."""
+        if kwargs.get("json") is not None:
+            return len(codec.dumps_bytes(kwargs["json"]))
+        data = kwargs.get("data")
+        if isinstance(data, str):
+            return len(data.encode())
+        if isinstance(data, (bytes, bytearray)):
+            return len(data)
+        return 0
+    
+    @staticmethod
+    def _received_size(response) -> int:
+        """Response body bytes read so far (0 if the response doesn't track it)."""
+        size = getattr(getattr(response, "content", None), "total_bytes", 0)
+        return size if isinstance(size, int) else 0
+    
+    async def _send(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]],
+        expect_json: bool,
+        call: RequestCall,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """_request body: retries, backoff and circuit breaker; fills in `call`."""
         if not self.session:
             raise RuntimeError("Client not initialized (use async with)")
         
@@ -226,9 +695,16 @@ class HTTPBaseClient:
         if not self.circuit_breaker.allow_request():
             raise RuntimeError(f"{self.service_name} circuit breaker OPEN")
         
+        if self.run_deadline is not None and time.monotonic() >= self.run_deadline:
+            raise RetryBudgetExhausted(f"{self.service_name} {method} {path}: run time budget used up")
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
+        
         # Rate limiting
         if self.rate_limiter:
+            waited = time.monotonic()
             await self.rate_limiter.acquire()
+            call.wait_seconds += time.monotonic() - waited
         
         # Merge headers (request headers override defaults)
         merged_headers = {**self.default_headers, **(headers or {})}
@@ -236,34 +712,62 @@ class HTTPBaseClient:
         url = f"{self.base_url}{path}"
         
         for attempt in range(self.max_retries):
+            # A 429 on any request pauses every request to this service
+            deadline = self._deadline(call)
+            if deadline is not None and self.pause_gate.paused_until > deadline:
+                raise RetryBudgetExhausted(f"{self.service_name} {method} {path}: "
+                                           f"rate-limit pause outlasts the deadline")
+            waited = time.monotonic()
+            await self.pause_gate.wait()
+            call.wait_seconds += time.monotonic() - waited
+            call.attempts += 1
+            
+            # Cap the attempt's own timeout at the time left before the deadline
+            attempt_kwargs = kwargs
+            capped = False
+            if deadline is not None and "timeout" not in kwargs:
+                remaining = deadline - time.monotonic()
+                if remaining < self.pool.total_timeout:
+                    attempt_kwargs = {**kwargs, "timeout": aiohttp.ClientTimeout(
+                        total=max(remaining, 0.001),
+                        connect=self.pool.connect_timeout,
+                        sock_read=self.pool.read_timeout
+                    )}
+                    capped = True
+            
             try:
                 logger.debug(f"{self.service_name} {method} {path} (attempt {attempt + 1}/{self.max_retries})")
                 
-                async with self.session.request(method, url, headers=merged_headers, **kwargs) as response:
+                async with self.session.request(method, url, headers=merged_headers, **attempt_kwargs) as response:
                     # Store status and headers before body read
                     status = response.status
                     response_headers = dict(response.headers)
+                    self._observe_rate_limit(status, response_headers)
+                    call.status = status
                     
-                    # Handle 429 rate limit
+                    # Handle 429 rate limit: pause the whole client, retry after the gate opens
                     if status == 429:
+                        call.throttled += 1
                         retry_after = response_headers.get("Retry-After")
                         if retry_after:
                             wait_time = float(retry_after)
-                            logger.warning(f"{self.service_name} rate limited, waiting {wait_time}s")
-                            await asyncio.sleep(wait_time)
-                            continue
+                            logger.warning(f"{self.service_name} rate limited, pausing all requests {wait_time}s")
                         else:
                             # No Retry-After header, use exponential backoff
                             wait_time = self._calculate_backoff(attempt)
                             logger.warning(f"{self.service_name} rate limited (no Retry-After), "
-                                         f"backing off {wait_time:.1f}s")
-                            await asyncio.sleep(wait_time)
-                            continue
+                                         f"pausing all requests {wait_time:.1f}s")
+                        self.pause_gate.pause(wait_time)
+                        if attempt < self.max_retries - 1:
+                            self._check_retry(method, path, call, wait_time)
+                        continue
                     
                     # Handle 5xx server errors (transient)
                     if 500 <= status < 600:
+                        call.server_errors += 1
                         if attempt < self.max_retries - 1:
                             wait_time = self._calculate_backoff(attempt)
+                            self._check_retry(method, path, call, wait_time)
                             logger.warning(f"{self.service_name} {status} error, "
                                          f"retrying in {wait_time:.1f}s")
                             await asyncio.sleep(wait_time)
@@ -314,7 +818,7 @@ class HTTPBaseClient:
                             data = None
                         elif expect_json:
                             try:
-                                data = await response.json()
+                                data = await response.json(loads=codec.loads)
                             except Exception as e:
                                 text = await response.text()
                                 logger.error(f"Failed to parse JSON: {e}, body: {text[:200]}")
@@ -333,6 +837,7 @@ class HTTPBaseClient:
                     
                     # Success - record and return
                     self.circuit_breaker.record_success()
+                    call.bytes_received += self._received_size(response)
                     return {
                         "status": status,
                         "headers": response_headers,
@@ -356,11 +861,19 @@ class HTTPBaseClient:
                 
                 if attempt < self.max_retries - 1:
                     wait_time = self._calculate_backoff(attempt)
+                    self._check_retry(method, path, call, wait_time)
                     logger.info(f"Retrying in {wait_time:.1f}s...")
                     await asyncio.sleep(wait_time)
                 else:
                     logger.error(f"{self.service_name} max retries exhausted")
                     raise
+            
+            except asyncio.TimeoutError:
+                if capped:
+                    raise RetryBudgetExhausted(
+                        f"{self.service_name} {method} {path}: deadline reached during the request"
+                    ) from None
+                raise
         
         raise RuntimeError(f"{self.service_name} request failed after {self.max_retries} attempts")
     
@@ -2,61 +2,133 @@
 HubSpot API Client for V2 Sync System.
 
 Handles:
-- List membership fetching (with cursor pagination)
+- List membership fetching (with cursor pagination + batch contact hydration)
 - Contact retrieval by email
 - List membership management (add/remove)
 - Structured responses (no raw HTTP leakage)
 """
 
-from typing import Dict, List, Optional, Any, AsyncIterator
-from .http_base import HTTPBaseClient
+import asyncio
+from contextlib import aclosing
+from typing import Dict, List, Optional, Set, Any, AsyncIterator
+from .http_base import AdaptiveTokenBucket, ConnectionPoolSettings, HTTPBaseClient, RetryBudget
 
 
 class HubSpotClient(HTTPBaseClient):
     """HubSpot API client with retry/rate-limit/circuit-breaker."""
     
+    BATCH_READ_LIMIT = 100  # Max IDs per /crm/v3/objects/contacts/batch/read call
+    CONTACT_OBJECT_TYPE_ID = "0-1"  # CRM object type of contacts (lists record memberships API)
+    
     def __init__(
         self,
         api_key: str,
-        rate_limit: float = 100.0,  # HubSpot allows 100 req/10sec = 10/sec
-        max_retries: int = 5
+        rate_limit: float = 100.0,
+        max_retries: int = 5,
+        adaptive_rate: bool = False,
+        min_rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        pool: Optional[ConnectionPoolSettings] = None,
+        single_flight: bool = True,
+        response_cache_ttl: float = 0.0,
+        request_deadline: Optional[float] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        run_deadline: Optional[float] = None,
+        membership_prefetch: int = 2
     ):
         """
         Initialize HubSpot client.
         
         Args:
             api_key: HubSpot API key (private app or legacy)
-            rate_limit: Max requests per second (default 10)
+            rate_limit: Max requests per second (default 100); starting rate if adaptive.
+                        The CLI passes config.http.hubspot.rate (10 by default: HubSpot
+                        allows 100 requests per 10 seconds)
             max_retries: Max retry attempts (default 5)
+            adaptive_rate: Follow X-HubSpot-RateLimit-* headers and 429s (AIMD)
+            min_rate: Adaptive floor (requests per second)
+            max_rate: Adaptive ceiling (lowered to the quota HubSpot reports)
+            pool: Connection pool / timeout settings
+            single_flight: Share one request between concurrent identical GETs
+            response_cache_ttl: Seconds to reuse GET responses (0 = off; writes invalidate)
+            request_deadline: Seconds a request may take including retries (None = no limit)
+            retry_budget: Cap on retries as a share of recent requests (per service)
+            run_deadline: time.monotonic() after which requests fail fast (run time budget)
+            membership_prefetch: Memberships pages fetched ahead of the consumer (0 = off)
         """
         base_url = "https://api.hubapi.com"
         super().__init__(
             service_name="HubSpot",
             base_url=base_url,
             rate_limit=rate_limit,
-            max_retries=max_retries
+            max_retries=max_retries,
+            adaptive_rate=adaptive_rate,
+            min_rate=min_rate,
+            max_rate=max_rate,
+            pool=pool,
+            single_flight=single_flight,
+            response_cache_ttl=response_cache_ttl,
+            request_deadline=request_deadline,
+            retry_budget=retry_budget,
+            run_deadline=run_deadline
         )
         self.api_key = api_key
+        self.membership_prefetch = membership_prefetch
         self.default_headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
     
+    def _invalidation_root(self, path: str) -> Optional[str]:
+        """
+        Contacts are addressable by ID or email, so a contact write invalidates
+        every cached contact GET; batch/read is a read-only POST. List
+        memberships are also read per record, so a membership write
+        invalidates every cached list GET.
+        """
+        if path == "/crm/v3/objects/contacts/batch/read":
+            return None
+        if path.startswith("/crm/v3/objects/contacts/"):
+            return "/crm/v3/objects/contacts"
+        if path.startswith("/crm/v3/lists/") and "/memberships/" in path:
+            return "/crm/v3/lists"
+        return super()._invalidation_root(path)
+    
+    def _observe_rate_limit(self, status: int, headers: Dict[str, str]):
+        """Also apply HubSpot's per-window quota headers (X-HubSpot-RateLimit-*)."""
+        super()._observe_rate_limit(status, headers)
+        if not isinstance(self.rate_limiter, AdaptiveTokenBucket):
+            return
+        
+        lowered = {k.lower(): v for k, v in headers.items()}
+        try:
+            remaining = int(lowered["x-hubspot-ratelimit-remaining"])
+            maximum = int(lowered["x-hubspot-ratelimit-max"])
+            interval_ms = int(lowered["x-hubspot-ratelimit-interval-milliseconds"])
+        except (KeyError, ValueError):
+            return
+        
+        self.rate_limiter.observe_quota(remaining, maximum, interval_ms / 1000)
+    
     async def get_list_members(
         self,
         list_id: str,
         properties: Optional[List[str]] = None,
-        limit: int = 100
+        limit: int = 100,
+        batch_hydrate: bool = True
     ) -> AsyncIterator[Dict[str, Any]]:
         """
         Get all members of a HubSpot list (with cursor pagination).
         
         Uses v3 lists API for list memberships, then fetches contact details via v3 contacts API.
+        By default each memberships page is hydrated with ONE contacts batch-read call
+        (up to 100 IDs) instead of one GET per member.
         
         Args:
             list_id: HubSpot list ID
             properties: Contact properties to fetch (default: email, firstname, lastname)
             limit: Results per page for list memberships (default 100, max 100)
+            batch_hydrate: If True, hydrate each page via batch read; if False, one GET per member
         
         Yields:
             Contact dict with properties and list membership info
@@ -64,16 +136,128 @@ class HubSpotClient(HTTPBaseClient):
         if properties is None:
             properties = ["email", "firstname", "lastname"]
         
+        # aclosing: a caller that stops early also stops the page look-ahead
+        async with aclosing(self._iter_membership_pages(list_id, limit)) as pages:
+            async for record_ids in pages:
+                if batch_hydrate:
+                    # One batch-read call per page (max 100 IDs = one memberships page)
+                    contacts_by_id = await self.batch_read_contacts(record_ids, properties)
+                    for record_id in record_ids:
+                        contact_data = contacts_by_id.get(str(record_id))
+                        if contact_data is None:
+                            continue
+                        props = contact_data.get("properties", {})
+                        yield {
+                            "vid": record_id,  # v3 uses recordId instead of vid
+                            "email": props.get("email"),
+                            "properties": props,
+                            "list_memberships": {list_id: True},
+                        }
+                else:
+                    # Fetch contact details for each record ID
+                    for record_id in record_ids:
+                        # Fetch contact details via v3 contacts API
+                        contact_result = await self.get(
+                            f"/crm/v3/objects/contacts/{record_id}",
+                            params={"properties": ",".join(properties)}
+                        )
+                        
+                        if contact_result["status"] == 200:
+                            contact_data = contact_result["data"]
+                            props = contact_data.get("properties", {})
+                            yield {
+                                "vid": record_id,  # v3 uses recordId instead of vid
+                                "email": props.get("email"),
+                                "properties": props,
+                                "list_memberships": {list_id: True},
+                            }
+    
+    async def get_list_membership_ids(
+        self,
+        list_id: str,
+        limit: int = 100
+    ) -> AsyncIterator[str]:
+        """
+        Get record IDs of all members of a HubSpot list (no contact hydration).
+        
+        Args:
+            list_id: HubSpot list ID
+            limit: Results per page for list memberships (default 100, max 100)
+        
+        Yields:
+            Contact record ID (str)
+        """
+        async with aclosing(self._iter_membership_pages(list_id, limit)) as pages:
+            async for record_ids in pages:
+                for record_id in record_ids:
+                    yield record_id
+    
+    async def _iter_membership_pages(
+        self,
+        list_id: str,
+        limit: int = 100
+    ) -> AsyncIterator[List[str]]:
+        """
+        Page through /crm/v3/lists/{id}/memberships (cursor pagination).
+        
+        With membership_prefetch > 0 the next page is requested as soon as the
+        previous one arrives (its paging.next.after cursor), while the caller is
+        still hydrating/processing the current page. At most membership_prefetch
+        pages wait in the buffer; the fetcher blocks until the caller catches up.
+        
+        Yields:
+            List of record IDs per memberships page
+        """
+        if self.membership_prefetch <= 0:
+            async with aclosing(self._fetch_membership_pages(list_id, limit)) as pages:
+                async for record_ids in pages:
+                    yield record_ids
+            return
+        
+        buffer: asyncio.Queue = asyncio.Queue(maxsize=self.membership_prefetch)
+        done = object()
+        
+        async def fetch_ahead():
+            try:
+                async for record_ids in self._fetch_membership_pages(list_id, limit):
+                    await buffer.put(record_ids)
+            except Exception as e:
+                await buffer.put(e)
+            else:
+                await buffer.put(done)
+        
+        fetcher = asyncio.create_task(fetch_ahead())
+        try:
+            while True:
+                item = await buffer.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Caller stopped early (or a page failed): don't leave a fetch running
+            fetcher.cancel()
+            try:
+                await fetcher
+            except asyncio.CancelledError:
+                pass
+    
+    async def _fetch_membership_pages(
+        self,
+        list_id: str,
+        limit: int
+    ) -> AsyncIterator[List[str]]:
+        """Fetch memberships pages one after another (no look-ahead)."""
         # Use v3 list memberships API
         endpoint = f"/crm/v3/lists/{list_id}/memberships"
         
-        params = {
-            "limit": min(limit, 100)  # HubSpot max is 100
-        }
-        
         after = None
         
         while True:
+            params = {
+                "limit": min(limit, 100)  # HubSpot max is 100
+            }
             if after:
                 params["after"] = after
             
@@ -84,28 +268,7 @@ class HubSpotClient(HTTPBaseClient):
             
             data = result["data"]
             results = data.get("results", [])
-            
-            # Fetch contact details for each record ID
-            for member in results:
-                record_id = member.get("recordId")
-                if not record_id:
-                    continue
-                
-                # Fetch contact details via v3 contacts API
-                contact_result = await self.get(
-                    f"/crm/v3/objects/contacts/{record_id}",
-                    params={"properties": ",".join(properties)}
-                )
-                
-                if contact_result["status"] == 200:
-                    contact_data = contact_result["data"]
-                    props = contact_data.get("properties", {})
-                    yield {
-                        "vid": record_id,  # v3 uses recordId instead of vid
-                        "email": props.get("email"),
-                        "properties": props,
-                        "list_memberships": {list_id: True},
-                    }
+            yield [str(member["recordId"]) for member in results if member.get("recordId")]
             
             # Check for more pages
             paging = data.get("paging", {})
@@ -113,6 +276,45 @@ class HubSpotClient(HTTPBaseClient):
             if not after:
                 break
     
+    async def batch_read_contacts(
+        self,
+        record_ids: List[str],
+        properties: Optional[List[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Read many contacts in one call per 100 IDs (v3 batch read API).
+        
+        Args:
+            record_ids: HubSpot contact record IDs
+            properties: Properties to fetch (default: email, firstname, lastname)
+        
+        Returns:
+            Dict mapping record ID (str) → contact object ({"id", "properties", ...}).
+            IDs HubSpot could not read (deleted/merged) are simply absent.
+        """
+        if properties is None:
+            properties = ["email", "firstname", "lastname"]
+        
+        contacts_by_id: Dict[str, Dict[str, Any]] = {}
+        
+        for start in range(0, len(record_ids), self.BATCH_READ_LIMIT):
+            chunk = record_ids[start:start + self.BATCH_READ_LIMIT]
+            payload = {
+                "properties": properties,
+                "inputs": [{"id": str(record_id)} for record_id in chunk]
+            }
+            
+            result = await self.post("/crm/v3/objects/contacts/batch/read", json=payload)
+            
+            # 207 = multi-status (some IDs failed) - still carries the readable results
+            if result["status"] not in [200, 207]:
+                raise Exception(f"HubSpot batch read failed: {result['status']} - {result['data']}")
+            
+            for contact in (result["data"] or {}).get("results", []):
+                contacts_by_id[str(contact.get("id"))] = contact
+        
+        return contacts_by_id
+    
     async def get_contact_by_email(
         self,
         email: str,
@@ -164,6 +366,84 @@ class HubSpotClient(HTTPBaseClient):
             "properties": data.get("properties", {})
         }
     
+    async def get_contact(
+        self,
+        record_id: str,
+        properties: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Get contact by record ID (v3 API).
+        
+        Args:
+            record_id: HubSpot contact record ID
+            properties: Properties to fetch (default: email, firstname, lastname)
+        
+        Returns:
+            Same shape as get_contact_by_email (email taken from the contact's properties)
+        """
+        if properties is None:
+            properties = ["email", "firstname", "lastname"]
+        
+        result = await self.get(
+            f"/crm/v3/objects/contacts/{record_id}",
+            params={"properties": ",".join(properties)}
+        )
+        
+        if result["status"] == 404:
+            return {
+                "found": False,
+                "vid": None,
+                "email": None,
+                "properties": {}
+            }
+        
+        if result["status"] != 200:
+            raise Exception(f"HubSpot API error: {result['status']} - {result['data']}")
+        
+        data = result["data"]
+        props = data.get("properties", {})
+        return {
+            "found": True,
+            "vid": int(data["id"]),
+            "email": props.get("email"),
+            "properties": props
+        }
+    
+    async def get_contact_list_ids(self, record_id: str) -> Set[str]:
+        """
+        Get the IDs of every list a contact is in (v3 record memberships API).
+        
+        One call per 100 memberships instead of scanning each list's members.
+        
+        Args:
+            record_id: HubSpot contact record ID
+        
+        Returns:
+            Set of list IDs
+        """
+        endpoint = f"/crm/v3/lists/records/{self.CONTACT_OBJECT_TYPE_ID}/{record_id}/memberships"
+        list_ids: Set[str] = set()
+        after = None
+        
+        while True:
+            params = {"limit": 100}
+            if after:
+                params["after"] = after
+            
+            result = await self.get(endpoint, params=params)
+            
+            if result["status"] != 200:
+                raise Exception(f"HubSpot API error: {result['status']} - {result['data']}")
+            
+            data = result["data"]
+            list_ids.update(str(member["listId"]) for member in data.get("results", []) if member.get("listId"))
+            
+            after = data.get("paging", {}).get("next", {}).get("after")
+            if not after:
+                break
+        
+        return list_ids
+    
     async def add_contact_to_list(
         self,
         list_id: str,
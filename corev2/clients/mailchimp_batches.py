@@ -0,0 +1,279 @@
+"""
+Mailchimp batch operations (/batches) engine.
+
+Submits many member operations (tag adds/removals, unsubscribes, archives)
+as ONE /batches job, polls until Mailchimp finishes it, then downloads and
+parses the gzipped tar result archive into per-operation results.
+
+The transport is pluggable:
+- HTTPBatchTransport talks to the real API through MailchimpClient
+- LocalBatchTransport is an in-process fake batch server that runs the full
+  submit → poll → result-archive cycle without network access (tests, dry rehearsals)
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import tarfile
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from corev2 import codec
+from .mailchimp_client import MailchimpClient
+
+
+logger = logging.getLogger(__name__)
+
+
+class BatchTransport(ABC):
+    """Interface for /batches transports (a transport missing a method cannot be instantiated)."""
+
+    @abstractmethod
+    async def submit(self, operations: List[Dict[str, Any]]) -> str:
+        """Submit operations, return batch ID."""
+
+    @abstractmethod
+    async def status(self, batch_id: str) -> Dict[str, Any]:
+        """Return batch status ({"status", "response_body_url", ...})."""
+
+    @abstractmethod
+    async def download(self, url: str) -> bytes:
+        """Download the gzipped tar result archive."""
+
+
+class HTTPBatchTransport(BatchTransport):
+    """Real Mailchimp /batches API via MailchimpClient (inside async with)."""
+
+    def __init__(self, mc_client: MailchimpClient):
+        self.mc_client = mc_client
+
+    async def submit(self, operations: List[Dict[str, Any]]) -> str:
+        result = await self.mc_client.post("/batches", json={"operations": operations})
+        if result["status"] != 200:
+            raise Exception(f"Mailchimp batch submit failed: {result['status']} - {result['data']}")
+        return result["data"]["id"]
+
+    async def status(self, batch_id: str) -> Dict[str, Any]:
+        result = await self.mc_client.get(f"/batches/{batch_id}")
+        if result["status"] != 200:
+            raise Exception(f"Mailchimp batch status failed: {result['status']} - {result['data']}")
+        return result["data"]
+
+    async def download(self, url: str) -> bytes:
+        # response_body_url is a pre-signed storage URL: no API auth, not under base_url
+        if not self.mc_client.session:
+            raise RuntimeError("Client not initialized (use async with)")
+        async with self.mc_client.session.get(url) as response:
+            if response.status != 200:
+                raise Exception(f"Mailchimp batch result download failed: {response.status}")
+            return await response.read()
+
+
+class LocalBatchTransport(BatchTransport):
+    """
+    In-process stand-in for the Mailchimp batch server.
+
+    Each operation is answered by `handler(method, path, body) -> (status_code, response)`
+    when the batch "runs". Batches report pending/started for `polls_until_finished`
+    status calls, then finished with a tar.gz archive in Mailchimp's format.
+    """
+
+    def __init__(
+        self,
+        handler: Optional[Callable[[str, str, Optional[Dict[str, Any]]], Tuple[int, Any]]] = None,
+        polls_until_finished: int = 2,
+        results_per_file: int = 100
+    ):
+        self.handler = handler or (lambda method, path, body: (204, None))
+        self.polls_until_finished = polls_until_finished
+        self.results_per_file = results_per_file
+        self.submitted: Dict[str, List[Dict[str, Any]]] = {}
+        self.results: Dict[str, List[Dict[str, Any]]] = {}
+        self._polls: Dict[str, int] = {}
+        self._archives: Dict[str, bytes] = {}
+
+    async def submit(self, operations: List[Dict[str, Any]]) -> str:
+        batch_id = hashlib.md5(f"{len(self.submitted)}:{time.time()}".encode()).hexdigest()[:10]
+        self.submitted[batch_id] = list(operations)
+        self._polls[batch_id] = 0
+        return batch_id
+
+    async def status(self, batch_id: str) -> Dict[str, Any]:
+        operations = self.submitted[batch_id]
+        self._polls[batch_id] += 1
+
+        if self._polls[batch_id] <= self.polls_until_finished:
+            return {
+                "id": batch_id,
+                "status": "pending" if self._polls[batch_id] == 1 else "started",
+                "total_operations": len(operations),
+                "finished_operations": 0,
+                "errored_operations": 0,
+                "response_body_url": "",
+            }
+
+        if batch_id not in self._archives:
+            self._archives[batch_id] = self._run(batch_id, operations)
+
+        errored = sum(1 for r in self.results[batch_id] if r["status_code"] >= 400)
+        return {
+            "id": batch_id,
+            "status": "finished",
+            "total_operations": len(operations),
+            "finished_operations": len(operations),
+            "errored_operations": errored,
+            "response_body_url": f"local://{batch_id}.tar.gz",
+        }
+
+    async def download(self, url: str) -> bytes:
+        batch_id = url[len("local://"):-len(".tar.gz")]
+        return self._archives[batch_id]
+
+    def _run(self, batch_id: str, operations: List[Dict[str, Any]]) -> bytes:
+        """Execute operations via handler and pack results like Mailchimp does."""
+        results = []
+        for op in operations:
+            body = codec.loads(op["body"]) if op.get("body") else None
+            status_code, response = self.handler(op["method"], op["path"], body)
+            results.append({
+                "status_code": status_code,
+                "operation_id": op.get("operation_id"),
+                "response": codec.dumps(response) if response is not None else "",
+            })
+        self.results[batch_id] = results
+
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+            for index in range(0, len(results), self.results_per_file):
+                payload = codec.dumps_bytes(results[index:index + self.results_per_file])
+                info = tarfile.TarInfo(name=f"{batch_id}/{index // self.results_per_file}.json")
+                info.size = len(payload)
+                archive.addfile(info, io.BytesIO(payload))
+        return buffer.getvalue()
+
+
+def parse_result_archive(archive: bytes) -> Dict[str, Dict[str, Any]]:
+    """
+    Parse a /batches result archive (tar.gz of JSON arrays).
+
+    Returns:
+        Dict mapping operation_id → {"status_code": int, "success": bool, "response": Any}
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    with tarfile.open(fileobj=io.BytesIO(archive), mode="r:gz") as tar:
+        for member in tar.getmembers():
+            if not member.isfile() or not member.name.endswith(".json"):
+                continue
+            for item in codec.loads(tar.extractfile(member).read() or b"[]"):
+                raw = item.get("response") or ""
+                try:
+                    response = codec.loads(raw) if raw else None
+                except ValueError:
+                    response = raw
+                status_code = int(item.get("status_code", 0))
+                results[item.get("operation_id")] = {
+                    "status_code": status_code,
+                    "success": 200 <= status_code < 300,
+                    "response": response,
+                }
+    return results
+
+
+class MailchimpBatchEngine:
+    """Builds member operations and runs them as /batches jobs."""
+
+    def __init__(
+        self,
+        transport: BatchTransport,
+        audience_id: str,
+        poll_interval: float = 5.0,
+        timeout: float = 1800.0
+    ):
+        """
+        Args:
+            transport: HTTPBatchTransport (live) or LocalBatchTransport (fake server)
+            audience_id: Mailchimp audience/list ID
+            poll_interval: Seconds between status polls
+            timeout: Give up waiting for a batch after this many seconds
+        """
+        self.transport = transport
+        self.audience_id = audience_id
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+    def _member_path(self, email: str) -> str:
+        subscriber_hash = hashlib.md5(email.lower().encode()).hexdigest()
+        return f"/lists/{self.audience_id}/members/{subscriber_hash}"
+
+    def tags_operation(self, operation_id: str, email: str, add: List[str] = (), remove: List[str] = ()) -> Dict[str, Any]:
+        """POST .../tags - activate `add`, deactivate `remove`."""
+        tags = [{"name": tag, "status": "active"} for tag in add]
+        tags += [{"name": tag, "status": "inactive"} for tag in remove]
+        return {
+            "method": "POST",
+            "path": f"{self._member_path(email)}/tags",
+            "operation_id": operation_id,
+            "body": codec.dumps({"tags": tags}),
+        }
+
+    def unsubscribe_operation(self, operation_id: str, email: str) -> Dict[str, Any]:
+        """PATCH member status=unsubscribed."""
+        return {
+            "method": "PATCH",
+            "path": self._member_path(email),
+            "operation_id": operation_id,
+            "body": codec.dumps({"status": "unsubscribed"}),
+        }
+
+    def archive_operation(self, operation_id: str, email: str) -> Dict[str, Any]:
+        """DELETE member (archive)."""
+        return {
+            "method": "DELETE",
+            "path": self._member_path(email),
+            "operation_id": operation_id,
+        }
+
+    async def run(self, operations: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Submit operations as one batch, wait for it, and parse the results.
+
+        Mailchimp processes a batch's operations in no particular order -
+        callers needing ordering must split dependent operations into
+        separate batches.
+
+        Returns:
+            Dict mapping operation_id → {"status_code", "success", "response"}.
+            Operations missing from the archive are reported as failed.
+        """
+        if not operations:
+            return {}
+
+        batch_id = await self.transport.submit(operations)
+        logger.info(f"Submitted Mailchimp batch {batch_id} ({len(operations)} operations)")
+
+        started = time.monotonic()
+        while True:
+            status = await self.transport.status(batch_id)
+            if status.get("status") == "finished":
+                break
+            if time.monotonic() - started > self.timeout:
+                raise Exception(f"Mailchimp batch {batch_id} not finished after {self.timeout:.0f}s "
+                                f"(status={status.get('status')})")
+            logger.debug(f"  Batch {batch_id}: {status.get('status')} "
+                         f"({status.get('finished_operations', 0)}/{status.get('total_operations', 0)})")
+            await asyncio.sleep(self.poll_interval)
+
+        logger.info(f"  Batch {batch_id} finished: {status.get('finished_operations', 0)} done, "
+                    f"{status.get('errored_operations', 0)} errored")
+
+        results = parse_result_archive(await self.transport.download(status["response_body_url"]))
+
+        for op in operations:
+            results.setdefault(op["operation_id"], {
+                "status_code": 0,
+                "success": False,
+                "response": "missing from batch result archive",
+            })
+        return results
@@ -2,15 +2,17 @@
 Mailchimp API Client for V2 Sync System.
 
 Handles:
-- Member upsert (never resubscribe unsubscribed/cleaned)
+- Member upsert (never resubscribe unsubscribed/cleaned), single or batch-subscribe
 - Tag management (add/remove)
 - Member archival (DELETE with 404=success)
 - Structured responses (no raw HTTP leakage)
 """
 
+import asyncio
 import hashlib
-from typing import Dict, List, Optional, Any
-from .http_base import HTTPBaseClient
+from collections import deque
+from typing import Dict, List, Optional, Any, Sequence
+from .http_base import ConnectionPoolSettings, HTTPBaseClient, RetryBudget
 
 
 class MailchimpMemberStatus:
@@ -31,7 +33,16 @@ class MailchimpClient(HTTPBaseClient):
         server_prefix: str,
         audience_id: str,
         rate_limit: float = 10.0,  # Mailchimp allows 10 req/sec
-        max_retries: int = 5
+        max_retries: int = 5,
+        adaptive_rate: bool = False,
+        min_rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        pool: Optional[ConnectionPoolSettings] = None,
+        single_flight: bool = True,
+        response_cache_ttl: float = 0.0,
+        request_deadline: Optional[float] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        run_deadline: Optional[float] = None
     ):
         """
         Initialize Mailchimp client.
@@ -40,8 +51,17 @@ class MailchimpClient(HTTPBaseClient):
             api_key: Mailchimp API key
             server_prefix: Server prefix (e.g., "us1")
             audience_id: Mailchimp audience/list ID
-            rate_limit: Max requests per second (default 10)
+            rate_limit: Max requests per second (default 10); starting rate if adaptive
             max_retries: Max retry attempts (default 5)
+            adaptive_rate: Back off on 429s and recover on success (AIMD)
+            min_rate: Adaptive floor (requests per second)
+            max_rate: Adaptive ceiling (requests per second)
+            pool: Connection pool / timeout settings
+            single_flight: Share one request between concurrent identical GETs
+            response_cache_ttl: Seconds to reuse GET responses (0 = off; writes invalidate)
+            request_deadline: Seconds a request may take including retries (None = no limit)
+            retry_budget: Cap on retries as a share of recent requests (per service)
+            run_deadline: time.monotonic() after which requests fail fast (run time budget)
         """
         base_url = f"https://{server_prefix}.api.mailchimp.com/3.0"
         
@@ -54,7 +74,16 @@ class MailchimpClient(HTTPBaseClient):
             service_name="Mailchimp",
             base_url=base_url,
             rate_limit=rate_limit,
-            max_retries=max_retries
+            max_retries=max_retries,
+            adaptive_rate=adaptive_rate,
+            min_rate=min_rate,
+            max_rate=max_rate,
+            pool=pool,
+            single_flight=single_flight,
+            response_cache_ttl=response_cache_ttl,
+            request_deadline=request_deadline,
+            retry_budget=retry_budget,
+            run_deadline=run_deadline
         )
         self.audience_id = audience_id
         self.api_key = api_key
@@ -239,6 +268,89 @@ class MailchimpClient(HTTPBaseClient):
         else:
             raise Exception(f"Mailchimp PUT failed: {result['status']} - {result['data']}")
     
+    async def batch_upsert_members(
+        self,
+        members: List[Dict[str, Any]],
+        status_if_new: str = MailchimpMemberStatus.SUBSCRIBED,
+        chunk_size: int = 100
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Upsert many members via batch-subscribe (POST /lists/{id}, update_existing).
+        
+        Only status_if_new is sent, so existing members keep their status.
+        Callers must still route unsubscribed/cleaned/archived members through
+        upsert_member (INV-005 merge-field-only PATCH, archive restore).
+        
+        Args:
+            members: [{"email": str, "merge_fields": Dict}]
+            status_if_new: Status for members that do not exist yet
+            chunk_size: Members per request (Mailchimp max 500)
+        
+        Returns:
+            Dict mapping lowercase email → {
+                "success": bool,
+                "action": str,  # "created" | "updated" | "skipped" | "failed"
+                "status": str | None,
+                "email_address": str,
+                "error": str  # only when failed
+            }
+        """
+        endpoint = f"/lists/{self.audience_id}"
+        chunk_size = max(1, min(chunk_size, 500))
+        results: Dict[str, Dict[str, Any]] = {}
+        
+        for start in range(0, len(members), chunk_size):
+            chunk = members[start:start + chunk_size]
+            payload = {
+                "members": [
+                    {
+                        "email_address": member["email"],
+                        "status_if_new": status_if_new,
+                        **({"merge_fields": member["merge_fields"]} if member.get("merge_fields") else {})
+                    }
+                    for member in chunk
+                ],
+                "update_existing": True
+            }
+            
+            result = await self.post(endpoint, json=payload)
+            
+            if result["status"] != 200:
+                raise Exception(f"Mailchimp batch subscribe failed: {result['status']} - {result['data']}")
+            
+            data = result["data"] or {}
+            
+            # Members Mailchimp did not report (unchanged) count as skipped
+            for member in chunk:
+                results[member["email"].lower()] = {
+                    "success": True,
+                    "action": "skipped",
+                    "status": None,
+                    "email_address": member["email"]
+                }
+            
+            for action, key in (("created", "new_members"), ("updated", "updated_members")):
+                for item in data.get(key, []):
+                    email = (item.get("email_address") or "").lower()
+                    results[email] = {
+                        "success": True,
+                        "action": action,
+                        "status": item.get("status"),
+                        "email_address": item.get("email_address")
+                    }
+            
+            for item in data.get("errors", []):
+                email = (item.get("email_address") or "").lower()
+                results[email] = {
+                    "success": False,
+                    "action": "failed",
+                    "status": None,
+                    "email_address": item.get("email_address"),
+                    "error": f"{item.get('error_code', '')}: {item.get('error', '')}".strip(": ")
+                }
+        
+        return results
+    
     async def add_tags(self, email: str, tags: List[str]) -> Dict[str, Any]:
         """
         Add tags to member (idempotent).
@@ -311,6 +423,52 @@ class MailchimpClient(HTTPBaseClient):
         else:
             raise Exception(f"Mailchimp tag remove failed: {result['status']} - {result['data']}")
     
+    async def update_tags(
+        self,
+        email: str,
+        add: List[str] = (),
+        remove: List[str] = ()
+    ) -> Dict[str, Any]:
+        """
+        Activate and deactivate tags in ONE request (idempotent).
+        
+        Args:
+            email: Member email address
+            add: Tag names to activate
+            remove: Tag names to deactivate
+        
+        Returns:
+            {
+                "success": bool,
+                "tags_added": List[str],
+                "tags_removed": List[str],
+                "email_address": str
+            }
+        """
+        add, remove = list(add), list(remove)
+        if not add and not remove:
+            return {"success": True, "tags_added": [], "tags_removed": [], "email_address": email}
+        
+        subscriber_hash = self._subscriber_hash(email)
+        endpoint = f"/lists/{self.audience_id}/members/{subscriber_hash}/tags"
+        
+        payload = {
+            "tags": [{"name": tag, "status": "active"} for tag in add]
+                    + [{"name": tag, "status": "inactive"} for tag in remove]
+        }
+        
+        result = await self.post(endpoint, json=payload)
+        
+        if result["status"] == 204:
+            return {
+                "success": True,
+                "tags_added": add,
+                "tags_removed": remove,
+                "email_address": email
+            }
+        else:
+            raise Exception(f"Mailchimp tag update failed: {result['status']} - {result['data']}")
+    
     async def unsubscribe_member(self, email: str) -> Dict[str, Any]:
         """
         Unsubscribe member (set status=unsubscribed).
@@ -380,46 +538,154 @@ class MailchimpClient(HTTPBaseClient):
         else:
             raise Exception(f"Mailchimp archive failed: {result['status']} - {result['data']}")
     
-    async def get_all_members(self, count: int = 1000, offset: int = 0, status: str = None):
+    # Member fields every audience scan consumer reads (see get_all_members' yield)
+    MEMBER_SCAN_FIELDS = ("email_address", "status", "tags", "merge_fields")
+    
+    async def get_all_members(
+        self,
+        count: int = 1000,
+        offset: int = 0,
+        status: str = None,
+        fields: Optional[Sequence[str]] = MEMBER_SCAN_FIELDS,
+        exclude_fields: Optional[Sequence[str]] = None,
+        concurrency: int = 1,
+        ordered: bool = True
+    ):
         """
         Iterate over all Mailchimp audience members (paginated).
         
+        Pages are projected to `fields` by default, so Mailchimp omits the
+        activity, stats, location and permission blocks nobody reads.
+        
+        With concurrency > 1 the first page's total_items fixes the page
+        offsets and the rest are fetched `concurrency` at a time (under the
+        client's rate limiter). Members shifted across pages by concurrent
+        adds/removes are yielded once (deduplicated on email), and pages past
+        the initial total are read until a short page in case the audience grew.
+        
         Args:
             count: Members per page (max 1000)
             offset: Starting offset
             status: Optional status filter (e.g. 'subscribed', 'unsubscribed', 'cleaned', 'archived')
+            fields: Member fields to return (None = full member objects)
+            exclude_fields: Member fields to leave out (used when fields is None)
+            concurrency: Pages fetched in parallel (1 = sequential)
+            ordered: Yield pages in offset order (else as they arrive)
         
         Yields:
             Member dicts with email_address, status, tags, merge_fields
         """
+        page_size = min(count, 1000)
+        params = {"count": page_size}
+        if fields:
+            params["fields"] = ",".join(f"members.{field}" for field in fields)
+            if concurrency > 1:
+                params["fields"] += ",total_items"
+        elif exclude_fields:
+            params["exclude_fields"] = ",".join(f"members.{field}" for field in exclude_fields)
+        if status:
+            params["status"] = status
+        
+        if concurrency > 1:
+            async for member in self._get_all_members_parallel(params, page_size, offset, concurrency, ordered):
+                yield member
+            return
+        
         while True:
-            endpoint = f"/lists/{self.audience_id}/members"
-            params = {"count": min(count, 1000), "offset": offset}
-            if status:
-                params["status"] = status
-            
-            result = await self.get(endpoint, params=params)
-            
-            if result["status"] != 200:
-                raise Exception(f"Mailchimp list members failed: {result['status']}")
-            
-            members = result["data"].get("members", [])
+            members = (await self._get_member_page(params, offset)).get("members", [])
             
             if not members:
                 break  # No more members
             
             for member in members:
-                # Extract tags from tags array
-                tags = [tag["name"] for tag in member.get("tags", [])]
-                yield {
-                    "email_address": member.get("email_address"),
-                    "status": member.get("status"),
-                    "tags": tags,
-                    "merge_fields": member.get("merge_fields", {}),
-                }
+                yield self._scan_member(member)
             
             offset += len(members)
             
             # If we got fewer than requested, we're done
-            if len(members) < count:
+            if len(members) < page_size:
+                break
+    
+    async def _get_all_members_parallel(
+        self,
+        params: Dict[str, Any],
+        page_size: int,
+        offset: int,
+        concurrency: int,
+        ordered: bool
+    ):
+        """Parallel offset pagination for get_all_members (see there)."""
+        seen = set()
+        
+        def fresh(members):
+            for member in members:
+                email = (member.get("email_address") or "").lower()
+                if email in seen:
+                    continue
+                seen.add(email)
+                yield self._scan_member(member)
+        
+        first = await self._get_member_page(params, offset)
+        members = first.get("members", [])
+        for member in fresh(members):
+            yield member
+        if len(members) < page_size:
+            return
+        
+        next_offset = offset + len(members)
+        end = first.get("total_items") or 0  # absolute audience size, not a count from `offset`
+        pending = deque()  # (offset, task) in offset order
+        
+        try:
+            while pending or next_offset < end:
+                while next_offset < end and len(pending) < concurrency:
+                    task = asyncio.ensure_future(self._get_member_page(params, next_offset))
+                    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+                    pending.append((next_offset, task))
+                    next_offset += page_size
+                
+                if ordered:
+                    _, task = pending.popleft()
+                else:
+                    done, _ = await asyncio.wait([t for _, t in pending], return_when=asyncio.FIRST_COMPLETED)
+                    index = next(i for i, (_, t) in enumerate(pending) if t in done)
+                    _, task = pending[index]
+                    del pending[index]
+                
+                for member in fresh((await task).get("members", [])):
+                    yield member
+        finally:
+            for _, task in pending:
+                task.cancel()
+        
+        # Members added during the scan push others past the initial total
+        tail = max(end, next_offset)
+        while True:
+            members = (await self._get_member_page(params, tail)).get("members", [])
+            for member in fresh(members):
+                yield member
+            if len(members) < page_size:
                 break
+            tail += len(members)
+    
+    async def _get_member_page(self, params: Dict[str, Any], offset: int) -> Dict[str, Any]:
+        """One page of /lists/{id}/members (raw response data)."""
+        endpoint = f"/lists/{self.audience_id}/members"
+        result = await self.get(endpoint, params={**params, "offset": offset})
+        
+        if result["status"] != 200:
+            raise Exception(f"Mailchimp list members failed: {result['status']}")
+        
+        return result["data"]
+    
+    @staticmethod
+    def _scan_member(member: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce a member object to the scan shape."""
+        # Extract tags from tags array
+        tags = [tag["name"] for tag in member.get("tags", [])]
+        return {
+            "email_address": member.get("email_address"),
+            "status": member.get("status"),
+            "tags": tags,
+            "merge_fields": member.get("merge_fields", {}),
+        }
@@ -0,0 +1,182 @@
+"""
+Per-endpoint request metrics for API clients.
+
+HTTPBaseClient records every logical request (all of its retry attempts)
+against a normalised endpoint template such as
+`/lists/{id}/members/{hash}/tags`, so a run report can show which calls
+dominate wall time.
+"""
+
+import math
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from corev2 import codec
+
+
+_HASH_SEGMENT = re.compile(r"^[0-9a-f]{32}$")
+_ID_SEGMENT = re.compile(r"\d")
+
+
+def normalize_endpoint(path: str) -> str:
+    """
+    Replace IDs in a request path with placeholders.
+
+    `{hash}` for MD5 subscriber hashes, `{email}` for addresses, `{id}` for
+    any other segment containing a digit (list/contact/audience/batch IDs).
+    """
+    segments = []
+    for segment in path.split("?", 1)[0].split("/"):
+        if _HASH_SEGMENT.match(segment):
+            segments.append("{hash}")
+        elif "@" in segment:
+            segments.append("{email}")
+        elif _ID_SEGMENT.search(segment) and not re.match(r"^v\d+$", segment):
+            segments.append("{id}")
+        else:
+            segments.append(segment)
+    return "/".join(segments)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+@dataclass
+class RequestCall:
+    """Counters for one logical request, filled in by HTTPBaseClient._request."""
+    attempts: int = 0
+    throttled: int = 0  # 429 responses
+    server_errors: int = 0  # 5xx responses
+    wait_seconds: float = 0.0  # rate limiter + pause gate
+    status: Optional[int] = None  # final status (None = raised before a response)
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class EndpointStats:
+    """Aggregated stats for one (method, endpoint template)."""
+    count: int = 0
+    errors: int = 0
+    retries: int = 0
+    throttled: int = 0
+    server_errors: int = 0
+    wait_seconds: float = 0.0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    coalesced: int = 0  # GETs that joined an identical in-flight request
+    cache_hits: int = 0  # GETs served from the response cache
+    latencies: List[float] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        total = sum(ordered)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "server_errors": self.server_errors,
+            "coalesced": self.coalesced,
+            "cache_hits": self.cache_hits,
+            "latency_ms": {
+                "p50": round(_percentile(ordered, 50) * 1000, 1),
+                "p95": round(_percentile(ordered, 95) * 1000, 1),
+                "p99": round(_percentile(ordered, 99) * 1000, 1),
+                "max": round((ordered[-1] if ordered else 0.0) * 1000, 1),
+                "total": round(total * 1000, 1),
+            },
+            "wait_seconds": round(self.wait_seconds, 3),
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+        }
+
+
+class RequestMetrics:
+    """Per-endpoint request stats for one API client."""
+
+    def __init__(self, service_name: str):
+        self.service_name = service_name
+        self.endpoints: Dict[str, EndpointStats] = {}
+
+    def record(self, method: str, path: str, call: RequestCall):
+        """Add one finished request (latency excludes rate-limit waits)."""
+        key = f"{method} {normalize_endpoint(path)}"
+        stats = self.endpoints.setdefault(key, EndpointStats())
+
+        stats.count += 1
+        if call.status is None or call.status >= 400:
+            stats.errors += 1
+        stats.retries += max(0, call.attempts - 1)
+        stats.throttled += call.throttled
+        stats.server_errors += call.server_errors
+        stats.wait_seconds += call.wait_seconds
+        stats.bytes_sent += call.bytes_sent
+        stats.bytes_received += call.bytes_received
+        stats.latencies.append(max(0.0, time.monotonic() - call.started - call.wait_seconds))
+
+    def record_shared(self, method: str, path: str, kind: str):
+        """Count a request answered without a call ("coalesced" or "cache_hits")."""
+        key = f"{method} {normalize_endpoint(path)}"
+        stats = self.endpoints.setdefault(key, EndpointStats())
+        setattr(stats, kind, getattr(stats, kind) + 1)
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals plus per-endpoint stats, busiest (by total latency) first."""
+        endpoints = {key: stats.summary() for key, stats in self.endpoints.items()}
+        ordered = dict(sorted(endpoints.items(), key=lambda item: -item[1]["latency_ms"]["total"]))
+        return {
+            "requests": sum(s["count"] for s in endpoints.values()),
+            "errors": sum(s["errors"] for s in endpoints.values()),
+            "retries": sum(s["retries"] for s in endpoints.values()),
+            "throttled": sum(s["throttled"] for s in endpoints.values()),
+            "server_errors": sum(s["server_errors"] for s in endpoints.values()),
+            "coalesced": sum(s["coalesced"] for s in endpoints.values()),
+            "cache_hits": sum(s["cache_hits"] for s in endpoints.values()),
+            "wait_seconds": round(sum(s["wait_seconds"] for s in endpoints.values()), 3),
+            "bytes_sent": sum(s["bytes_sent"] for s in endpoints.values()),
+            "bytes_received": sum(s["bytes_received"] for s in endpoints.values()),
+            "endpoints": ordered,
+        }
+
+
+def build_run_report(clients: Iterable[Any], phase: str) -> Dict[str, Any]:
+    """
+    Run report for a set of HTTPBaseClient instances.
+
+    Args:
+        clients: API clients (request, connection, rate-limit and retry budget metrics are read)
+        phase: Run phase label ("plan", "apply")
+    """
+    services = {}
+    for client in clients:
+        services[client.service_name] = {
+            **client.metrics.summary(),
+            "connections": client.connection_metrics(),
+            "rate_limit": client.rate_limit_metrics(),
+            "retry_budget": client.retry_budget_metrics(),
+        }
+    return {
+        "phase": phase,
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "services": services,
+    }
+
+
+def write_run_report(path: Path, clients: Iterable[Any], phase: str) -> Dict[str, Any]:
+    """Write build_run_report() as JSON to `path` and return it."""
+    report = build_run_report(clients, phase)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        codec.dump(report, f, indent=True)
+    return report
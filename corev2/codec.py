@@ -0,0 +1,80 @@
+"""
+JSON codec for plans, journals and HTTP bodies.
+
+Uses orjson when it is installed and falls back to the stdlib json module
+otherwise. Output is always UTF-8 text without ASCII escaping; the only
+indentation available is 2 spaces (the plan file format).
+"""
+
+import json
+from typing import IO, Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def dumps(
+    obj: Any,
+    indent: bool = False,
+    sort_keys: bool = False,
+    default: Optional[Callable[[Any], Any]] = None
+) -> str:
+    """
+    Encode to a JSON string.
+
+    Args:
+        obj: Value to encode
+        indent: Pretty-print with 2-space indentation
+        sort_keys: Sort object keys (stable output, e.g. for hashing)
+        default: Called for values the encoder cannot serialise
+    """
+    return dumps_bytes(obj, indent=indent, sort_keys=sort_keys, default=default).decode("utf-8")
+
+
+def dumps_bytes(
+    obj: Any,
+    indent: bool = False,
+    sort_keys: bool = False,
+    default: Optional[Callable[[Any], Any]] = None
+) -> bytes:
+    """Encode to UTF-8 JSON bytes (same bytes from either backend)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits - stdlib handles them
+    return json.dumps(
+        obj,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+        sort_keys=sort_keys,
+        default=default,
+        ensure_ascii=False
+    ).encode("utf-8")
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Decode a JSON string or bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump(obj: Any, fp: IO[str], indent: bool = False):
+    """Write JSON to a text file."""
+    fp.write(dumps(obj, indent=indent))
+
+
+def load(fp: IO[str]) -> Any:
+    """Read JSON from a text file."""
+    return loads(fp.read())
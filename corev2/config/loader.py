@@ -15,12 +15,13 @@ def compute_config_hash(config: V2Config) -> str:
     """
     Compute deterministic hash of config for plan validation.
     
-    Excludes safety gates from hash (can change between plan and apply).
+    Excludes safety gates and HTTP client tuning from hash (can change
+    between plan and apply).
     """
     import json
     
-    # Convert config to dict, exclude safety (mutable between plan/apply)
-    config_dict = config.model_dump(mode="json", exclude={"safety"})
+    # Convert config to dict, exclude safety/http (mutable between plan/apply)
+    config_dict = config.model_dump(mode="json", exclude={"safety", "http"})
     
     # Sort keys for deterministic hash
     config_json = json.dumps(config_dict, sort_keys=True)
@@ -78,6 +78,48 @@ class SyncConfig(BaseModel):
     tag_prefix: str = Field(default="", description="Prefix for managed tags")
     ori_lists_field: str = Field(default="ORI_LISTS", description="Source tracking field name")
     force_subscribe: bool = Field(default=True, description="Force status='subscribed' on upsert")
+    use_audience_snapshot: bool = Field(
+        default=True,
+        description="Plan from one paged Mailchimp audience snapshot instead of one get_member per contact"
+    )
+    audience_scan_concurrency: int = Field(
+        default=4, ge=1, le=10,
+        description="Mailchimp audience pages fetched in parallel during full scans (1 = sequential; Mailchimp allows 10 connections)"
+    )
+    planning_concurrency: int = Field(
+        default=0, ge=0, le=10,
+        description="Live Mailchimp member lookups in flight while planning (0 = sized to http.mailchimp.rate, max 10; 1 = serial)"
+    )
+    single_contact_lookup: bool = Field(
+        default=True,
+        description="--only-email/--only-vid plans resolve the contact and its list memberships directly (no list or audience scans)"
+    )
+    strict_snapshot_misses: bool = Field(
+        default=False,
+        description="Verify contacts missing from the audience snapshot with a live get_member "
+                    "(the snapshot already holds archived members - this only catches members added since it was taken)"
+    )
+    skip_noop_operations: bool = Field(
+        default=True,
+        description="Plan only operations that change Mailchimp/HubSpot state (diff against current state)"
+    )
+    batch_upserts: bool = Field(
+        default=True,
+        description="Upsert members already subscribed/pending via batch-subscribe (sync.batch_size per request)"
+    )
+    coalesce_tag_operations: bool = Field(
+        default=True,
+        description="Send a contact's consecutive tag adds/removals as one Mailchimp tags request"
+    )
+    batch_operations_min_contacts: int = Field(
+        default=0, ge=0,
+        description="Run tag/unsubscribe/archive ops as Mailchimp /batches jobs when at least this many contacts qualify (0 = off)"
+    )
+    batch_poll_interval: float = Field(default=5.0, gt=0, description="Seconds between /batches status polls")
+    executor_workers: int = Field(
+        default=1, ge=1, le=32,
+        description="Contacts executed concurrently (ops within a contact stay ordered)"
+    )
 
 
 class ExclusionMatrixGroupConfig(BaseModel):
@@ -157,6 +199,92 @@ class SecondarySyncConfig(BaseModel):
     )
 
 
+class StateConfig(BaseModel):
+    """Persistent per-contact sync state (incremental runs)."""
+    enabled: bool = Field(default=False, description="Skip contacts whose fingerprint is unchanged since last sync and whose Mailchimp member still matches it")
+    path: str = Field(default="corev2/artifacts/sync_state.db", description="SQLite state database path")
+    max_age_hours: float = Field(
+        default=24.0, ge=0,
+        description="Re-plan contacts last synced longer ago than this, changed or not (0 = never force)"
+    )
+
+
+class RateLimitConfig(BaseModel):
+    """Request rate for one API (requests/sec)."""
+    rate: float = Field(default=10.0, gt=0, description="Fixed rate, or starting rate when adaptive")
+    adaptive: bool = Field(
+        default=False,
+        description="Adjust the rate from rate-limit headers and 429s (additive increase / multiplicative decrease); off = fixed rate"
+    )
+    min_rate: float = Field(default=1.0, gt=0, description="Adaptive floor")
+    max_rate: float = Field(default=10.0, gt=0, description="Adaptive ceiling (lowered to any quota the API reports)")
+    
+    @field_validator("max_rate")
+    @classmethod
+    def validate_rate_range(cls, v: float, info) -> float:
+        """min_rate <= rate <= max_rate."""
+        min_rate = info.data.get("min_rate")
+        rate = info.data.get("rate")
+        if min_rate is not None and v < min_rate:
+            raise ValueError(f"max_rate ({v}) must be >= min_rate ({min_rate})")
+        if rate is not None and v < rate:
+            raise ValueError(f"max_rate ({v}) must be >= rate ({rate})")
+        return v
+
+
+class ConnectionPoolConfig(BaseModel):
+    """Connection pooling, keep-alive and timeouts (per API client session)."""
+    limit: int = Field(default=100, ge=1, description="Max open connections")
+    limit_per_host: int = Field(default=10, ge=1, description="Max connections per host (Mailchimp allows 10 concurrent)")
+    keepalive_timeout: float = Field(default=30.0, gt=0, description="Seconds an idle connection is kept for reuse")
+    dns_cache_ttl: int = Field(default=300, ge=0, description="Seconds DNS lookups are cached")
+    connect_timeout: float = Field(default=10.0, gt=0, description="Seconds to establish a connection")
+    read_timeout: float = Field(default=60.0, gt=0, description="Max seconds between received bytes")
+    total_timeout: float = Field(default=300.0, gt=0, description="Max seconds per request attempt")
+
+
+class RetryBudgetConfig(BaseModel):
+    """Per-service cap on retries (sliding window)."""
+    enabled: bool = Field(default=True, description="Refuse retries beyond the budget (fail fast instead)")
+    ratio: float = Field(default=0.2, gt=0, le=1, description="Max retries as a share of requests in the window")
+    window: float = Field(default=60.0, gt=0, description="Sliding window (seconds)")
+    min_retries: int = Field(default=10, ge=0, description="Retries always allowed per window")
+
+
+class HTTPConfig(BaseModel):
+    """API client settings."""
+    pool: ConnectionPoolConfig = Field(
+        default_factory=ConnectionPoolConfig,
+        description="Connection pool / timeouts (applied to each client)"
+    )
+    single_flight: bool = Field(default=True, description="Concurrent identical GETs share one request")
+    response_cache_ttl: float = Field(
+        default=0.0, ge=0,
+        description="Seconds to reuse GET responses within a run (0 = off; writes to the resource invalidate)"
+    )
+    request_deadline: float = Field(
+        default=300.0, ge=0,
+        description="Seconds one request may take including retries and rate-limit pauses (0 = no limit)"
+    )
+    retry_budget: RetryBudgetConfig = Field(default_factory=RetryBudgetConfig)
+    run_time_budget: float = Field(
+        default=0.0, ge=0,
+        description="Seconds a plan/apply/sync command may spend on API calls before requests fail fast (0 = no limit)"
+    )
+    hubspot_membership_prefetch: int = Field(
+        default=2, ge=0, le=10,
+        description="HubSpot list memberships pages fetched ahead while the current page is processed (0 = off)"
+    )
+    hubspot: RateLimitConfig = Field(
+        default_factory=lambda: RateLimitConfig(rate=10.0, max_rate=50.0),
+        description="HubSpot rate (ceiling follows X-HubSpot-RateLimit-Max / Interval)"
+    )
+    mailchimp: RateLimitConfig = Field(
+        default_factory=lambda: RateLimitConfig(rate=10.0, max_rate=20.0),
+        description="Mailchimp rate (backs off on 429)"
+    )
+
+
 class SafetyConfig(BaseModel):
     """Safety gates for destructive actions (INV-010 triple-lock)."""
     test_contact_limit: int = Field(
@@ -200,6 +328,14 @@ class V2Config(BaseModel):
         description="Secondary sync: Mailchimp exit tag → HubSpot handover list routing"
     )
     archival: ArchivalConfig
+    state: StateConfig = Field(
+        default_factory=StateConfig,
+        description="Sync state store: per-contact fingerprints for incremental runs"
+    )
+    http: HTTPConfig = Field(
+        default_factory=HTTPConfig,
+        description="API client rate limits"
+    )
     safety: SafetyConfig
     
     @field_validator("exclusion_matrix")
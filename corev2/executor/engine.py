@@ -11,14 +11,17 @@ Features:
 """
 
 import asyncio
-import json
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Set
+from corev2 import codec
 from corev2.config.schema import V2Config
+from corev2.clients.http_base import RetryBudgetExhausted
 from corev2.clients.hubspot_client import HubSpotClient
 from corev2.clients.mailchimp_client import MailchimpClient
+from corev2.clients.mailchimp_batches import HTTPBatchTransport, MailchimpBatchEngine
+from corev2.state import SyncStateStore
 
 logger = logging.getLogger(__name__)
 
@@ -174,7 +177,7 @@ class OperationJournal:
             entry: Journal entry dict
         """
         entry["timestamp"] = datetime.utcnow().isoformat()
-        self.file.write(json.dumps(entry) + "\n")
+        self.file.write(codec.dumps(entry) + "\n")
         self.file.flush()
     
     def close(self):
@@ -198,6 +201,8 @@ class SyncExecutor:
         mc_client: MailchimpClient,
         dry_run: bool = False,
         cap_guard: Optional[AudienceCapGuard] = None,
+        state_store: Optional[SyncStateStore] = None,
+        batch_engine: Optional[MailchimpBatchEngine] = None,
     ):
         """
         Initialize executor.
@@ -208,12 +213,21 @@ class SyncExecutor:
             mc_client: Mailchimp API client
             dry_run: If True, simulate without mutations
             cap_guard: Optional audience cap guard (shared across executor instances)
+            state_store: Optional sync state store, updated as contacts complete
+            batch_engine: Optional /batches engine (default: live HTTP transport when
+                          sync.batch_operations_min_contacts is set)
         """
         self.config = config
         self.hs_client = hs_client
         self.mc_client = mc_client
         self.dry_run = dry_run
         self.cap_guard = cap_guard
+        self.state_store = state_store
+        self._cap_lock = asyncio.Lock()
+        self._batched_upserts: Dict[str, Dict[str, Any]] = {}  # email → batch-subscribe result
+        self.batch_engine = batch_engine
+        self._batched_ops: Dict[tuple, Dict[str, Any]] = {}  # (email, op index) → /batches result
+        self.archived_emails: Set[str] = set()  # members archived by the last execute_plan
     
     async def execute_plan(
         self,
@@ -241,6 +255,7 @@ class SyncExecutor:
             "successful": 0,
             "failed": 0,
             "skipped": 0,
+            "deferred": 0,
             "contacts_processed": 0,
             "dry_run": self.dry_run,
             "started_at": datetime.utcnow().isoformat(),
@@ -254,79 +269,37 @@ class SyncExecutor:
                 "dry_run": self.dry_run
             })
             
+            # Contacts the planner found already in sync need no operations
+            if self.state_store is not None and not self.dry_run:
+                self.state_store.record(plan.get("in_sync", []))
+            
             operations_list = plan.get("operations", [])
-            logger.info(f"Processing {len(operations_list)} contacts...")
+            self.archived_emails = set()
             
-            for contact_ops in operations_list:
-                email = contact_ops.get("email")
-                vid = contact_ops.get("vid")
-                ops = contact_ops.get("operations", [])
-                
-                # ── Audience cap gate ──────────────────────────────────
-                # If the contact's first op is upsert_mc_member (i.e. it
-                # may create a new subscriber), check the cap BEFORE we
-                # start any ops for this contact.
-                has_upsert = any(o.get("type") == "upsert_mc_member" for o in ops)
-                if has_upsert and self.cap_guard and self.cap_guard.enabled:
-                    if not await self.cap_guard.allow_subscribe():
-                        self.cap_guard.contacts_skipped += 1
-                        summary["skipped"] += len(ops)
-                        summary["total_operations"] += len(ops)
-                        journal.log({
-                            "event": "contact_skipped_cap",
-                            "email": email,
-                            "reason": "audience_cap_reached",
-                            "cap": self.cap_guard.cap,
-                            "current_count": self.cap_guard.current_count,
-                        })
-                        logger.warning(
-                            f"SKIPPED {email}: audience cap {self.cap_guard.cap:,} reached "
-                            f"(current {self.cap_guard.current_count:,})"
-                        )
-                        continue
-                # ── End cap gate ───────────────────────────────────────
-                
-                logger.info(f"Processing contact: {email} (VID: {vid})")
-                summary["contacts_processed"] += 1
-                
-                try:
-                    for op in ops:
-                        summary["total_operations"] += 1
-                        op_type = op.get("type")
-                        
-                        logger.debug(f"  Executing {op_type}...")
-                        
-                        result = await self._execute_operation(op, journal)
-                        
-                        if result["success"]:
-                            summary["successful"] += 1
-                        elif result["skipped"]:
-                            summary["skipped"] += 1
-                        else:
-                            summary["failed"] += 1
-                            
-                            # Check if this is a dangerous failure
-                            if result.get("dangerous"):
-                                logger.error(f"DANGEROUS FAILURE on {email}: {result['error']}")
-                                journal.log({
-                                    "event": "execution_stopped",
-                                    "reason": "dangerous_failure",
-                                    "contact": email,
-                                    "operation": op,
-                                    "error": result["error"]
-                                })
-                                summary["ended_at"] = datetime.utcnow().isoformat()
-                                summary["stopped_reason"] = "dangerous_failure"
-                                return summary
-                
-                except Exception as e:
-                    logger.error(f"Unexpected error processing {email}: {e}")
-                    summary["failed"] += 1
-                    journal.log({
-                        "event": "contact_error",
-                        "email": email,
-                        "error": str(e)
-                    })
+            # Bulk upsert members known to be subscribed/pending in one request per batch
+            self._batched_upserts = {}
+            if self.config.sync.batch_upserts and not self.dry_run:
+                self._batched_upserts = await self._batch_upserts(operations_list, journal)
+            
+            # Large groups of tag/unsubscribe/archive ops go through /batches jobs
+            self._batched_ops = {}
+            if self.config.sync.batch_operations_min_contacts > 0 and not self.dry_run:
+                self._batched_ops = await self._run_batch_waves(operations_list, journal)
+            
+            workers = max(1, self.config.sync.executor_workers)
+            logger.info(f"Processing {len(operations_list)} contacts (workers={workers})...")
+            
+            if workers == 1:
+                for contact_ops in operations_list:
+                    stop = await self._execute_contact(contact_ops, journal, summary)
+                    if stop:
+                        return self._stop_execution(stop, journal, summary)
+            else:
+                stop = await self._execute_contacts_concurrently(
+                    operations_list, workers, journal, summary
+                )
+                if stop:
+                    return self._stop_execution(stop, journal, summary)
             
             journal.log({
                 "event": "execution_completed",
@@ -346,10 +319,510 @@ class SyncExecutor:
             }
         
         logger.info(f"Execution complete: {summary['successful']} successful, "
-                   f"{summary['failed']} failed, {summary['skipped']} skipped")
+                   f"{summary['failed']} failed, {summary['skipped']} skipped, "
+                   f"{summary['deferred']} deferred")
         
         return summary
     
+    async def _execute_contacts_concurrently(
+        self,
+        operations_list: List[Dict[str, Any]],
+        workers: int,
+        journal: OperationJournal,
+        summary: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Execute contacts on a pool of workers (ops within a contact stay ordered).
+        
+        Workers pull contacts in plan order and share the clients' rate limiters.
+        A dangerous failure stops the pool: in-flight contacts finish their
+        current operation and start no further ones.
+        
+        Returns:
+            Stop info from the first dangerous failure, or None
+        """
+        contacts = iter(operations_list)
+        stop_event = asyncio.Event()
+        stops: List[Dict[str, Any]] = []
+        
+        async def worker():
+            for contact_ops in contacts:
+                if stop_event.is_set():
+                    return
+                stop = await self._execute_contact(contact_ops, journal, summary, stop_event, workers)
+                if stop:
+                    stops.append(stop)
+                    stop_event.set()
+                    return
+        
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        return stops[0] if stops else None
+    
+    async def _execute_contact(
+        self,
+        contact_ops: Dict[str, Any],
+        journal: OperationJournal,
+        summary: Dict[str, Any],
+        stop_event: Optional[asyncio.Event] = None,
+        workers: int = 1
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Execute one contact's operations in order (cap gate first).
+        
+        Args:
+            contact_ops: Plan entry {"email", "vid", "operations"}
+            journal: Operation journal
+            summary: Execution summary (updated in place)
+            stop_event: Set when another worker hit a dangerous failure
+            workers: Concurrent workers (for cap-gate serialisation)
+        
+        Returns:
+            Stop info dict on dangerous failure, else None
+        """
+        email = contact_ops.get("email")
+        vid = contact_ops.get("vid")
+        ops = contact_ops.get("operations", [])
+        
+        # Batch-subscribed upserts already ran (existing subscribed members - no new slot)
+        has_upsert = any(
+            o.get("type") == "upsert_mc_member"
+            and (o.get("email") or "").lower() not in self._batched_upserts
+            for o in ops
+        )
+        guarded = has_upsert and self.cap_guard is not None and self.cap_guard.enabled
+        
+        # Near the cap, contacts that may subscribe run one at a time so
+        # concurrent workers cannot overshoot it
+        if guarded and workers > 1 and self.cap_guard.remaining_slots <= workers:
+            async with self._cap_lock:
+                return await self._execute_contact_ops(
+                    email, vid, ops, guarded, journal, summary, stop_event, contact_ops.get("state")
+                )
+        
+        return await self._execute_contact_ops(
+            email, vid, ops, guarded, journal, summary, stop_event, contact_ops.get("state")
+        )
+    
+    async def _execute_contact_ops(
+        self,
+        email: str,
+        vid: Any,
+        ops: List[Dict[str, Any]],
+        guarded: bool,
+        journal: OperationJournal,
+        summary: Dict[str, Any],
+        stop_event: Optional[asyncio.Event],
+        state: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Cap gate + ordered operation loop for one contact (see _execute_contact)."""
+        # ── Audience cap gate ──────────────────────────────────
+        # If the contact has an upsert_mc_member (i.e. it may create
+        # a new subscriber), check the cap BEFORE we start any ops
+        # for this contact.
+        if guarded:
+            if not await self.cap_guard.allow_subscribe():
+                self.cap_guard.contacts_skipped += 1
+                summary["skipped"] += len(ops)
+                summary["total_operations"] += len(ops)
+                journal.log({
+                    "event": "contact_skipped_cap",
+                    "email": email,
+                    "reason": "audience_cap_reached",
+                    "cap": self.cap_guard.cap,
+                    "current_count": self.cap_guard.current_count,
+                })
+                logger.warning(
+                    f"SKIPPED {email}: audience cap {self.cap_guard.cap:,} reached "
+                    f"(current {self.cap_guard.current_count:,})"
+                )
+                return None
+        # ── End cap gate ───────────────────────────────────────
+        
+        logger.info(f"Processing contact: {email} (VID: {vid})")
+        summary["contacts_processed"] += 1
+        
+        coalesced: Dict[int, Dict[str, Any]] = {}  # op index → result of a merged tags call
+        
+        try:
+            for index, op in enumerate(ops):
+                # Another worker hit a dangerous failure - start no further ops
+                if stop_event is not None and stop_event.is_set():
+                    journal.log({
+                        "event": "contact_interrupted",
+                        "email": email,
+                        "reason": "execution_stopped",
+                        "remaining_operations": len(ops) - index
+                    })
+                    return None
+                
+                summary["total_operations"] += 1
+                op_type = op.get("type")
+                
+                logger.debug(f"  Executing {op_type}...")
+                
+                # Already run (and journaled) in a /batches wave
+                result = self._batched_ops.get(((email or "").lower(), index))
+                if result is None and index not in coalesced:
+                    group = self._tag_group(email, ops, index)
+                    if len(group) > 1:
+                        coalesced.update(await self._execute_tag_group(email, ops, group, journal))
+                if result is None:
+                    result = coalesced.get(index) or await self._execute_operation(op, journal)
+                
+                if result["success"]:
+                    summary["successful"] += 1
+                    if op_type == "archive_mc_member" and not self.dry_run:
+                        self.archived_emails.add((op.get("email") or email or "").lower())
+                elif result.get("deferred"):
+                    # Out of retry/time budget: left for the next run to re-plan
+                    summary["deferred"] += 1
+                    state = None
+                elif result["skipped"]:
+                    summary["skipped"] += 1
+                else:
+                    summary["failed"] += 1
+                    
+                    # Check if this is a dangerous failure
+                    if result.get("dangerous"):
+                        logger.error(f"DANGEROUS FAILURE on {email}: {result['error']}")
+                        return {"contact": email, "operation": op, "error": result["error"]}
+                    
+                    # Failed op: leave stored state alone so the contact is re-planned
+                    state = None
+            
+            self._update_state(email, vid, ops, state)
+        
+        except Exception as e:
+            logger.error(f"Unexpected error processing {email}: {e}")
+            summary["failed"] += 1
+            journal.log({
+                "event": "contact_error",
+                "email": email,
+                "error": str(e)
+            })
+        
+        return None
+    
+    TAG_OPERATIONS = {"apply_mc_tag", "remove_mc_tag"}
+    
+    def _tag_group(self, email: str, ops: List[Dict[str, Any]], start: int) -> List[int]:
+        """
+        Indexes of the run of consecutive tag ops starting at `start`.
+        
+        Only adjacent tag ops are merged, so the call still happens at the
+        same point relative to upserts, unsubscribes and archives.
+        """
+        if not self.config.sync.coalesce_tag_operations or self.dry_run:
+            return []
+        
+        group = []
+        for index in range(start, len(ops)):
+            if ops[index].get("type") not in self.TAG_OPERATIONS:
+                break
+            if ((email or "").lower(), index) in self._batched_ops:
+                break
+            group.append(index)
+        return group
+    
+    async def _execute_tag_group(
+        self,
+        email: str,
+        ops: List[Dict[str, Any]],
+        group: List[int],
+        journal: OperationJournal
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Send a run of apply_mc_tag/remove_mc_tag ops as one tags request.
+        
+        Each merged op is journaled on its own (coalesced=True). If a tag is
+        both applied and removed in the run, the later op wins.
+        
+        Returns:
+            Dict mapping op index → result dict
+        """
+        final: Dict[str, str] = {}
+        for index in group:
+            op = ops[index]
+            if op.get("type") == "apply_mc_tag":
+                final[op.get("tag")] = "active"
+            else:
+                tags = op["tags"] if "tags" in op else ([op["tag"]] if "tag" in op else [])
+                for tag in tags:
+                    final[tag] = "inactive"
+        
+        add = [tag for tag, status in final.items() if status == "active"]
+        remove = [tag for tag, status in final.items() if status == "inactive"]
+        
+        try:
+            result = await self.mc_client.update_tags(email, add=add, remove=remove)
+        except RetryBudgetExhausted as e:
+            logger.warning(f"Deferring tag update for {email}: {e}")
+            for index in group:
+                journal.log({
+                    "event": "operation_deferred",
+                    "operation": ops[index],
+                    "reason": str(e),
+                    "coalesced": True
+                })
+            return {index: self._deferred(e) for index in group}
+        except Exception as e:
+            logger.error(f"Tag update failed for {email} (add={add}, remove={remove}): {e}")
+            failure = {"success": False, "skipped": False, "error": str(e), "dangerous": False}
+            for index in group:
+                journal.log({
+                    "event": "operation_failed",
+                    "operation": ops[index],
+                    "error": str(e),
+                    "dangerous": False,
+                    "coalesced": True
+                })
+            return {index: failure for index in group}
+        
+        results = {}
+        for index in group:
+            op = ops[index]
+            entry = {
+                "event": "operation_executed",
+                "operation_type": op.get("type"),
+                "email": email,
+                "result": result,
+                "coalesced": True
+            }
+            if op.get("type") == "apply_mc_tag":
+                entry["tag"] = op.get("tag")
+            else:
+                entry["tags"] = op["tags"] if "tags" in op else ([op["tag"]] if "tag" in op else [])
+            journal.log(entry)
+            results[index] = {"success": True, "skipped": False}
+        return results
+    
+    # Only members whose plan-time status is one of these are batch-subscribed.
+    # Unsubscribed/cleaned (INV-005 PATCH-only), archived (restore) and unknown
+    # members keep the per-member upsert_member path.
+    BATCH_UPSERT_STATUSES = {"subscribed", "pending"}
+    
+    async def _batch_upserts(
+        self,
+        operations_list: List[Dict[str, Any]],
+        journal: OperationJournal
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run eligible upsert_mc_member ops through batch-subscribe up front.
+        
+        Runs before any contact's other ops, so per-contact ordering
+        (upsert before tags) still holds. Members the batch reports as errors
+        are left to the per-member path.
+        
+        Returns:
+            Dict mapping lowercase email → batch result for successful upserts
+        """
+        members = []
+        for contact_ops in operations_list:
+            for op in contact_ops.get("operations", []):
+                if op.get("type") == "upsert_mc_member" and op.get("mc_status") in self.BATCH_UPSERT_STATUSES:
+                    members.append({"email": op.get("email"), "merge_fields": op.get("merge_fields", {})})
+        
+        if not members:
+            return {}
+        
+        logger.info(f"Batch-subscribing {len(members)} existing members "
+                    f"({self.config.sync.batch_size} per request)...")
+        try:
+            results = await self.mc_client.batch_upsert_members(
+                members, chunk_size=self.config.sync.batch_size
+            )
+        except Exception as e:
+            logger.warning(f"Batch subscribe failed, falling back to per-member upserts: {e}")
+            return {}
+        
+        batched = {}
+        for email, result in results.items():
+            if not result["success"]:
+                logger.warning(f"  Batch upsert error for {email}: {result.get('error')} - retrying individually")
+                continue
+            
+            batched[email] = result
+            journal.log({
+                "event": "operation_executed",
+                "operation_type": "upsert_mc_member",
+                "email": result.get("email_address") or email,
+                "result": result,
+                "batched": True
+            })
+            
+            # Record new subscribe for audience cap tracking
+            if self.cap_guard and result.get("action") == "created":
+                self.cap_guard.record_subscribe(result["action"])
+        
+        logger.info(f"  Batch upserts: {len(batched)} done, {len(results) - len(batched)} left for per-member path")
+        return batched
+    
+    BATCHABLE_OPERATIONS = {"apply_mc_tag", "remove_mc_tag", "unsubscribe_mc_member", "archive_mc_member"}
+    
+    def _batchable_prefix(self, email: str, ops: List[Dict[str, Any]]) -> List[tuple]:
+        """
+        Leading (op index, op) pairs of a contact that can run in /batches waves.
+        
+        Stops at the first op that must run live (HubSpot ops, per-member
+        upserts, archives while archival is disabled); a batch-subscribed upsert
+        already ran and is passed over.
+        """
+        prefix = []
+        for index, op in enumerate(ops):
+            op_type = op.get("type")
+            if op_type == "upsert_mc_member" and (email or "").lower() in self._batched_upserts:
+                continue
+            if op_type not in self.BATCHABLE_OPERATIONS:
+                break
+            if op_type == "archive_mc_member" and not self.config.safety.allow_archive:
+                break
+            prefix.append((index, op))
+        return prefix
+    
+    def _batch_operation(self, operation_id: str, op: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Translate a plan op into a /batches operation (None = nothing to send)."""
+        email = op.get("email")
+        op_type = op.get("type")
+        engine = self.batch_engine
+        
+        if op_type == "apply_mc_tag":
+            return engine.tags_operation(operation_id, email, add=[op.get("tag")])
+        if op_type == "remove_mc_tag":
+            tags = op["tags"] if "tags" in op else ([op["tag"]] if "tag" in op else [])
+            return engine.tags_operation(operation_id, email, remove=tags) if tags else None
+        if op_type == "unsubscribe_mc_member":
+            return engine.unsubscribe_operation(operation_id, email)
+        return engine.archive_operation(operation_id, email)
+    
+    @staticmethod
+    def _interpret_batch_result(op_type: str, batch_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a /batches result to the executor's result dict (same rules as the live path)."""
+        if batch_result["success"]:
+            return {"success": True, "skipped": False}
+        
+        status_code = batch_result["status_code"]
+        detail = batch_result.get("response")
+        if isinstance(detail, dict):
+            detail = detail.get("detail") or detail.get("title") or detail
+        error = f"{status_code} - {detail}"
+        
+        # Same idempotency as archive_member / unsubscribe handling
+        if op_type == "archive_mc_member" and status_code == 404:
+            return {"success": True, "skipped": False}
+        if op_type == "unsubscribe_mc_member" and ("already" in error.lower() or "compliance" in error.lower()):
+            return {"success": True, "skipped": True}
+        
+        return {"success": False, "skipped": False, "error": error, "dangerous": False}
+    
+    async def _run_batch_waves(
+        self,
+        operations_list: List[Dict[str, Any]],
+        journal: OperationJournal
+    ) -> Dict[tuple, Dict[str, Any]]:
+        """
+        Run contacts' leading Mailchimp ops as /batches jobs, one wave per position.
+        
+        A batch runs its operations in no particular order, so wave N holds
+        only the N-th batchable op of each contact - a contact's ops still
+        run in plan order (untag → archive across two waves).
+        
+        Returns:
+            Dict mapping (lowercase email, op index) → executor result dict
+        """
+        prefixes = {}
+        for contact_ops in operations_list:
+            email = (contact_ops.get("email") or "").lower()
+            prefix = self._batchable_prefix(email, contact_ops.get("operations", []))
+            if prefix:
+                prefixes[email] = prefix
+        
+        if len(prefixes) < self.config.sync.batch_operations_min_contacts:
+            return {}
+        
+        if self.batch_engine is None:
+            self.batch_engine = MailchimpBatchEngine(
+                HTTPBatchTransport(self.mc_client),
+                audience_id=self.mc_client.audience_id,
+                poll_interval=self.config.sync.batch_poll_interval
+            )
+        
+        batched: Dict[tuple, Dict[str, Any]] = {}
+        waves = max(len(prefix) for prefix in prefixes.values())
+        logger.info(f"Running Mailchimp ops for {len(prefixes)} contacts as {waves} /batches wave(s)...")
+        
+        for wave in range(waves):
+            wave_ops = {}
+            for email, prefix in prefixes.items():
+                if wave >= len(prefix):
+                    continue
+                index, op = prefix[wave]
+                operation_id = f"{email}#{index}"
+                batch_op = self._batch_operation(operation_id, op)
+                if batch_op is None:
+                    batched[(email, index)] = {"success": True, "skipped": True}
+                    continue
+                wave_ops[operation_id] = (email, index, op, batch_op)
+            
+            try:
+                results = await self.batch_engine.run([entry[3] for entry in wave_ops.values()])
+            except Exception as e:
+                # Remaining ops (this wave onward) run on the per-contact path
+                logger.warning(f"  /batches wave {wave + 1} failed, continuing per-operation: {e}")
+                for email, prefix in prefixes.items():
+                    for index, _ in prefix[wave:]:
+                        batched.pop((email, index), None)
+                break
+            
+            for operation_id, (email, index, op, _) in wave_ops.items():
+                result = self._interpret_batch_result(op.get("type"), results[operation_id])
+                batched[(email, index)] = result
+                journal.log({
+                    "event": "operation_executed" if result["success"] else "operation_failed",
+                    "operation_type": op.get("type"),
+                    "email": op.get("email"),
+                    "operation": op,
+                    "status_code": results[operation_id]["status_code"],
+                    "batched": True,
+                    **({"error": result["error"]} if not result["success"] else {})
+                })
+        
+        return batched
+    
+    def _update_state(
+        self,
+        email: str,
+        vid: Any,
+        ops: List[Dict[str, Any]],
+        state: Optional[Dict[str, Any]]
+    ):
+        """Record a contact's synced state once all its operations went through."""
+        if self.state_store is None or self.dry_run:
+            return
+        
+        # Archived contacts leave the synced set - re-plan from scratch if they return
+        if any(op.get("type") == "archive_mc_member" for op in ops):
+            self.state_store.forget([email])
+        elif state is not None:
+            self.state_store.record([{"email": email, "vid": vid, **state}])
+    
+    def _stop_execution(
+        self,
+        stop: Dict[str, Any],
+        journal: OperationJournal,
+        summary: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Journal a dangerous-failure stop and finalise the summary."""
+        journal.log({
+            "event": "execution_stopped",
+            "reason": "dangerous_failure",
+            "contact": stop["contact"],
+            "operation": stop["operation"],
+            "error": stop["error"]
+        })
+        summary["ended_at"] = datetime.utcnow().isoformat()
+        summary["stopped_reason"] = "dangerous_failure"
+        return summary
+    
     async def _execute_operation(
         self,
         op: Dict[str, Any],
@@ -401,6 +874,15 @@ class SyncExecutor:
                 })
                 return {"success": False, "skipped": True, "error": f"Unknown type: {op_type}"}
         
+        except RetryBudgetExhausted as e:
+            logger.warning(f"Deferring {op_type}: {e}")
+            journal.log({
+                "event": "operation_deferred",
+                "operation": op,
+                "reason": str(e)
+            })
+            return self._deferred(e)
+        
         except Exception as e:
             logger.error(f"Operation failed: {op_type} - {e}")
             journal.log({
@@ -411,6 +893,11 @@ class SyncExecutor:
             })
             return {"success": False, "skipped": False, "error": str(e), "dangerous": False}
     
+    @staticmethod
+    def _deferred(error: Exception) -> Dict[str, Any]:
+        """Result for an op not attempted (again) because its request ran out of budget."""
+        return {"success": False, "skipped": False, "deferred": True, "error": str(error), "dangerous": False}
+    
     async def _execute_upsert_mc_member(
         self,
         op: Dict[str, Any],
@@ -430,6 +917,10 @@ class SyncExecutor:
             })
             return {"success": True, "skipped": False, "simulated": True}
         
+        # Already applied (and journaled) by the up-front batch-subscribe
+        if email and email.lower() in self._batched_upserts:
+            return {"success": True, "skipped": False, "batched": True}
+        
         try:
             result = await self.mc_client.upsert_member(email, merge_fields, status_if_new)
             
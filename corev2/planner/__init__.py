@@ -1,6 +1,7 @@
 """Planner package initialization."""
 
 from .primary import SyncPlanner
+from .planner_engine import PlannerEngine
 from .secondary import SecondaryPlanner
 
-__all__ = ["SyncPlanner", "SecondaryPlanner"]
+__all__ = ["SyncPlanner", "PlannerEngine", "SecondaryPlanner"]
@@ -1,402 +1,824 @@
 """
-Primary Sync Planner - Generates deterministic operations_plan.json
-
-Enforces V1 Behavioral Invariants:
-- INV-001: Three-tier import stream architecture (exact exclusion matrix)
-- INV-002: Compliance lists (762, 773) NEVER synced - DYNAMIC LISTS auto-managed by HubSpot
-- INV-003: Single-tag enforcement (first-wins)
-- INV-004: ORI_LISTS source tracking (single-value string)
-- INV-007: Force subscribe behavior (all contacts → "subscribed")
-
-Generates operations for:
-- upsert_mc_member: Create/update Mailchimp member (never resubscribe)
-- apply_mc_tag: Apply HubSpot list tag (single-tag rule)
-- remove_mc_tag: Remove orphaned tags
-- archive_mc_member: Archive fully-orphaned contacts
-- update_hs_property: Update HubSpot properties (ORI_LISTS)
+Pure sync planning engine.
+
+Planning is a function of (HubSpot snapshot, Mailchimp snapshot, config):
+PlannerEngine does no I/O, so a plan can be re-run from saved snapshots
+and benchmarked on its own. SyncPlanner (primary.py) fetches the
+snapshots and hands them to the engine.
+
+Enforces the V1 behavioural invariants:
+- INV-002: Compliance lists (762, 773) never synced
+- INV-004: Single-tag enforcement (group priority, first-tag priority)
+- INV-006: Smart archival preservation (via ArchivalReconciliation)
+- INV-007: List exclusion rules
+- INV-008: ORI_LISTS source tracking
 """
 
-import hashlib
-import json
-from typing import Dict, List, Set, Any, Optional
-from datetime import datetime, timezone
-from dataclasses import dataclass, asdict
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from corev2 import codec
+from corev2.config.loader import compute_config_hash
+from corev2.config.schema import V2Config
+from corev2.state import contact_fingerprint
+from .rules import COMPLIANCE_LISTS, CompiledRules, MembershipDecision, compile_rules
+
+
+logger = logging.getLogger(__name__)
+
+
+def missing_member(email: str) -> Dict[str, Any]:
+    """MailchimpClient.get_member result for an email not in the audience."""
+    return {
+        "found": False,
+        "status": None,
+        "tags": [],
+        "merge_fields": {},
+        "email_address": email
+    }
 
 
 @dataclass
-class Contact:
-    """Contact data from HubSpot."""
-    id: str
-    email: str
-    properties: Dict[str, Any]
-    list_memberships: Set[str]  # HubSpot list IDs this contact belongs to
+class HubSpotSnapshot:
+    """Hydrated HubSpot contacts: email → {"vid", "email", "properties", "list_ids"}."""
+    contacts: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready form (list_ids sorted)."""
+        return {
+            "contacts": [
+                {**contact, "list_ids": sorted(contact["list_ids"])}
+                for contact in self.contacts.values()
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HubSpotSnapshot":
+        return cls(contacts={
+            contact["email"]: {**contact, "list_ids": set(contact["list_ids"])}
+            for contact in data.get("contacts", [])
+        })
+
+
+@dataclass
+class MailchimpSnapshot:
+    """
+    Mailchimp state the planner needs.
+
+    members: lowercase email → MailchimpClient.get_member result, for the
+             contacts being planned (a missing email means "not in the audience")
+    lookup_errors: lowercase email → error for failed reads (STRICT MODE skips them)
+    audience: every audience member in get_all_members shape, for archival
+              reconciliation (None = not loaded)
+    """
+    members: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    lookup_errors: Dict[str, str] = field(default_factory=dict)
+    audience: Optional[List[Dict[str, Any]]] = None
+
+    @classmethod
+    def from_audience(cls, members: Iterable[Dict[str, Any]]) -> "MailchimpSnapshot":
+        """Snapshot from a full audience scan (every member indexed and kept for archival)."""
+        snapshot = cls(audience=[])
+        for member in members:
+            snapshot.audience.append(member)
+            email = (member.get("email_address") or "").lower()
+            if email:
+                snapshot.members[email] = {
+                    "found": True,
+                    "status": member.get("status"),
+                    "tags": list(member.get("tags", [])),
+                    "merge_fields": member.get("merge_fields", {}) or {},
+                    "email_address": member.get("email_address"),
+                }
+        return snapshot
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"members": self.members, "lookup_errors": self.lookup_errors, "audience": self.audience}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MailchimpSnapshot":
+        return cls(
+            members=data.get("members", {}),
+            lookup_errors=data.get("lookup_errors", {}),
+            audience=data.get("audience")
+        )
+
+
+def save_snapshots(
+    path: Union[str, Path],
+    hubspot: HubSpotSnapshot,
+    mailchimp: MailchimpSnapshot,
+    stored_fingerprints: Optional[Dict[str, str]] = None
+):
+    """Write planner inputs to a JSON file (re-plan later with load_snapshots + PlannerEngine.plan)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        codec.dump({
+            "hubspot": hubspot.to_dict(),
+            "mailchimp": mailchimp.to_dict(),
+            "stored_fingerprints": stored_fingerprints,
+        }, f)
+
+
+def load_snapshots(
+    path: Union[str, Path]
+) -> Tuple[HubSpotSnapshot, MailchimpSnapshot, Optional[Dict[str, str]]]:
+    """Read planner inputs written by save_snapshots."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = codec.load(f)
+    return (
+        HubSpotSnapshot.from_dict(data["hubspot"]),
+        MailchimpSnapshot.from_dict(data["mailchimp"]),
+        data.get("stored_fingerprints")
+    )
 
 
 @dataclass
-class MailchimpMember:
-    """Mailchimp member current state."""
-    email: str
-    status: str  # subscribed, unsubscribed, cleaned, pending, archived
-    tags: List[str]  # Active tags
-    merge_fields: Dict[str, Any]
+class Selection:
+    """Contacts a plan covers, after --only-* filtering and unchanged-contact skipping."""
+    contacts: Dict[str, Dict[str, Any]]
+    fingerprints: Dict[str, str] = field(default_factory=dict)
+    properties: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    desired: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # email → {"merge_fields", "tags"}
+    unchanged_contacts: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+    @property
+    def unchanged(self) -> int:
+        return len(self.unchanged_contacts)
+
+
+def _property_value(properties: Dict[str, Any], prop_name: str) -> str:
+    """Property value as a string (v1 nested {"value": ...} and v3 flat formats)."""
+    prop = properties.get(prop_name, "")
+    if isinstance(prop, dict):
+        return prop.get("value", "")
+    return str(prop) if prop else ""
+
+
+def _merge_fields(properties: Dict[str, Any]) -> Dict[str, str]:
+    """Mailchimp merge fields pushed for a contact."""
+    return {
+        "FNAME": _property_value(properties, "firstname"),
+        "LNAME": _property_value(properties, "lastname")
+    }
 
 
 class PlannerEngine:
     """
-    Generates deterministic operations plan for Primary Sync (HubSpot → Mailchimp).
-    
-    Enforces all V1 invariants with zero tolerance.
+    Generates the operations plan from snapshots - no API calls.
+
+    Same plan as SyncPlanner has always produced: per-contact operations,
+    no-op skipping, sync state, archival reconciliation and the HubSpot
+    list-removal second pass.
     """
-    
-    def __init__(self, config: "V2Config"):
-        """Initialize planner with config."""
+
+    # Statuses where upsert_member only PATCHes/PUTs merge_fields (archived is restored instead)
+    UPSERT_NOOP_STATUSES = {"subscribed", "pending", "unsubscribed", "cleaned"}
+
+    def __init__(self, config: V2Config):
+        """
+        Initialize engine.
+
+        Args:
+            config: Validated V2Config
+        """
         self.config = config
-        self.operations = []
-        self.stats = {
-            "contacts_processed": 0,
-            "contacts_excluded": 0,
-            "upserts_planned": 0,
-            "tags_added": 0,
-            "tags_removed": 0,
-            "archives_planned": 0
-        }
-        
-        # Track which contacts we've already tagged (INV-003: single-tag enforcement)
-        self.tagged_contacts: Set[str] = set()
-        
-        # Managed tags (tags created by HubSpot sync)
-        self.managed_tags_pattern = f"{config.sync.tag_prefix}hs_"
-    
-    def generate_plan(
+        self.rules: CompiledRules = compile_rules(config)
+        self.config_hash = compute_config_hash(config)
+        # Safety flags are not in the config hash but change per-contact operations
+        self.safety_flags = {"enable_hubspot_writes": config.safety.enable_hubspot_writes}
+        self.noops_skipped: Dict[str, int] = {}  # reason → count (diff-aware planning)
+        self.desired_state: Dict[str, Dict[str, Any]] = {}  # email → {"merge_fields", "tags"} planned
+
+    # ------------------------------------------------------------------
+    # Contact selection
+    # ------------------------------------------------------------------
+
+    def select(
         self,
-        contacts: List[Contact],
-        mc_members: Dict[str, MailchimpMember],
-        list_id_to_name: Dict[str, str]
-    ) -> Dict[str, Any]:
+        hubspot: HubSpotSnapshot,
+        stored_fingerprints: Optional[Dict[str, str]] = None,
+        only_email: Optional[str] = None,
+        only_vid: Optional[str] = None,
+        mailchimp: Optional[MailchimpSnapshot] = None
+    ) -> Selection:
         """
-        Generate operations plan for contacts.
-        
+        Pick the contacts to plan.
+
+        A contact whose fingerprint matches its last sync is skipped only if
+        its Mailchimp member still holds what that sync pushed (members edited,
+        untagged or archived by hand are re-planned). Without `mailchimp` the
+        check is pending: such contacts stay in unchanged_contacts, whose
+        members the Mailchimp fetch must also read.
+
         Args:
-            contacts: List of HubSpot contacts with list memberships
-            mc_members: Current Mailchimp members by email (lowercase)
-            list_id_to_name: Map of HubSpot list ID → name
-        
+            hubspot: HubSpot snapshot
+            stored_fingerprints: lowercase email → fingerprint of the last sync
+                                 (None = no state store: nothing skipped, no state recorded)
+            only_email: Only this contact (deterministic targeting)
+            only_vid: Only this VID (deterministic targeting)
+            mailchimp: Observed Mailchimp state to confirm unchanged contacts against
+
         Returns:
-            {
-                "version": "2.0",
-                "generated_at": ISO8601,
-                "config_file": path,
-                "config_hash": hash,
-                "summary": {...},
-                "operations": [...]
+            Selection (fingerprints only when stored_fingerprints is given)
+        """
+        contacts = hubspot.contacts
+        if only_email:
+            contacts = {only_email: contacts[only_email]} if only_email in contacts else {}
+        elif only_vid:
+            contacts = next(
+                ({email: data} for email, data in contacts.items() if data["vid"] == only_vid), {}
+            )
+
+        selection = Selection(contacts=contacts)
+        if stored_fingerprints is None:
+            return selection
+
+        for email, contact_data in contacts.items():
+            # Only planning inputs (batch reads also return e.g. lastmodifieddate)
+            properties = selection.properties[email] = {
+                prop: contact_data["properties"].get(prop) for prop in self.rules.fetch_properties
+            }
+            desired = selection.desired[email] = {
+                "merge_fields": _merge_fields(properties),
+                "tags": self.target_tags(email, contact_data["list_ids"], properties, log=False) or []
             }
+            selection.fingerprints[email] = contact_fingerprint(
+                contact_data["list_ids"], properties, self.config_hash,
+                desired["merge_fields"], desired["tags"], self.safety_flags
+            )
+
+        # Single-contact debug runs are always fully planned
+        if not (only_email or only_vid):
+            selection.contacts, selection.unchanged_contacts = {}, {}
+            for email, data in contacts.items():
+                unchanged = (
+                    stored_fingerprints.get(email.lower()) == selection.fingerprints[email]
+                    and (mailchimp is None or self._member_in_sync(email, selection.desired[email], mailchimp))
+                )
+                if unchanged:
+                    selection.unchanged_contacts[email] = data
+                else:
+                    selection.contacts[email] = data
+        return selection
+
+    def _member_in_sync(self, email: str, desired: Dict[str, Any], mailchimp: MailchimpSnapshot) -> bool:
+        """True if the observed member still holds the merge fields and tags a plan would push."""
+        member = mailchimp.members.get(email.lower())
+        if not self._upsert_is_noop(member, desired["merge_fields"]):
+            return False
+        existing_tags = member.get("tags") or []
+        # First-tag priority keeps whichever source tag the member has
+        if not any(tag in self.rules.source_tags for tag in existing_tags):
+            return False
+        return all(tag in existing_tags for tag in desired["tags"][1:])
+
+    def needs_member(self, list_ids: Set[str], decision: Optional[MembershipDecision] = None) -> bool:
+        """True if planning this contact reads its Mailchimp state (not compliance, has a target tag)."""
+        if decision is None:
+            decision = self.rules.decide(self.rules.encode(list_ids))
+        return not decision.compliance and decision.target_list is not None
+
+    def members_to_fetch(self, selection: Selection) -> List[str]:
+        """Emails (in plan order, then unchanged contacts) whose Mailchimp state the plan depends on."""
+        return [
+            email for contacts in (selection.contacts, selection.unchanged_contacts)
+            for email, data in contacts.items()
+            if self.needs_member(data["list_ids"])
+        ]
+
+    # ------------------------------------------------------------------
+    # Per-contact rules
+    # ------------------------------------------------------------------
+
+    def _apply_tag_overrides(
+        self,
+        list_id: str,
+        primary_tag: str,
+        properties: Dict[str, Any],
+        log: bool = True
+    ) -> str:
         """
-        self.operations = []
-        self.stats = {
-            "contacts_processed": 0,
-            "contacts_excluded": 0,
-            "upserts_planned": 0,
-            "tags_added": 0,
-            "tags_removed": 0,
-            "archives_planned": 0
-        }
-        self.tagged_contacts = set()
-        
-        # INV-001: Build exclusion matrix from config
-        exclusion_matrix = self._build_exclusion_matrix()
-        
-        # Phase 1: Process each contact through import streams
-        for contact in contacts:
-            self.stats["contacts_processed"] += 1
-            
-            # INV-002: Skip compliance list members (never sync)
-            if self._is_compliance_excluded(contact):
-                self.stats["contacts_excluded"] += 1
-                continue
-            
-            # Determine which lists contact is eligible for (after exclusions)
-            eligible_lists = self._apply_exclusion_matrix(contact, exclusion_matrix)
-            
-            if not eligible_lists:
-                self.stats["contacts_excluded"] += 1
-                continue
-            
-            # Get current Mailchimp state
-            mc_member = mc_members.get(contact.email.lower())
-            
-            # Plan upsert operation
-            self._plan_upsert(contact, mc_member)
-            
-            # Plan tagging (INV-003: single-tag, first-wins)
-            self._plan_tagging(contact, mc_member, eligible_lists, list_id_to_name)
-            
-            # Plan ORI_LISTS update (INV-004: source tracking)
-            self._plan_ori_lists_update(contact, eligible_lists)
-        
-        # Phase 2: Plan tag removals (orphaned tags)
-        self._plan_tag_removals(contacts, mc_members, list_id_to_name)
-        
-        # Phase 3: Plan archival for fully-orphaned managed contacts
-        self._plan_archival(contacts, mc_members)
-        
-        # Sort operations for determinism (email then op type)
-        self.operations.sort(key=lambda op: (op.get("email", ""), op["type"]))
-        
-        # Build plan document
-        from corev2.config import compute_config_hash
-        plan = {
-            "version": "2.0",
-            "generated_at": datetime.now(timezone.utc).isoformat(),
-            "config_file": "corev2/config/defaults.yaml",
-            "config_hash": compute_config_hash(self.config),
-            "summary": {
-                "total_operations": len(self.operations),
-                "contacts_processed": self.stats["contacts_processed"],
-                "operations_by_type": self._count_operations_by_type()
-            },
-            "operations": self.operations
-        }
-        
-        return plan
-    
-    def _build_exclusion_matrix(self) -> Dict[str, Set[str]]:
-        """Build exclusion matrix for each list from config (INV-001)."""
-        matrix = {}
-        em = self.config.exclusion_matrix
-        
-        # GROUP 1: General Marketing
-        for list_id in em.general_marketing.lists:
-            matrix[list_id] = set(em.general_marketing.exclude)
-        
-        # GROUP 2: Special Campaigns
-        for list_id in em.special_campaigns.lists:
-            matrix[list_id] = set(em.special_campaigns.exclude)
-        
-        # GROUP 3: Manual Override
-        for list_id in em.manual_override.lists:
-            matrix[list_id] = set(em.manual_override.exclude)
-        
-        return matrix
-    
-    def _is_compliance_excluded(self, contact: Contact) -> bool:
-        """INV-002: Check if contact is in compliance lists (762, 773).
-        
-        NOTE: Lists 762 and 773 are DYNAMIC LISTS - auto-managed by HubSpot based on criteria.
-        We check membership but NEVER manually add/remove contacts from these lists.
+        Check if a tag override applies for the matched list based on contact properties.
+
+        Args:
+            list_id: The HubSpot list that was matched
+            primary_tag: The default tag from list config
+            properties: Contact properties
+            log: Log applied overrides
+
+        Returns:
+            Override tag if condition matches, otherwise original primary_tag
         """
-        compliance_lists = {"762", "773"}  # DYNAMIC: 762=Opted Out, 773=Manual Disengagement
-        return bool(contact.list_memberships & compliance_lists)
-    
-    def _apply_exclusion_matrix(
+        for override in self.rules.overrides_by_list.get(list_id, ()):
+            prop_value = _property_value(properties, override.property)
+            if override.matches(prop_value):
+                if log:
+                    logger.info(
+                        f"Tag override: {override.property}={prop_value} "
+                        f"matches {override.condition} → tag '{override.tag}' "
+                        f"(was '{primary_tag}')"
+                    )
+                return override.tag
+        return primary_tag
+
+    def determine_target_tag(
         self,
-        contact: Contact,
-        exclusion_matrix: Dict[str, Set[str]]
-    ) -> List[str]:
+        contact_list_ids: Set[str],
+        email: str,
+        properties: Optional[Dict[str, Any]] = None,
+        decision: Optional[MembershipDecision] = None,
+        log: bool = True
+    ) -> Optional[List[str]]:
         """
-        Apply exclusion matrix to determine eligible lists for contact.
-        
+        Determine target tags based on exclusion matrix (INV-004: Single-tag enforcement).
+
+        Priority: general_marketing → special_campaigns → manual_override → long_term_marketing
+        Returns the list tags (primary + additional), with property-based tag overrides applied.
+
         Args:
-            contact: Contact with list memberships
-            exclusion_matrix: Map of list_id → exclusion_list_ids
-        
+            contact_list_ids: Set of list IDs the contact is in
+            email: Contact email for logging
+            properties: Contact properties (needed for tag overrides)
+            decision: Precomputed membership decision (see CompiledRules.decide_all)
+            log: Log applied tag overrides
+
         Returns:
-            List of eligible list IDs (after exclusions applied)
+            List of tags [primary, additional...] from first matching list, or None if excluded from all groups
         """
-        eligible = []
-        
-        for list_id in contact.list_memberships:
-            if list_id not in exclusion_matrix:
-                continue  # Not a sync list
-            
-            # Check if contact is in any exclusion lists for this list
-            exclusion_lists = exclusion_matrix[list_id]
-            if contact.list_memberships & exclusion_lists:
-                continue  # Excluded
-            
-            eligible.append(list_id)
-        
-        return eligible
-    
-    def _plan_upsert(self, contact: Contact, mc_member: Optional[MailchimpMember]):
+        # Group priority and exclusions are evaluated on the membership bitmask
+        if decision is None:
+            decision = self.rules.decide(self.rules.encode(contact_list_ids))
+
+        for group_name in decision.excluded_groups:
+            logger.debug(f"Contact {email} excluded from {group_name}")
+
+        list_id = decision.target_list
+        if list_id is None:
+            return None
+
+        list_config = self.rules.lists_by_id.get(list_id)
+        if list_config is None:
+            # Fallback to group name if no tag found (shouldn't happen)
+            logger.warning(f"No tag found for list {list_id}, falling back to group name: {decision.target_group}")
+            return [decision.target_group]
+
+        primary_tag = list_config.tag
+
+        # Apply property-based tag overrides
+        if properties and list_config.tag_overrides:
+            primary_tag = self._apply_tag_overrides(list_id, primary_tag, properties, log)
+
+        all_tags = [primary_tag] + list_config.additional_tags
+        logger.debug(f"Contact {email} matched list {list_id} ({list_config.name}) → tags: {all_tags}")
+        return all_tags
+
+    def target_tags(
+        self,
+        email: str,
+        list_ids: Set[str],
+        properties: Dict[str, Any],
+        decision: Optional[MembershipDecision] = None,
+        log: bool = True
+    ) -> Optional[List[str]]:
+        """Tags a plan pushes for the contact (before first-tag priority): list tags + supplemental tags."""
+        target_tags = self.determine_target_tag(list_ids, email, properties, decision, log)
+        if not target_tags:
+            return target_tags
+
+        # Contacts in both a parent list and its supplemental list get the supplemental tag
+        for supp_config in self.rules.supplemental_tags:
+            if supp_config.parent_list_id in list_ids and supp_config.list_id in list_ids:
+                if supp_config.tag not in target_tags:
+                    target_tags.append(supp_config.tag)
+                    if log:
+                        logger.info(f"Contact {email} in both {supp_config.parent_list_id} and {supp_config.list_id} → adding supplemental tag '{supp_config.tag}'")
+        return target_tags
+
+    def check_list_exclusion_rules(self, target_list_id: str, contact_list_ids: Set[str]) -> bool:
+        """True if the contact should be excluded due to list exclusion rules (anti-remarketing)."""
+        excluded_lists = self.rules.list_exclusion_rules.get(target_list_id)
+        return bool(excluded_lists) and not excluded_lists.isdisjoint(contact_list_ids)
+
+    def _upsert_is_noop(self, mc_member: Optional[Dict[str, Any]], merge_fields: Dict[str, str]) -> bool:
         """
-        Plan upsert operation (INV-007: force subscribe).
-        
-        Never resubscribe unsubscribed/cleaned members (only update merge_fields).
+        Check whether upsert_mc_member would leave the member unchanged.
+
+        True only for an existing, non-archived member whose FNAME/LNAME
+        already match (new and archived members always need the upsert).
         """
-        # INV-007: Force subscribe unless unsubscribed/cleaned
-        status_if_new = "subscribed"
-        
-        # Extract merge fields from contact properties
-        merge_fields = {}
-        for key, value in contact.properties.items():
-            if value is not None:
-                merge_fields[key.upper()] = str(value)
-        
-        operation = {
-            "type": "upsert_mc_member",
-            "list_id": self.config.mailchimp.audience_id,
-            "email": contact.email,
-            "data": {
-                "email_address": contact.email,
-                "status_if_new": status_if_new,
-                "merge_fields": merge_fields
-            },
-            "contact_id": contact.id,
-            "reason": "Sync HubSpot contact to Mailchimp"
-        }
-        
-        self.operations.append(operation)
-        self.stats["upserts_planned"] += 1
-    
-    def _plan_tagging(
+        if not mc_member or not mc_member.get("found"):
+            return False
+        if mc_member.get("status") not in self.UPSERT_NOOP_STATUSES:
+            return False
+        current = mc_member.get("merge_fields") or {}
+        return all((current.get(key) or "") == value for key, value in merge_fields.items())
+
+    def _record_noop(self, reason: str):
+        """Count an operation dropped because it would not change anything."""
+        self.noops_skipped[reason] = self.noops_skipped.get(reason, 0) + 1
+
+    def plan_contact(
         self,
-        contact: Contact,
-        mc_member: Optional[MailchimpMember],
-        eligible_lists: List[str],
-        list_id_to_name: Dict[str, str]
-    ):
+        email: str,
+        vid: Any,
+        list_ids: Set[str],
+        properties: Dict[str, Any],
+        mailchimp: MailchimpSnapshot,
+        decision: Optional[MembershipDecision] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Plan tagging operations (INV-003: single-tag enforcement, first-wins).
-        
-        If contact already has a HubSpot-managed tag, skip additional tags.
+        Plan operations for a single contact.
+
+        Args:
+            email: Contact email
+            vid: HubSpot VID
+            list_ids: Set of HubSpot list IDs contact is in
+            properties: Contact properties
+            mailchimp: Mailchimp state (the contact's member or lookup error)
+            decision: Precomputed membership decision (computed here if not given)
+
+        Returns:
+            List of operation dicts
         """
-        # INV-003: Check if contact already tagged (first-wins)
-        if contact.email.lower() in self.tagged_contacts:
-            return
-        
-        # Check if MC member already has a managed tag
-        if mc_member:
-            for tag in mc_member.tags:
-                if self._is_managed_tag(tag):
-                    # Already has a managed tag, mark as tagged and skip
-                    self.tagged_contacts.add(contact.email.lower())
-                    return
-        
-        # Apply first eligible list's tag
-        if eligible_lists:
-            first_list = eligible_lists[0]
-            list_name = list_id_to_name.get(first_list, first_list)
-            tag_name = f"{self.config.sync.tag_prefix}hs_{list_name}"
-            
-            operation = {
+        operations = []
+        if decision is None:
+            decision = self.rules.decide(self.rules.encode(list_ids))
+
+        # INV-002: Contact must not be in a compliance list while also in a sync list.
+        # HubSpot list removal (remove_hs_from_list) is generated by the
+        # reconciliation second pass in plan() - not here.
+        if decision.compliance:
+            compliance_overlap = list_ids & COMPLIANCE_LISTS
+            if decision.in_sync_list:
+                sync_overlap = list_ids & self.rules.sync_list_ids
+                logger.warning(
+                    f"INVARIANT VIOLATION: Contact {email} is in compliance list(s) "
+                    f"{compliance_overlap} AND sync list(s) {sync_overlap}. "
+                    f"HubSpot list removal will be scheduled."
+                )
+            else:
+                # Contact is only in a compliance list (no sync list) — expected, suppress noise
+                logger.debug(
+                    f"Contact {email} in compliance list {compliance_overlap} only — skipping MC ops"
+                )
+            return []
+
+        # Determine target tags (single primary tag + optional additional tags for subdivisions,
+        # plus supplemental tags)
+        target_tags = self.target_tags(email, list_ids, properties, decision)
+
+        if not target_tags:
+            # Check whether exclusion is due to an active-deals or other non-compliance exclusion list
+            all_exclusion_ids = self.rules.deal_exit_list_ids
+            exclusion_overlap = list_ids & all_exclusion_ids
+            if exclusion_overlap:
+                sync_overlap = list_ids - all_exclusion_ids - COMPLIANCE_LISTS
+                if sync_overlap:
+                    logger.warning(
+                        f"INVARIANT VIOLATION: Contact {email} is in exclusion list(s) "
+                        f"{exclusion_overlap} AND sync list(s) {sync_overlap}. "
+                        f"HubSpot list removal will be scheduled."
+                    )
+            else:
+                logger.debug(f"Contact {email} excluded from all groups (no sync list match)")
+            return []
+
+        # STRICT MODE: if the Mailchimp read failed (non-404), skip the contact rather
+        # than proceeding blindly (a miss is a new contact, not a failure)
+        key = email.lower()
+        if key in mailchimp.lookup_errors:
+            logger.error(f"STRICT MODE: Skipping contact {email} - cannot verify tag state")
+            return []
+        mc_member = mailchimp.members.get(key) or missing_member(email)
+        existing_tags = mc_member.get("tags", [])
+
+        # Source tags include override and supplemental tags so first-tag priority recognises them
+        current_source_tags = [tag for tag in existing_tags if tag in self.rules.source_tags]
+
+        # INV-004a: First-tag priority - if contact already has a primary source tag, keep it
+        # This prevents dual campaign enrollment when contact is added to multiple lists
+        if current_source_tags:
+            existing_tag = current_source_tags[0]  # First tag wins
+            logger.info(f"Contact {email} already has source tag '{existing_tag}' - preserving (first-tag priority)")
+
+            # Keep the existing primary tag (no campaign switch) but still apply additional tags
+            target_tags = [existing_tag] + target_tags[1:]
+            tags_to_remove = []
+        else:
+            # INV-004: Single-tag enforcement - remove old source tags if contact moved to different list
+            tags_to_remove = [tag for tag in current_source_tags if tag not in target_tags]
+
+        merge_fields = _merge_fields(properties)
+        skip_noops = self.config.sync.skip_noop_operations
+
+        # Plan Mailchimp operations
+        if skip_noops and self._upsert_is_noop(mc_member, merge_fields):
+            self._record_noop("upsert_unchanged")
+        else:
+            operations.append({
+                "type": "upsert_mc_member",
+                "email": email,
+                "merge_fields": merge_fields,
+                "status_if_new": "subscribed",
+                # Status at plan time (None = not found) - executor batches known subscribed/pending
+                "mc_status": mc_member.get("status") if mc_member.get("found") else None
+            })
+
+        # INV-004: Remove old source tags before applying new ones (single-tag enforcement)
+        if tags_to_remove:
+            logger.info(f"Contact {email} moved groups: removing old tags {tags_to_remove}, applying {target_tags}")
+            operations.append({
+                "type": "remove_mc_tag",
+                "email": email,
+                "tags": tags_to_remove
+            })
+
+        # Plan tag application (primary tag + additional subdivision tags)
+        for tag in target_tags:
+            if skip_noops and tag in existing_tags:
+                self._record_noop("tag_already_active")
+                continue
+            operations.append({
                 "type": "apply_mc_tag",
-                "list_id": self.config.mailchimp.audience_id,
-                "email": contact.email,
-                "tag_name": tag_name,
-                "contact_id": contact.id,
-                "reason": f"First-wins tag from list {list_name}"
-            }
-            
-            self.operations.append(operation)
-            self.stats["tags_added"] += 1
-            self.tagged_contacts.add(contact.email.lower())
-    
-    def _plan_ori_lists_update(self, contact: Contact, eligible_lists: List[str]):
+                "email": email,
+                "tag": tag
+            })
+
+        # What this plan pushes for the contact (recorded in the sync state store)
+        self.desired_state[email] = {"merge_fields": merge_fields, "tags": list(target_tags)}
+
+        # Plan ORI_LISTS update (INV-008) - only if enabled
+        if self.config.safety.enable_hubspot_writes:
+            ori_lists_value = ",".join(sorted(list_ids))
+            if skip_noops and _property_value(properties, self.config.sync.ori_lists_field) == ori_lists_value:
+                self._record_noop("hs_property_unchanged")
+                return operations
+            operations.append({
+                "type": "update_hs_property",
+                "vid": vid,
+                "property": self.config.sync.ori_lists_field,
+                "value": ori_lists_value
+            })
+
+        return operations
+
+    # ------------------------------------------------------------------
+    # Whole plan
+    # ------------------------------------------------------------------
+
+    def plan(
+        self,
+        hubspot: HubSpotSnapshot,
+        mailchimp: MailchimpSnapshot,
+        stored_fingerprints: Optional[Dict[str, str]] = None,
+        contact_limit: Optional[int] = None,
+        only_email: Optional[str] = None,
+        only_vid: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Plan ORI_LISTS update (INV-004: single-value source tracking).
-        
-        Format: Single list ID string (first eligible list).
+        Generate the operations plan from snapshots.
+
+        Args:
+            hubspot: HubSpot snapshot (every scanned contact - archival needs the full set)
+            mailchimp: Mailchimp snapshot
+            stored_fingerprints: See select()
+            contact_limit: Limit the snapshot was scanned with (recorded in metadata)
+            only_email: Only plan this contact
+            only_vid: Only plan this VID
+
+        Returns:
+            operations_plan dict with summary + per-contact operations
         """
-        if not eligible_lists:
-            return
-        
-        # INV-004: Single-value string (first eligible list)
-        ori_lists_value = eligible_lists[0]
-        
-        operation = {
-            "type": "update_hs_property",
-            "contact_id": contact.id,
-            "property": self.config.sync.ori_lists_field,
-            "value": ori_lists_value,
-            "reason": "Track source list for anti-remarketing"
+        if only_email and only_vid:
+            raise ValueError("Cannot specify both --only-email and --only-vid")
+
+        plan = {
+            "metadata": {
+                "generated_at": datetime.utcnow().isoformat(),
+                "config_hash": "",  # Will be set by CLI
+                "contact_limit": contact_limit or 0,
+                "run_mode": self.config.safety.run_mode.value,
+                "filter_email": only_email,
+                "filter_vid": only_vid,
+            },
+            "summary": {
+                "total_contacts_scanned": len(hubspot.contacts),
+                "contacts_with_operations": 0,
+                "operations_by_type": {},
+                "noops_skipped": {},
+                "contacts_unchanged": 0,
+                "invariants_checked": {
+                    "INV-002": "Compliance lists never synced",
+                    "INV-004": "Single-tag enforcement",
+                    "INV-007": "List exclusion rules"
+                }
+            },
+            "operations": [],
+            "in_sync": []  # Contacts already in sync - state recorded on apply (no operations)
         }
-        
-        self.operations.append(operation)
-    
-    def _plan_tag_removals(
-        self,
-        contacts: List[Contact],
-        mc_members: Dict[str, MailchimpMember],
-        list_id_to_name: Dict[str, str]
-    ):
-        """Plan tag removal for contacts no longer in corresponding lists."""
-        # Build set of emails still in HubSpot
-        hs_emails = {c.email.lower() for c in contacts}
-        
-        # Build expected tags for each email
-        expected_tags = {}
-        for contact in contacts:
-            eligible_lists = [lid for lid in contact.list_memberships if not self._is_compliance_excluded(contact)]
-            if eligible_lists:
-                first_list = list(contact.list_memberships)[0]
-                list_name = list_id_to_name.get(first_list, first_list)
-                expected_tags[contact.email.lower()] = f"{self.config.sync.tag_prefix}hs_{list_name}"
-        
-        # Check MC members for orphaned tags
-        for email, mc_member in mc_members.items():
-            if email not in hs_emails:
-                continue  # Will be handled by archival
-            
-            expected_tag = expected_tags.get(email)
-            for tag in mc_member.tags:
-                if self._is_managed_tag(tag) and tag != expected_tag:
-                    operation = {
-                        "type": "remove_mc_tag",
-                        "list_id": self.config.mailchimp.audience_id,
-                        "email": mc_member.email,
-                        "tag_name": tag,
-                        "contact_id": None,
-                        "reason": "Tag orphaned (contact no longer in corresponding list)"
-                    }
-                    self.operations.append(operation)
-                    self.stats["tags_removed"] += 1
-    
+        all_contacts_by_email = hubspot.contacts
+
+        # Membership decisions for the whole population: contacts are encoded as list
+        # bitmasks and each distinct mask is evaluated once
+        membership_masks = {
+            email: self.rules.encode(data["list_ids"]) for email, data in all_contacts_by_email.items()
+        }
+        decisions = self.rules.decide_all(membership_masks.values())
+
+        selection = self.select(hubspot, stored_fingerprints, only_email, only_vid, mailchimp)
+        contacts_by_email = selection.contacts
+        if only_email:
+            if contacts_by_email:
+                logger.info(f"✓ Filtered to contact: {only_email}")
+            else:
+                logger.warning(f"⚠ Contact not found: {only_email}")
+        elif only_vid:
+            if contacts_by_email:
+                logger.info(f"✓ Filtered to contact VID: {only_vid} ({next(iter(contacts_by_email))})")
+            else:
+                logger.warning(f"⚠ Contact VID not found: {only_vid}")
+
+        if stored_fingerprints is not None and not (only_email or only_vid):
+            plan["summary"]["contacts_unchanged"] = selection.unchanged
+            logger.info(f"Sync state: {selection.unchanged} contacts unchanged since last sync, "
+                        f"{len(contacts_by_email)} to plan")
+
+        # Generate operations for each contact
+        self.noops_skipped = {}
+        self.desired_state = {}
+        for email, contact_data in contacts_by_email.items():
+            operations = self.plan_contact(
+                email,
+                contact_data["vid"],
+                contact_data["list_ids"],
+                contact_data["properties"],
+                mailchimp,
+                decisions[membership_masks[email]]
+            )
+
+            # State to record once this contact's operations succeed
+            state = None
+            desired = self.desired_state.pop(email, None)
+            if email in selection.fingerprints and desired is not None:
+                state = {
+                    "fingerprint": selection.fingerprints[email],
+                    "lists": sorted(contact_data["list_ids"]),
+                    "properties": selection.properties[email],
+                    **desired
+                }
+
+            if operations:
+                entry = {
+                    "email": email,
+                    "vid": contact_data["vid"],
+                    "operations": operations
+                }
+                if state is not None:
+                    entry["state"] = state
+                plan["operations"].append(entry)
+                plan["summary"]["contacts_with_operations"] += 1
+                self._count_operations(plan, operations)
+            elif state is not None:
+                plan["in_sync"].append({"email": email, "vid": contact_data["vid"], **state})
+
+        plan["summary"]["noops_skipped"] = dict(sorted(self.noops_skipped.items()))
+        if self.noops_skipped:
+            logger.info(f"Skipped no-op operations: {plan['summary']['noops_skipped']}")
+
+        if self.config.safety.allow_archive:
+            if mailchimp.audience is None:
+                logger.warning("Mailchimp snapshot has no audience - archival reconciliation skipped")
+            else:
+                self._plan_archival(plan, all_contacts_by_email, membership_masks, decisions, mailchimp.audience)
+
+        logger.info(f"Plan complete: {plan['summary']['contacts_with_operations']} contacts with operations")
+        return plan
+
+    @staticmethod
+    def _count_operations(plan: Dict[str, Any], operations: List[Dict[str, Any]]):
+        counts = plan["summary"]["operations_by_type"]
+        for op in operations:
+            counts[op["type"]] = counts.get(op["type"], 0) + 1
+
     def _plan_archival(
         self,
-        contacts: List[Contact],
-        mc_members: Dict[str, MailchimpMember]
+        plan: Dict[str, Any],
+        all_contacts_by_email: Dict[str, Dict[str, Any]],
+        membership_masks: Dict[str, int],
+        decisions: Dict[int, MembershipDecision],
+        audience: List[Dict[str, Any]]
     ):
-        """
-        Plan archival for fully-orphaned managed contacts (INV-006).
-        
-        Archive ONLY if:
-        - Not in any HubSpot list
-        - Has ONLY managed tags (no manual/custom tags)
-        - Not in exempt_tags list
-        """
-        hs_emails = {c.email.lower() for c in contacts}
-        
-        for email, mc_member in mc_members.items():
-            if email in hs_emails:
-                continue  # Still in HubSpot
-            
-            # Check if has only managed tags
-            has_only_managed = all(self._is_managed_tag(tag) for tag in mc_member.tags)
-            if not has_only_managed:
-                continue  # Has manual/custom tags, preserve
-            
-            # Check exempt tags (INV-006)
-            if any(tag in self.config.archival.exempt_tags for tag in mc_member.tags):
-                continue  # Exempt from archival
-            
-            operation = {
-                "type": "archive_mc_member",
-                "list_id": self.config.mailchimp.audience_id,
-                "email": mc_member.email,
-                "contact_id": None,
-                "reason": "Fully orphaned (no HubSpot lists, only managed tags)"
+        """Archival reconciliation + HubSpot list removal for excluded contacts (adds to plan)."""
+        logger.info("Running archival reconciliation...")
+        from corev2.planner.reconciliation import ArchivalReconciliation
+
+        # CRITICAL: Use full contact set (before --only-email filtering)
+        # Otherwise filtered runs will incorrectly mark active contacts as orphans!
+        active_emails = set(all_contacts_by_email)
+
+        # CRITICAL: Contacts in EXCLUSION lists are not active - if still in Mailchimp
+        # they are archived, and they are removed from the sync lists they are in
+        excluded_contacts = {}  # {email: {"vid": int, "sync_list_ids": [str]}}
+        for email, contact_data in all_contacts_by_email.items():
+            group = decisions[membership_masks[email]].excluding_group
+            if group is None:
+                continue
+            active_emails.remove(email)
+
+            sync_list_ids = [lid for lid in contact_data["list_ids"] if lid in group.list_set]
+            excluded_contacts[email] = {
+                "vid": contact_data["vid"],
+                "sync_list_ids": sync_list_ids
             }
-            self.operations.append(operation)
-            self.stats["archives_planned"] += 1
-    
-    def _is_managed_tag(self, tag: str) -> bool:
-        """Check if tag is managed by HubSpot sync."""
-        return tag.startswith(self.managed_tags_pattern)
-    
-    def _count_operations_by_type(self) -> Dict[str, int]:
-        """Count operations by type."""
-        counts = {}
-        for op in self.operations:
-            op_type = op["type"]
-            counts[op_type] = counts.get(op_type, 0) + 1
-        return counts
+            logger.info(f"Contact {email} in exclusion list → removed from active set (will be archived if in Mailchimp)")
+            if sync_list_ids:
+                logger.info(f"  → Will be removed from HubSpot lists: {sync_list_ids}")
+
+        if excluded_contacts:
+            logger.info(f"Removed {len(excluded_contacts)} contacts in exclusion lists from active set")
+
+        reconciler = ArchivalReconciliation(
+            mc_client=None,
+            config=self.config,
+            max_archive_per_run=self.config.archival.max_archive_per_run
+        )
+        recon_result = reconciler.reconcile(active_emails, audience, dry_run=False)
+
+        # One entry per member: its reconciliation ops in order (unsubscribe, untag,
+        # archive), then - if archived because of an exclusion list - its HubSpot
+        # sync list removals, once
+        counts = plan["summary"]["operations_by_type"]
+        reconciliation_ops: Dict[str, List[Dict[str, Any]]] = {}
+        for archive_op in recon_result.archive_operations:
+            reconciliation_ops.setdefault(archive_op["email"], []).append(archive_op)
+
+        for email, operations_list in reconciliation_ops.items():
+            if email in excluded_contacts:
+                vid = excluded_contacts[email]["vid"]
+                for list_id in excluded_contacts[email]["sync_list_ids"]:
+                    operations_list.append({
+                        "type": "remove_hs_from_list",
+                        "list_id": list_id,
+                        "vid": vid,
+                        "reason": "contact_in_exclusion_list"
+                    })
+                    logger.info(f"  → Generating HubSpot list removal: {email} from List {list_id}")
+
+            plan["operations"].append({
+                "email": email,
+                "vid": excluded_contacts.get(email, {}).get("vid"),
+                "operations": operations_list
+            })
+            plan["summary"]["contacts_with_operations"] += 1
+            self._count_operations(plan, operations_list)
+
+        archives = sum(1 for op in recon_result.archive_operations if op["type"] == "archive_mc_member")
+        plan["metadata"]["reconciliation"] = {
+            "orphaned_members": recon_result.orphaned_members,
+            "exempt_members": recon_result.exempt_members,
+            "archive_operations_generated": archives
+        }
+        logger.info(f"Reconciliation complete: {archives} members to archive "
+                    f"({len(recon_result.archive_operations)} operations)")
+
+        # SECOND PASS: excluded contacts NOT in Mailchimp got no archive_mc_member above,
+        # so generate their remove_hs_from_list here - otherwise they sit in manual sync
+        # lists (Recruitment, Competition, New Agents, Sanctioned) indefinitely
+        emails_already_planned = {entry["email"] for entry in plan["operations"] if entry.get("email")}
+        direct_removal_ops = 0
+        for exc_email, exc_data in excluded_contacts.items():
+            sync_list_ids = exc_data["sync_list_ids"]
+            if not sync_list_ids or exc_email in emails_already_planned:
+                continue
+            exc_vid = exc_data["vid"]
+            removal_ops = []
+            for list_id in sync_list_ids:
+                removal_ops.append({
+                    "type": "remove_hs_from_list",
+                    "list_id": list_id,
+                    "vid": exc_vid,
+                    "reason": "contact_in_exclusion_list"
+                })
+                logger.info(
+                    f"Contact {exc_email} in exclusion list → removing from "
+                    f"HubSpot List {list_id} (not present in Mailchimp)"
+                )
+            plan["operations"].append({
+                "email": exc_email,
+                "vid": exc_vid,
+                "operations": removal_ops
+            })
+            plan["summary"]["contacts_with_operations"] += 1
+            counts["remove_hs_from_list"] = counts.get("remove_hs_from_list", 0) + len(removal_ops)
+            direct_removal_ops += len(removal_ops)
+
+        if direct_removal_ops > 0:
+            logger.info(
+                f"Generated {direct_removal_ops} additional HubSpot list removal "
+                f"operations for excluded contacts not in Mailchimp"
+            )
@@ -2,11 +2,15 @@
 
 import asyncio
 import logging
-from typing import Dict, List, Set, Any, Optional
-from datetime import datetime
-from corev2.config.schema import V2Config, ExclusionMatrixGroupConfig
+from typing import Dict, List, Set, Any, Optional, Tuple
+from corev2.config.schema import V2Config
 from corev2.clients.hubspot_client import HubSpotClient
 from corev2.clients.mailchimp_client import MailchimpClient
+from corev2.clients.audience_snapshot import AudienceSnapshot
+from corev2.state import SyncStateStore
+from corev2.sync.audience_scan import iter_audience
+from .planner_engine import HubSpotSnapshot, MailchimpSnapshot, PlannerEngine, Selection, missing_member
+from .rules import COMPLIANCE_LISTS, CompiledRules, MembershipDecision
 
 logger = logging.getLogger(__name__)
 
@@ -15,11 +19,19 @@ class SyncPlanner:
     """
     Dry-run planner that generates operations_plan.json.
     
-    Reads HubSpot list members, applies business rules, and produces
-    deterministic operation plan with no mutations.
+    Fetches HubSpot and Mailchimp snapshots, then hands them to
+    PlannerEngine, which applies the business rules and produces the
+    deterministic operation plan (no mutations, no I/O while planning).
     """
     
-    def __init__(self, config: V2Config, hs_client: HubSpotClient, mc_client: MailchimpClient):
+    def __init__(
+        self,
+        config: V2Config,
+        hs_client: HubSpotClient,
+        mc_client: MailchimpClient,
+        audience_snapshot: Optional[AudienceSnapshot] = None,
+        state_store: Optional[SyncStateStore] = None
+    ):
         """
         Initialize planner.
         
@@ -27,175 +39,49 @@ class SyncPlanner:
             config: Validated V2Config
             hs_client: HubSpot API client
             mc_client: Mailchimp API client
+            audience_snapshot: Optional preloaded Mailchimp audience snapshot
+                               (loaded on demand when config.sync.use_audience_snapshot)
+            state_store: Optional sync state store - contacts whose fingerprint is
+                         unchanged since their last sync are not re-planned
         """
         self.config = config
+        self.engine = PlannerEngine(config)
+        self.rules: CompiledRules = self.engine.rules  # all config-shaped lookups, built once
         self.hs_client = hs_client
         self.mc_client = mc_client
+        self.audience_snapshot = audience_snapshot
+        self.state_store = state_store
+        # Inputs of the last generate_plan (hubspot, mailchimp, stored fingerprints) - see save_snapshots
+        self.snapshots: Optional[Tuple[HubSpotSnapshot, MailchimpSnapshot, Optional[Dict[str, str]]]] = None
         # INV-002: Compliance lists - DYNAMIC LISTS auto-managed by HubSpot, NEVER manually modify
-        self.compliance_lists = {"762", "773"}  # 762: Opted Out (auto-populated), 773: Manual Disengagement
+        self.compliance_lists = set(COMPLIANCE_LISTS)  # 762: Opted Out (auto-populated), 773: Manual Disengagement
     
-    def _apply_exclusion_matrix(
-        self,
-        contact_list_ids: Set[str],
-        group_config: ExclusionMatrixGroupConfig
-    ) -> bool:
-        """
-        Check if contact should be excluded based on exclusion matrix.
-        
-        Args:
-            contact_list_ids: Set of list IDs the contact is in
-            group_config: Exclusion matrix group configuration
-        
-        Returns:
-            True if contact should be excluded, False otherwise
-        """
-        # Contact is excluded if in ANY of the exclusion lists
-        for exclude_list_id in group_config.exclude:
-            if exclude_list_id in contact_list_ids:
-                return True
-        return False
+    @property
+    def noops_skipped(self) -> Dict[str, int]:
+        """No-op operations skipped by the last plan (reason → count)."""
+        return self.engine.noops_skipped
     
-    def _evaluate_tag_override(self, condition: str, property_value: str) -> bool:
-        """
-        Evaluate a tag override condition against a property value.
-        
-        Supports: 'gt:N' (greater than N)
-        
-        Args:
-            condition: Condition string (e.g., 'gt:1')
-            property_value: Raw property value from HubSpot
-        
-        Returns:
-            True if condition matches
-        """
-        if not property_value:
-            return False
-        
-        try:
-            if condition.startswith("gt:"):
-                threshold = int(condition.split(":")[1])
-                return int(property_value) > threshold
-        except (ValueError, IndexError):
-            return False
-        
-        return False
-    
-    def _apply_tag_overrides(
-        self,
-        list_id: str,
-        primary_tag: str,
-        properties: Dict[str, Any]
-    ) -> str:
-        """
-        Check if a tag override applies for the matched list based on contact properties.
-        
-        Args:
-            list_id: The HubSpot list that was matched
-            primary_tag: The default tag from list config
-            properties: Contact properties
-        
-        Returns:
-            Override tag if condition matches, otherwise original primary_tag
-        """
-        # Find the list config
-        for group_name, list_configs in self.config.hubspot.lists.items():
-            for list_config in list_configs:
-                if list_config.id == list_id and list_config.tag_overrides:
-                    for override in list_config.tag_overrides:
-                        prop_value = properties.get(override.property, "")
-                        if isinstance(prop_value, dict):
-                            prop_value = prop_value.get("value", "")
-                        else:
-                            prop_value = str(prop_value) if prop_value else ""
-                        
-                        if self._evaluate_tag_override(override.condition, prop_value):
-                            logger.info(
-                                f"Tag override: {override.property}={prop_value} "
-                                f"matches {override.condition} → tag '{override.tag}' "
-                                f"(was '{primary_tag}')"
-                            )
-                            return override.tag
-        return primary_tag
+    @property
+    def desired_state(self) -> Dict[str, Dict[str, Any]]:
+        return self.engine.desired_state
     
     def _determine_target_tag(
         self,
         contact_list_ids: Set[str],
         email: str,
-        properties: Optional[Dict[str, Any]] = None
+        properties: Optional[Dict[str, Any]] = None,
+        decision: Optional[MembershipDecision] = None
     ) -> Optional[List[str]]:
-        """
-        Determine target tags based on exclusion matrix (INV-004: Single-tag enforcement).
-        
-        Priority: general_marketing → special_campaigns → manual_override → long_term_marketing
-        NEW: Returns list of tags (primary + additional) from list config.
-        Applies property-based tag overrides if configured.
-        
-        Args:
-            contact_list_ids: Set of list IDs the contact is in
-            email: Contact email for logging
-            properties: Contact properties (needed for tag overrides)
-        
-        Returns:
-            List of tags [primary, additional...] from first matching list, or None if excluded from all groups
-        """
-        # Check each group in priority order
-        for group_name in ["general_marketing", "special_campaigns", "manual_override", "long_term_marketing"]:
-            group_config = getattr(self.config.exclusion_matrix, group_name)
-            
-            # Check each list in this group (first match wins)
-            for list_id in group_config.lists:
-                if list_id in contact_list_ids:
-                    # Check if excluded
-                    excluded = self._apply_exclusion_matrix(contact_list_ids, group_config)
-                    
-                    if not excluded:
-                        # Find the list config to get its tags
-                        for hs_group_name, list_configs in self.config.hubspot.lists.items():
-                            for list_config in list_configs:
-                                if list_config.id == list_id:
-                                    primary_tag = list_config.tag
-                                    
-                                    # Apply property-based tag overrides
-                                    if properties and list_config.tag_overrides:
-                                        primary_tag = self._apply_tag_overrides(
-                                            list_id, primary_tag, properties
-                                        )
-                                    
-                                    all_tags = [primary_tag] + list_config.additional_tags
-                                    logger.debug(f"Contact {email} matched list {list_id} ({list_config.name}) → tags: {all_tags}")
-                                    return all_tags
-                        
-                        # Fallback to group name if no tag found (shouldn't happen)
-                        logger.warning(f"No tag found for list {list_id}, falling back to group name: {group_name}")
-                        return [group_name]
-                    else:
-                        logger.debug(f"Contact {email} excluded from {group_name}")
-                        # Continue to next list
-        
-        return None
+        """Target tags for a contact (see PlannerEngine.determine_target_tag)."""
+        return self.engine.determine_target_tag(contact_list_ids, email, properties, decision)
     
     def _check_list_exclusion_rules(
         self,
         target_list_id: str,
         contact_list_ids: Set[str]
     ) -> bool:
-        """
-        Check list exclusion rules (anti-remarketing).
-        
-        Args:
-            target_list_id: Target HubSpot list ID
-            contact_list_ids: Contact's current list memberships
-        
-        Returns:
-            True if contact should be excluded due to list exclusion rules
-        """
-        excluded_lists = self.config.list_exclusion_rules.get(target_list_id, [])
-        
-        for excluded_list_id in excluded_lists:
-            if excluded_list_id in contact_list_ids:
-                return True
-        
-        return False
+        """True if the contact should be excluded due to list exclusion rules (anti-remarketing)."""
+        return self.engine.check_list_exclusion_rules(target_list_id, contact_list_ids)
     
     async def generate_plan(
         self,
@@ -219,92 +105,195 @@ class SyncPlanner:
         if only_email and only_vid:
             raise ValueError("Cannot specify both --only-email and --only-vid")
         
-        plan = {
-            "metadata": {
-                "generated_at": datetime.utcnow().isoformat(),
-                "config_hash": "",  # Will be set by CLI
-                "contact_limit": contact_limit or 0,
-                "run_mode": self.config.safety.run_mode.value,
-                "filter_email": only_email,
-                "filter_vid": only_vid,
-            },
-            "summary": {
-                "total_contacts_scanned": 0,
-                "contacts_with_operations": 0,
-                "operations_by_type": {},
-                "invariants_checked": {
-                    "INV-002": "Compliance lists never synced",
-                    "INV-004": "Single-tag enforcement",
-                    "INV-007": "List exclusion rules"
-                }
-            },
-            "operations": []
-        }
+        # Single-contact debug runs resolve the contact directly instead of scanning every list
+        targeted = bool(only_email or only_vid)
+        direct = targeted and self.config.sync.single_contact_lookup
+        if direct:
+            hubspot, contact_email = await self.fetch_contact(only_email=only_email, only_vid=only_vid)
+        else:
+            hubspot = await self.fetch_hubspot(contact_limit)
+        
+        # Incremental runs: contacts whose inputs are unchanged since their last successful
+        # sync, and whose Mailchimp member still matches it, are skipped (single-contact
+        # debug runs are always fully planned)
+        stored_fingerprints = None
+        if self.state_store is not None:
+            stored_fingerprints = {} if (only_email or only_vid) else \
+                self.state_store.fresh_fingerprints(self.config.state.max_age_hours)
+        
+        selection = self.engine.select(hubspot, stored_fingerprints, only_email, only_vid)
+        if direct:
+            mailchimp = await self.fetch_contact_member(contact_email)
+        else:
+            mailchimp = await self.fetch_mailchimp(selection, targeted=targeted)
+        
+        self.snapshots = (hubspot, mailchimp, stored_fingerprints)
+        return self.engine.plan(
+            hubspot,
+            mailchimp,
+            stored_fingerprints,
+            contact_limit=contact_limit,
+            only_email=only_email,
+            only_vid=only_vid
+        )
+    
+    async def fetch_hubspot(self, contact_limit: Optional[int] = None) -> HubSpotSnapshot:
+        """
+        Scan every list the rules refer to and hydrate each unique contact once.
         
-        # Scan all HubSpot lists in exclusion_matrix
-        all_list_ids = set()
-        for group_name in ["general_marketing", "special_campaigns", "manual_override", "long_term_marketing"]:
-            group_config = getattr(self.config.exclusion_matrix, group_name)
-            all_list_ids.update(group_config.lists)
+        Args:
+            contact_limit: Optional limit on unique contacts collected
         
-        # CRITICAL: Also scan exclusion lists to detect contacts that should be excluded
-        exclusion_list_ids = set()
-        exclusion_list_ids.update(self.config.hubspot.exclusions.critical)
-        exclusion_list_ids.update(self.config.hubspot.exclusions.active_deals)
-        exclusion_list_ids.update(self.config.hubspot.exclusions.exit)
+        Returns:
+            HubSpotSnapshot of all scanned contacts
+        """
+        logger.info(f"Scanning {len(self.rules.sync_list_ids)} sync lists: {sorted(self.rules.sync_list_ids)}")
         
-        logger.info(f"Scanning {len(all_list_ids)} sync lists: {sorted(all_list_ids)}")
-        logger.info(f"Scanning {len(exclusion_list_ids)} exclusion lists: {sorted(exclusion_list_ids)}")
+        # CRITICAL: Also scan exclusion lists to detect contacts that should be excluded
+        logger.info(f"Scanning {len(self.rules.exclusion_list_ids)} exclusion lists: "
+                    f"{sorted(self.rules.exclusion_list_ids)}")
         
         # Also scan supplemental tag lists (these are NOT synced themselves)
-        supplemental_list_ids = set()
-        for supp_config in self.config.hubspot.supplemental_tags:
-            supplemental_list_ids.add(supp_config.list_id)
-        
+        supplemental_list_ids = self.rules.supplemental_list_ids
         if supplemental_list_ids:
             logger.info(f"Scanning {len(supplemental_list_ids)} supplemental tag lists: {sorted(supplemental_list_ids)}")
         
-        # Combine for complete list membership detection
-        all_lists_to_scan = all_list_ids.union(exclusion_list_ids).union(supplemental_list_ids)
+        # Phase 1: membership IDs only (recordId → set(list_ids)), no contact reads
+        membership_index = await self._collect_memberships(sorted(self.rules.lists_to_scan), contact_limit)
         
-        # Collect contacts from all lists
-        contacts_by_email = {}
+        # Phase 2: hydrate each unique recordId exactly once (base + tag override properties)
+        contacts_by_email = await self._hydrate_contacts(membership_index, list(self.rules.fetch_properties))
+        
+        logger.info(f"Total unique contacts: {len(contacts_by_email)}")
+        return HubSpotSnapshot(contacts=contacts_by_email)
+    
+    async def fetch_contact(
+        self,
+        only_email: Optional[str] = None,
+        only_vid: Optional[str] = None
+    ) -> Tuple[HubSpotSnapshot, Optional[str]]:
+        """
+        Resolve one contact (by email or VID) and its list memberships, without list scans.
+        
+        Memberships are limited to the lists a full scan reads, so the contact is
+        planned exactly as in a full plan. A contact in none of them (or not in
+        HubSpot) is left out, as a full scan would never see it - its Mailchimp
+        member is still read so archival treats it as the orphan a full plan would.
+        
+        Returns:
+            (HubSpotSnapshot with at most the one contact, email whose member to read)
+        """
+        fetch_properties = list(self.rules.fetch_properties)
+        if only_email:
+            logger.info(f"Resolving contact {only_email} directly (no list scans)...")
+            contact = await self.hs_client.get_contact_by_email(only_email, properties=fetch_properties)
+        else:
+            logger.info(f"Resolving contact VID {only_vid} directly (no list scans)...")
+            contact = await self.hs_client.get_contact(only_vid, properties=fetch_properties)
+        
+        if not contact["found"]:
+            return HubSpotSnapshot(), only_email
+        
+        record_id = str(contact["vid"])
+        email = contact["properties"].get("email") or contact["email"]
+        list_ids = await self.hs_client.get_contact_list_ids(record_id) & self.rules.lists_to_scan
+        logger.info(f"  Contact {email} (VID {record_id}) is in scanned lists: {sorted(list_ids)}")
+        
+        if not email or not list_ids:
+            return HubSpotSnapshot(), email or only_email
+        return HubSpotSnapshot(contacts={
+            email: {
+                "vid": record_id,
+                "email": email,
+                "properties": contact["properties"],
+                "list_ids": list_ids
+            }
+        }), email
+    
+    async def fetch_contact_member(self, email: Optional[str]) -> MailchimpSnapshot:
+        """
+        Read the resolved contact's Mailchimp member (live) - no audience scan.
+        
+        The member is always read (archival needs it even when the contact has no
+        target tag or is not planned at all), and archival reconciliation is limited to it.
+        """
+        mailchimp = MailchimpSnapshot(audience=[])
+        if email:
+            self._record_member(email, await self._read_member(email), mailchimp)
+            member = mailchimp.members.get(email.lower())
+            if member is not None and member["found"]:
+                mailchimp.audience.append({
+                    key: member[key] for key in ("email_address", "status", "tags", "merge_fields")
+                })
+        return mailchimp
+    
+    async def fetch_mailchimp(self, selection: Selection, targeted: bool = False) -> MailchimpSnapshot:
+        """
+        Read the Mailchimp state a plan of `selection` depends on.
+        
+        Args:
+            selection: Contacts to plan (PlannerEngine.select)
+            targeted: Single-contact debug run (live lookups - a full scan would dominate)
         
-        # Build list of properties to fetch (base + tag override properties)
-        fetch_properties = ["email", "firstname", "lastname", self.config.sync.ori_lists_field]
-        for group_lists in self.config.hubspot.lists.values():
-            for list_config in group_lists:
-                for override in list_config.tag_overrides:
-                    if override.property not in fetch_properties:
-                        fetch_properties.append(override.property)
+        Returns:
+            MailchimpSnapshot with the selected contacts' members (+ audience when archiving)
+        """
+        # Load the Mailchimp audience once instead of one get_member per contact
+        if (
+            self.audience_snapshot is None
+            and self.config.sync.use_audience_snapshot
+            and (selection.contacts or selection.unchanged_contacts)
+            and not targeted
+        ):
+            self.audience_snapshot = await AudienceSnapshot.load(
+                self.mc_client, concurrency=self.config.sync.audience_scan_concurrency
+            )
         
-        for list_id in sorted(all_lists_to_scan):
+        # Live lookups (snapshot misses / no snapshot) run through a bounded pool;
+        # results are recorded in plan order so logs and plans match a serial run
+        mailchimp = MailchimpSnapshot()
+        emails = self.engine.members_to_fetch(selection)
+        results = await self._read_members(emails)
+        for email, result in zip(emails, results):
+            self._record_member(email, result, mailchimp)
+        
+        if self.config.safety.allow_archive:
+            # Reuse the audience snapshot (if loaded) instead of a second full scan
+            if self.audience_snapshot is not None:
+                mailchimp.audience = list(self.audience_snapshot.iter_members())
+            else:
+                mailchimp.audience = [member async for member in iter_audience(self.mc_client)]
+        
+        return mailchimp
+    
+    async def _collect_memberships(
+        self,
+        list_ids: List[str],
+        contact_limit: Optional[int] = None
+    ) -> Dict[str, Set[str]]:
+        """
+        Phase 1 of the HubSpot scan: collect membership IDs from every list.
+        
+        Args:
+            list_ids: List IDs to scan (sync + exclusion + supplemental), in scan order
+            contact_limit: Optional limit on unique contacts collected
+        
+        Returns:
+            Membership index: recordId → set of list IDs the contact is in
+        """
+        membership_index: Dict[str, Set[str]] = {}
+        
+        for list_id in list_ids:
             logger.info(f"Fetching members from list {list_id}...")
             count = 0
             
             try:
-                async for contact in self.hs_client.get_list_members(
-                    list_id,
-                    properties=fetch_properties
-                ):
-                    email = contact.get("email")
-                    if not email:
-                        continue
-                    
-                    # Aggregate list memberships
-                    if email not in contacts_by_email:
-                        contacts_by_email[email] = {
-                            "vid": contact["vid"],
-                            "email": email,
-                            "properties": contact["properties"],
-                            "list_ids": set()
-                        }
-                    
-                    contacts_by_email[email]["list_ids"].add(list_id)
+                async for record_id in self.hs_client.get_list_membership_ids(list_id):
+                    membership_index.setdefault(record_id, set()).add(list_id)
                     count += 1
                     
                     # Apply contact limit
-                    if contact_limit and len(contacts_by_email) >= contact_limit:
+                    if contact_limit and len(membership_index) >= contact_limit:
                         logger.info(f"Reached contact limit ({contact_limit}), stopping scan")
                         break
                 
@@ -314,386 +303,166 @@ class SyncPlanner:
                 logger.error(f"Error fetching list {list_id}: {e}")
                 raise
             
-            if contact_limit and len(contacts_by_email) >= contact_limit:
+            if contact_limit and len(membership_index) >= contact_limit:
                 break
         
-        logger.info(f"Total unique contacts: {len(contacts_by_email)}")
-        plan["summary"]["total_contacts_scanned"] = len(contacts_by_email)
-        
-        # IMPORTANT: Preserve full contact set for archival reconciliation BEFORE filtering
-        all_contacts_by_email = contacts_by_email.copy()
-        
-        # Apply deterministic filtering if specified
-        if only_email or only_vid:
-            filtered = {}
-            if only_email:
-                if only_email in contacts_by_email:
-                    filtered[only_email] = contacts_by_email[only_email]
-                    logger.info(f"✓ Filtered to contact: {only_email}")
-                else:
-                    logger.warning(f"⚠ Contact not found: {only_email}")
-            elif only_vid:
-                for email, data in contacts_by_email.items():
-                    if data["vid"] == only_vid:
-                        filtered[email] = data
-                        logger.info(f"✓ Filtered to contact VID: {only_vid} ({email})")
-                        break
-                if not filtered:
-                    logger.warning(f"⚠ Contact VID not found: {only_vid}")
-            
-            contacts_by_email = filtered
-        
-        # Generate operations for each contact
-        for email, contact_data in contacts_by_email.items():
-            operations = await self._plan_contact_operations(
-                email,
-                contact_data["vid"],
-                contact_data["list_ids"],
-                contact_data["properties"]
-            )
-            
-            if operations:
-                plan["operations"].append({
-                    "email": email,
-                    "vid": contact_data["vid"],
-                    "operations": operations
-                })
-                plan["summary"]["contacts_with_operations"] += 1
-                
-                # Count operations by type
-                for op in operations:
-                    op_type = op["type"]
-                    plan["summary"]["operations_by_type"][op_type] = \
-                        plan["summary"]["operations_by_type"].get(op_type, 0) + 1
+        return membership_index
+    
+    async def _hydrate_contacts(
+        self,
+        membership_index: Dict[str, Set[str]],
+        fetch_properties: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Phase 2 of the HubSpot scan: read each unique contact once (batch read).
         
-        # Archival Reconciliation (if enabled)
-        if self.config.safety.allow_archive:
-            logger.info("Running archival reconciliation...")
-            from corev2.planner.reconciliation import ArchivalReconciliation
-            
-            # CRITICAL: Use full contact set (before --only-email filtering)
-            # Otherwise filtered runs will incorrectly mark active contacts as orphans!
-            active_emails = set(all_contacts_by_email.keys())
-            
-            # CRITICAL: Remove contacts in EXCLUSION lists from active_emails
-            # If contact in Mailchimp but now in exclusion list → should be archived
-            # Track which contacts + their sync lists for later HubSpot cleanup
-            excluded_contacts = {}  # {email: {"vid": int, "sync_list_ids": [str]}}
-            excluded_count = 0
-            
-            for email in list(active_emails):
-                contact_data = all_contacts_by_email[email]
-                list_ids = contact_data["list_ids"]
-                
-                # Check if contact is in ANY exclusion list
-                for group_name in ["general_marketing", "special_campaigns", "manual_override", "long_term_marketing"]:
-                    group_config = getattr(self.config.exclusion_matrix, group_name)
-                    if self._apply_exclusion_matrix(list_ids, group_config):
-                        active_emails.remove(email)
-                        excluded_count += 1
-                        
-                        # Track sync lists this contact is in (need to remove from these)
-                        sync_list_ids = [lid for lid in list_ids if lid in group_config.lists]
-                        excluded_contacts[email] = {
-                            "vid": contact_data["vid"],
-                            "sync_list_ids": sync_list_ids
-                        }
-                        
-                        logger.info(f"Contact {email} in exclusion list → removed from active set (will be archived if in Mailchimp)")
-                        if sync_list_ids:
-                            logger.info(f"  → Will be removed from HubSpot lists: {sync_list_ids}")
-                        break
-            
-            if excluded_count > 0:
-                logger.info(f"Removed {excluded_count} contacts in exclusion lists from active set")
-            
-            # Run reconciliation
-            reconciler = ArchivalReconciliation(
-                mc_client=self.mc_client,
-                config=self.config,
-                max_archive_per_run=self.config.archival.max_archive_per_run
-            )
+        Args:
+            membership_index: recordId → set of list IDs (from _collect_memberships)
+            fetch_properties: Contact properties to fetch
+        
+        Returns:
+            contacts_by_email: email → {"vid", "email", "properties", "list_ids"}
+        """
+        total_memberships = sum(len(list_ids) for list_ids in membership_index.values())
+        logger.info(
+            f"Hydrating {len(membership_index)} unique contacts "
+            f"({total_memberships} list memberships)..."
+        )
+        
+        contacts_by_id = await self.hs_client.batch_read_contacts(
+            list(membership_index.keys()),
+            properties=fetch_properties
+        )
+        
+        contacts_by_email = {}
+        for record_id, list_ids in membership_index.items():
+            contact = contacts_by_id.get(record_id)
+            if contact is None:
+                continue
             
-            recon_result = await reconciler.scan_for_orphans(
-                active_hubspot_emails=active_emails,
-                dry_run=False  # Generate operations
-            )
+            props = contact.get("properties", {})
+            email = props.get("email")
+            if not email:
+                continue
             
-            # Add archival operations to plan
-            for archive_op in recon_result.archive_operations:
-                email = archive_op["email"]
-                
-                # Check if this contact is being archived due to exclusion
-                # If so, generate HubSpot list removal operations
-                operations_list = [archive_op]
-                
-                if email in excluded_contacts:
-                    # Generate removal operations for each sync list
-                    vid = excluded_contacts[email]["vid"]
-                    sync_list_ids = excluded_contacts[email]["sync_list_ids"]
-                    
-                    for list_id in sync_list_ids:
-                        operations_list.append({
-                            "type": "remove_hs_from_list",
-                            "list_id": list_id,
-                            "vid": vid,
-                            "reason": "contact_in_exclusion_list"
-                        })
-                        logger.info(f"  → Generating HubSpot list removal: {email} from List {list_id}")
-                    
-                    plan["summary"]["operations_by_type"]["remove_hs_from_list"] = \
-                        plan["summary"]["operations_by_type"].get("remove_hs_from_list", 0) + len(sync_list_ids)
-                
-                # Add as standalone contact entry
-                plan["operations"].append({
+            # Aggregate list memberships (two record IDs sharing an email are merged)
+            if email not in contacts_by_email:
+                contacts_by_email[email] = {
+                    "vid": record_id,
                     "email": email,
-                    "vid": excluded_contacts.get(email, {}).get("vid"),
-                    "operations": operations_list
-                })
-                
-                # Update summary
-                plan["summary"]["contacts_with_operations"] += 1
-                plan["summary"]["operations_by_type"]["archive_mc_member"] = \
-                    plan["summary"]["operations_by_type"].get("archive_mc_member", 0) + 1
-            
-            # Add reconciliation stats to plan metadata
-            plan["metadata"]["reconciliation"] = {
-                "orphaned_members": recon_result.orphaned_members,
-                "exempt_members": recon_result.exempt_members,
-                "archive_operations_generated": len(recon_result.archive_operations)
-            }
-            
-            logger.info(f"Reconciliation complete: {len(recon_result.archive_operations)} archive operations")
-            
-            # ---------------------------------------------------------------
-            # SECOND PASS: generate remove_hs_from_list for excluded contacts
-            # that are NOT in Mailchimp (so no archive_mc_member was generated
-            # for them above).  These contacts sit in manual sync lists
-            # (Recruitment, Competition, New Agents, Sanctioned) indefinitely
-            # because the archive loop never fires for them.
-            # ---------------------------------------------------------------
-            emails_already_planned = {
-                entry["email"] for entry in plan["operations"] if entry.get("email")
-            }
-            direct_removal_ops = 0
-            for exc_email, exc_data in excluded_contacts.items():
-                sync_list_ids = exc_data.get("sync_list_ids", [])
-                if not sync_list_ids:
-                    continue
-                if exc_email in emails_already_planned:
-                    # Already handled via archive path above — don't duplicate
-                    continue
-                # Contact is excluded + in a sync list but NOT in Mailchimp.
-                # Generate HS list removal only (no MC archive needed).
-                exc_vid = exc_data["vid"]
-                removal_ops = []
-                for list_id in sync_list_ids:
-                    removal_ops.append({
-                        "type": "remove_hs_from_list",
-                        "list_id": list_id,
-                        "vid": exc_vid,
-                        "reason": "contact_in_exclusion_list"
-                    })
-                    logger.info(
-                        f"Contact {exc_email} in exclusion list → removing from "
-                        f"HubSpot List {list_id} (not present in Mailchimp)"
-                    )
-                if removal_ops:
-                    plan["operations"].append({
-                        "email": exc_email,
-                        "vid": exc_vid,
-                        "operations": removal_ops
-                    })
-                    plan["summary"]["contacts_with_operations"] += 1
-                    plan["summary"]["operations_by_type"]["remove_hs_from_list"] = (
-                        plan["summary"]["operations_by_type"].get("remove_hs_from_list", 0)
-                        + len(removal_ops)
-                    )
-                    direct_removal_ops += len(removal_ops)
+                    "properties": props,
+                    "list_ids": set()
+                }
             
-            if direct_removal_ops > 0:
-                logger.info(
-                    f"Generated {direct_removal_ops} additional HubSpot list removal "
-                    f"operations for excluded contacts not in Mailchimp"
-                )
-        
-        logger.info(f"Plan complete: {plan['summary']['contacts_with_operations']} contacts with operations")
-        return plan
+            contacts_by_email[email]["list_ids"].update(list_ids)
+        
+        return contacts_by_email
+    
+    async def _lookup_member(self, email: str) -> Dict[str, Any]:
+        """
+        Get current Mailchimp state for a contact (snapshot first, live on miss).
+        
+        The snapshot includes archived members, so a miss means "not in the
+        audience" (new contact) unless config.sync.strict_snapshot_misses is
+        set, in which case the miss is verified with a live get_member (catches
+        members added since the snapshot). A failed read is handled like any
+        other lookup error (STRICT MODE).
+        
+        Returns:
+            Same shape as MailchimpClient.get_member
+        """
+        member = self._snapshot_member(email)
+        if member is not None:
+            return member
+        return await self.mc_client.get_member(email)
+    
+    def _snapshot_member(self, email: str) -> Optional[Dict[str, Any]]:
+        """_lookup_member answered from the audience snapshot (no I/O), or None if a live read is needed."""
+        if self.audience_snapshot is None:
+            return None
+        member = self.audience_snapshot.get(email)
+        if member is None and not self.config.sync.strict_snapshot_misses:
+            return missing_member(email)
+        return member
+    
+    def _lookup_concurrency(self) -> int:
+        """Member lookups in flight: sync.planning_concurrency, else the Mailchimp rate (max 10 connections)."""
+        if self.config.sync.planning_concurrency:
+            return self.config.sync.planning_concurrency
+        return max(1, min(10, int(self.config.http.mailchimp.rate)))
+    
+    async def _read_member(self, email: str) -> Any:
+        """_lookup_member result, or the exception it raised."""
+        try:
+            return await self._lookup_member(email)
+        except Exception as e:
+            return e
+    
+    async def _read_members(self, emails: List[str]) -> List[Any]:
+        """
+        _read_member for each email with at most _lookup_concurrency() in flight.
+        
+        Snapshot hits are resolved inline; only live reads become tasks.
+        
+        Returns:
+            Results in the order of `emails`
+        """
+        results: List[Any] = [self._snapshot_member(email) for email in emails]
+        misses = [index for index, result in enumerate(results) if result is None]
+        if not misses:
+            return results
+        
+        semaphore = asyncio.Semaphore(self._lookup_concurrency())
+        
+        async def read(email: str) -> Any:
+            async with semaphore:
+                return await self._read_member(email)
+        
+        live = await asyncio.gather(*(read(emails[index]) for index in misses))
+        for index, result in zip(misses, live):
+            results[index] = result
+        return results
+    
+    def _record_member(self, email: str, result: Any, mailchimp: MailchimpSnapshot):
+        """
+        Add one contact's lookup result to `mailchimp`.
+        
+        404 is expected for new contacts (recorded as not found); any other
+        read failure is recorded as a lookup error, so the engine skips the
+        contact (STRICT MODE) rather than proceeding blindly.
+        """
+        if not isinstance(result, Exception):
+            mailchimp.members[email.lower()] = result
+        # Check if this is a 404 (contact not found) - expected for new contacts
+        elif "404" in str(result) or "not found" in str(result).lower():
+            logger.info(f"Contact {email} not found in Mailchimp (new contact, will be created)")
+            mailchimp.members[email.lower()] = missing_member(email)
+        else:
+            logger.error(f"Failed to fetch Mailchimp member {email} for INV-004 check: {result}")
+            mailchimp.lookup_errors[email.lower()] = str(result)
     
     async def _plan_contact_operations(
         self,
         email: str,
         vid: int,
         list_ids: Set[str],
-        properties: Dict[str, Any]
+        properties: Dict[str, Any],
+        decision: Optional[MembershipDecision] = None
     ) -> List[Dict[str, Any]]:
         """
-        Plan operations for a single contact.
+        Plan operations for a single contact, reading its Mailchimp state live.
         
         Args:
             email: Contact email
             vid: HubSpot VID
             list_ids: Set of HubSpot list IDs contact is in
             properties: Contact properties
+            decision: Precomputed membership decision (computed here if not given)
         
         Returns:
             List of operation dicts
         """
-        operations = []
-        
-        # INV-002: Contact must not be in a compliance list while also in a sync list.
-        # The compliance list check covers 762 (Opted Out) and 773 (Manual Exclusion).
-        # HubSpot list removal (remove_hs_from_list) will be generated by the
-        # reconciliation second-pass in generate_plan() — not here.
-        compliance_overlap = self.compliance_lists.intersection(list_ids)
-        if compliance_overlap:
-            all_sync_ids = set()
-            for gn in ["general_marketing", "special_campaigns", "manual_override", "long_term_marketing"]:
-                all_sync_ids.update(getattr(self.config.exclusion_matrix, gn).lists)
-            sync_overlap = list_ids & all_sync_ids
-            if sync_overlap:
-                logger.warning(
-                    f"INVARIANT VIOLATION: Contact {email} is in compliance list(s) "
-                    f"{compliance_overlap} AND sync list(s) {sync_overlap}. "
-                    f"HubSpot list removal will be scheduled."
-                )
-            else:
-                # Contact is only in a compliance list (no sync list) — expected, suppress noise
-                logger.debug(
-                    f"Contact {email} in compliance list {compliance_overlap} only — skipping MC ops"
-                )
-            return []
-        
-        # Determine target tags (single primary tag + optional additional tags for subdivisions)
-        target_tags = self._determine_target_tag(list_ids, email, properties)
-        
-        if not target_tags:
-            # Check whether exclusion is due to an active-deals or other non-compliance exclusion list
-            all_exclusion_ids = set()
-            all_exclusion_ids.update(self.config.hubspot.exclusions.active_deals)
-            all_exclusion_ids.update(self.config.hubspot.exclusions.exit)
-            exclusion_overlap = list_ids & all_exclusion_ids
-            if exclusion_overlap:
-                sync_overlap = list_ids - all_exclusion_ids - self.compliance_lists
-                if sync_overlap:
-                    logger.warning(
-                        f"INVARIANT VIOLATION: Contact {email} is in exclusion list(s) "
-                        f"{exclusion_overlap} AND sync list(s) {sync_overlap}. "
-                        f"HubSpot list removal will be scheduled."
-                    )
-            else:
-                logger.debug(f"Contact {email} excluded from all groups (no sync list match)")
-            return []
-        
-        # Check for supplemental tags (contacts in both parent list and supplemental list)
-        for supp_config in self.config.hubspot.supplemental_tags:
-            # Check if contact is in BOTH the parent list AND the supplemental list
-            if supp_config.parent_list_id in list_ids and supp_config.list_id in list_ids:
-                # Add the supplemental tag if not already present
-                if supp_config.tag not in target_tags:
-                    target_tags.append(supp_config.tag)
-                    logger.info(f"Contact {email} in both {supp_config.parent_list_id} and {supp_config.list_id} → adding supplemental tag '{supp_config.tag}'")
-        
-        # Fetch existing Mailchimp member to check current tags (INV-004 enforcement)
-        # STRICT MODE: If Mailchimp read fails (non-404), skip contact rather than proceeding blindly
-        # 404 is expected for new contacts and should NOT trigger strict mode skip
-        existing_tags = []
-        try:
-            mc_member = await self.mc_client.get_member(email)
-            existing_tags = mc_member.get("tags", [])
-        except Exception as e:
-            # Check if this is a 404 (contact not found) - expected for new contacts
-            is_404 = "404" in str(e) or "not found" in str(e).lower()
-            if is_404:
-                logger.info(f"Contact {email} not found in Mailchimp (new contact, will be created)")
-                existing_tags = []  # No existing tags for new contact
-            else:
-                # Non-404 error means Mailchimp API issue - STRICT MODE kicks in
-                logger.error(f"Failed to fetch Mailchimp member {email} for INV-004 check: {e}")
-                logger.error(f"STRICT MODE: Skipping contact {email} - cannot verify tag state")
-                return []
-        
-        # Determine which source tags exist (tags managed by this system)
-        # Build set of all possible source tags from config
-        all_source_tags = set()
-        for group_name, list_configs in self.config.hubspot.lists.items():
-            for list_config in list_configs:
-                all_source_tags.add(list_config.tag)
-                # Include tag override tags so first-tag priority recognises them
-                for override in list_config.tag_overrides:
-                    all_source_tags.add(override.tag)
-        
-        # Add supplemental tags to the source tags set
-        for supp_config in self.config.hubspot.supplemental_tags:
-            all_source_tags.add(supp_config.tag)
-        
-        current_source_tags = [tag for tag in existing_tags if tag in all_source_tags]
-        
-        # INV-004a: First-tag priority - if contact already has a primary source tag, keep it
-        # This prevents dual campaign enrollment when contact is added to multiple lists
-        primary_tag = target_tags[0]  # First tag is always the primary campaign tag
-        if current_source_tags:
-            existing_tag = current_source_tags[0]  # First tag wins
-            logger.info(f"Contact {email} already has source tag '{existing_tag}' - preserving (first-tag priority)")
-            
-            # Override target_tags to maintain existing primary tag (no campaign switch)
-            # But still apply additional tags (subdivisions like T2)
-            target_tags = [existing_tag] + target_tags[1:]
-            tags_to_remove = []  # No tags to remove - keeping existing
-        else:
-            # INV-004: Single-tag enforcement - remove old source tags if contact moved to different list
-            tags_to_remove = [tag for tag in current_source_tags if tag not in target_tags]
-        
-        # Check if contact should be archived based on archival rules
-        # (Simplified: just checking if contact has no valid tag)
-        # Real implementation would check exempt_tags, preservation_patterns, etc.
-        
-        # Extract property values (handle both v1 nested format and v3 flat format)
-        def get_property_value(prop_name: str) -> str:
-            prop = properties.get(prop_name, "")
-            if isinstance(prop, dict):
-                # v1 API format: {"value": "..."}
-                return prop.get("value", "")
-            else:
-                # v3 API format: direct string value
-                return str(prop) if prop else ""
-        
-        # Plan Mailchimp operations
-        operations.append({
-            "type": "upsert_mc_member",
-            "email": email,
-            "merge_fields": {
-                "FNAME": get_property_value("firstname"),
-                "LNAME": get_property_value("lastname")
-            },
-            "status_if_new": "subscribed"
-        })
-        
-        # INV-004: Remove old source tags before applying new ones (single-tag enforcement)
-        if tags_to_remove:
-            logger.info(f"Contact {email} moved groups: removing old tags {tags_to_remove}, applying {target_tags}")
-            operations.append({
-                "type": "remove_mc_tag",
-                "email": email,
-                "tags": tags_to_remove
-            })
-        
-        # Plan tag application (primary tag + additional subdivision tags)
-        for tag in target_tags:
-            operations.append({
-                "type": "apply_mc_tag",
-                "email": email,
-                "tag": tag
-            })
-        
-        # Plan ORI_LISTS update (INV-008) - only if enabled
-        if self.config.safety.enable_hubspot_writes:
-            ori_lists_value = ",".join(sorted(list_ids))
-            operations.append({
-                "type": "update_hs_property",
-                "vid": vid,
-                "property": self.config.sync.ori_lists_field,
-                "value": ori_lists_value
-            })
-        
-        return operations
+        mailchimp = MailchimpSnapshot()
+        if self.engine.needs_member(list_ids, decision):
+            self._record_member(email, await self._read_member(email), mailchimp)
+        return self.engine.plan_contact(email, vid, list_ids, properties, mailchimp, decision)
@@ -8,10 +8,12 @@ Implements INV-006: Smart archival preservation (respects exempt tags and patter
 """
 
 import logging
-from typing import Dict, Set, List, Any, Optional
+from typing import Dict, Set, List, Any, Iterable, Optional
 from dataclasses import dataclass
 import re
 
+from corev2.sync.audience_scan import iter_audience
+
 logger = logging.getLogger(__name__)
 
 
@@ -83,7 +85,8 @@ class ArchivalReconciliation:
     async def scan_for_orphans(
         self,
         active_hubspot_emails: Set[str],
-        dry_run: bool = True
+        dry_run: bool = True,
+        members: Optional[Iterable[Dict[str, Any]]] = None
     ) -> ReconciliationResult:
         """
         Scan Mailchimp for orphaned members (have source tags but not in HubSpot).
@@ -91,63 +94,98 @@ class ArchivalReconciliation:
         Args:
             active_hubspot_emails: Set of emails currently in synced HubSpot lists
             dry_run: If True, only report (no operations); if False, generate archive operations
+            members: Pre-scanned members (e.g. the planner's audience snapshot);
+                     None = page the audience here
+        
+        Returns:
+            ReconciliationResult with statistics and archive operations
+        """
+        scan = self._start_scan(active_hubspot_emails)
+        
+        # Scan all Mailchimp members
+        # NOTE: In production, consider filtering by tag to reduce API calls
+        async for member in iter_audience(self.mc_client, members):
+            self._scan_member(scan, member, active_hubspot_emails)
+        
+        return self._finish_scan(scan, active_hubspot_emails, dry_run)
+    
+    def reconcile(
+        self,
+        active_hubspot_emails: Set[str],
+        members: Iterable[Dict[str, Any]],
+        dry_run: bool = True
+    ) -> ReconciliationResult:
+        """
+        scan_for_orphans over in-memory members (no API calls - used by PlannerEngine).
+        
+        Args:
+            active_hubspot_emails: Set of emails currently in synced HubSpot lists
+            members: Every audience member (get_all_members shape)
+            dry_run: If True, only report (no operations); if False, generate archive operations
         
         Returns:
             ReconciliationResult with statistics and archive operations
         """
+        scan = self._start_scan(active_hubspot_emails)
+        for member in members:
+            self._scan_member(scan, member, active_hubspot_emails)
+        return self._finish_scan(scan, active_hubspot_emails, dry_run)
+    
+    def _start_scan(self, active_hubspot_emails: Set[str]) -> Dict[str, Any]:
         logger.info("Running archival reconciliation...")
         logger.info(f"  Comparing Mailchimp audience vs {len(active_hubspot_emails)} active HubSpot contacts...")
+        return {"scanned": 0, "exempt": 0, "orphaned": []}
+    
+    def _scan_member(self, scan: Dict[str, Any], member: Dict[str, Any], active_hubspot_emails: Set[str]):
+        """Classify one audience member (orphan candidate, exempt, or skipped)."""
+        scan["scanned"] += 1
         
-        orphaned_members = []
-        exempt_count = 0
-        scanned_count = 0
+        if scan["scanned"] % 500 == 0:
+            logger.info(f"  Scanned {scan['scanned']} Mailchimp members...")
         
-        # Scan all Mailchimp members
-        # NOTE: In production, consider filtering by tag to reduce API calls
-        async for member in self.mc_client.get_all_members():
-            scanned_count += 1
-            
-            if scanned_count % 500 == 0:
-                logger.info(f"  Scanned {scanned_count} Mailchimp members...")
-            
-            email = member.get("email_address", "").lower()
-            member_tags = set(member.get("tags", []))
-            status = member.get("status")
-            
-            # Only consider members with source tags (managed by our system)
-            has_source_tag = bool(member_tags.intersection(self.source_tags))
-            
-            if not has_source_tag:
-                continue  # Not managed by us, skip
-            
-            # Check if member is orphaned (not in any HubSpot list)
-            is_orphaned = email not in active_hubspot_emails
-            
-            if not is_orphaned:
-                continue  # Still active in HubSpot, skip
-            
-            # Check exemptions (INV-006)
-            if self._is_exempt_from_archival(member):
-                exempt_count += 1
-                continue
-            
-            # Check if already archived
-            if status == "archived":
-                logger.debug(f"Member {email} already archived, skipping")
-                continue
-            
-            # This is an orphan candidate for archival
-            orphaned_members.append({
-                "email": email,
-                "status": status,
-                "tags": list(member_tags)
-            })
+        email = member.get("email_address", "").lower()
+        member_tags = set(member.get("tags", []))
+        status = member.get("status")
+        
+        # Only consider members with source tags (managed by our system)
+        if not member_tags.intersection(self.source_tags):
+            return  # Not managed by us, skip
+        
+        # Check if member is orphaned (not in any HubSpot list)
+        if email in active_hubspot_emails:
+            return  # Still active in HubSpot, skip
+        
+        # Check exemptions (INV-006)
+        if self._is_exempt_from_archival(member):
+            scan["exempt"] += 1
+            return
+        
+        # Check if already archived
+        if status == "archived":
+            logger.debug(f"Member {email} already archived, skipping")
+            return
+        
+        # This is an orphan candidate for archival
+        scan["orphaned"].append({
+            "email": email,
+            "status": status,
+            "tags": list(member_tags)
+        })
+    
+    def _finish_scan(
+        self,
+        scan: Dict[str, Any],
+        active_hubspot_emails: Set[str],
+        dry_run: bool
+    ) -> ReconciliationResult:
+        """Log scan totals and generate archive operations (unless dry_run)."""
+        orphaned_members = scan["orphaned"]
         
         logger.info(f"\n✓ Archival Reconciliation Complete:")
-        logger.info(f"  • Mailchimp members scanned: {scanned_count}")
+        logger.info(f"  • Mailchimp members scanned: {scan['scanned']}")
         logger.info(f"  • Active HubSpot contacts: {len(active_hubspot_emails)}")
         logger.info(f"  • Orphaned members found: {len(orphaned_members)}")
-        logger.info(f"  • Exempt from archival: {exempt_count}")
+        logger.info(f"  • Exempt from archival: {scan['exempt']}")
         
         # Generate archive operations (respecting max_archive_per_run limit)
         # IMPORTANT: Untag first, then archive
@@ -190,9 +228,9 @@ class ArchivalReconciliation:
         logger.info(f"  • Archive operations generated: {len(archive_operations)}")
         
         return ReconciliationResult(
-            total_mailchimp_members=scanned_count,
+            total_mailchimp_members=scan["scanned"],
             active_hubspot_contacts=len(active_hubspot_emails),
             orphaned_members=len(orphaned_members),
-            exempt_members=exempt_count,
+            exempt_members=scan["exempt"],
             archive_operations=archive_operations
         )
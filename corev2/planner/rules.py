@@ -0,0 +1,242 @@
+"""
+Compiled planner rules.
+
+Everything SyncPlanner decides per contact (target tag, exclusions, source
+tags, tag overrides) depends only on the config. CompiledRules builds the
+config-shaped lookups once - list ID → ListConfig, groups in priority
+order with frozen exclusion sets, source tag sets, pre-parsed override
+conditions - so per-contact planning cost no longer grows with config size.
+
+List memberships are also encoded as bitmasks (one bit per known list ID).
+Membership decisions - compliance, target group/list, excluding group -
+depend only on the mask, and a population has few distinct masks, so each
+one is evaluated once (decide_all) and shared by every contact with it.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from corev2.config.loader import compute_config_hash
+from corev2.config.schema import ListConfig, SupplementalTagConfig, V2Config
+
+
+logger = logging.getLogger(__name__)
+
+
+# Import stream groups, highest priority first (INV-004: first match wins)
+GROUP_PRIORITY = ("general_marketing", "special_campaigns", "manual_override", "long_term_marketing")
+
+# INV-002: DYNAMIC LISTS auto-managed by HubSpot (762: Opted Out, 773: Manual Disengagement)
+COMPLIANCE_LISTS = frozenset({"762", "773"})
+
+
+def parse_condition(condition: str) -> Callable[[str], bool]:
+    """
+    Compile a tag override condition into a predicate on the raw property value.
+
+    Supports: 'gt:N' (greater than N). Unknown or malformed conditions never match.
+    """
+    if condition.startswith("gt:"):
+        try:
+            threshold = int(condition.split(":")[1])
+        except (ValueError, IndexError):
+            return lambda value: False
+
+        def greater_than(value: str) -> bool:
+            if not value:
+                return False
+            try:
+                return int(value) > threshold
+            except ValueError:
+                return False
+
+        return greater_than
+
+    return lambda value: False
+
+
+@dataclass(frozen=True)
+class CompiledOverride:
+    """Property-based tag override with its condition pre-parsed."""
+    property: str
+    condition: str
+    tag: str
+    matches: Callable[[str], bool]
+
+
+@dataclass(frozen=True)
+class CompiledGroup:
+    """One exclusion matrix group: lists in priority order + frozen exclusion set (and their bitmasks)."""
+    name: str
+    lists: Tuple[str, ...]
+    list_set: FrozenSet[str]
+    exclude: FrozenSet[str]
+    list_mask: int = 0
+    exclude_mask: int = 0
+
+    def is_excluded(self, contact_list_ids) -> bool:
+        """True if the contact is in ANY of this group's exclusion lists."""
+        return not self.exclude.isdisjoint(contact_list_ids)
+
+
+@dataclass(frozen=True)
+class MembershipDecision:
+    """Everything the planner derives from a contact's list memberships alone."""
+    compliance: bool  # in a compliance list (INV-002: no Mailchimp ops)
+    in_sync_list: bool  # in any exclusion matrix group list
+    target_group: Optional[str]  # first group the contact is in and not excluded from
+    target_list: Optional[str]  # first list of target_group the contact is in
+    excluded_groups: Tuple[str, ...]  # groups the contact is in but excluded from
+    excluding_group: Optional[CompiledGroup]  # first group whose exclusion lists contain the contact
+
+
+class CompiledRules:
+    """Config-derived lookups for SyncPlanner, built once per config."""
+
+    def __init__(self, config: V2Config):
+        # One bit per list ID the rules refer to, in first-seen order
+        self.list_bits: Dict[str, int] = {}
+        for list_id in self._referenced_lists(config):
+            self.list_bits.setdefault(list_id, 1 << len(self.list_bits))
+
+        self.groups: Tuple[CompiledGroup, ...] = tuple(
+            CompiledGroup(
+                name=name,
+                lists=tuple(group.lists),
+                list_set=frozenset(group.lists),
+                exclude=frozenset(group.exclude),
+                list_mask=self.encode(group.lists),
+                exclude_mask=self.encode(group.exclude),
+            )
+            for name, group in ((name, getattr(config.exclusion_matrix, name)) for name in GROUP_PRIORITY)
+        )
+
+        # First config for an ID wins; overrides of duplicate entries are kept in order
+        self.lists_by_id: Dict[str, ListConfig] = {}
+        overrides: Dict[str, List[CompiledOverride]] = {}
+        for list_configs in config.hubspot.lists.values():
+            for list_config in list_configs:
+                self.lists_by_id.setdefault(list_config.id, list_config)
+                for override in list_config.tag_overrides:
+                    overrides.setdefault(list_config.id, []).append(CompiledOverride(
+                        property=override.property,
+                        condition=override.condition,
+                        tag=override.tag,
+                        matches=parse_condition(override.condition),
+                    ))
+        self.overrides_by_list: Dict[str, Tuple[CompiledOverride, ...]] = {
+            list_id: tuple(items) for list_id, items in overrides.items()
+        }
+
+        self.sync_list_ids: FrozenSet[str] = frozenset().union(*(group.list_set for group in self.groups))
+
+        exclusions = config.hubspot.exclusions
+        self.exclusion_list_ids: FrozenSet[str] = frozenset(
+            exclusions.critical + exclusions.active_deals + exclusions.exit
+        )
+        # Non-compliance exclusions (a contact here plus a sync list is an invariant violation)
+        self.deal_exit_list_ids: FrozenSet[str] = frozenset(exclusions.active_deals + exclusions.exit)
+
+        self.supplemental_tags: Tuple[SupplementalTagConfig, ...] = tuple(config.hubspot.supplemental_tags)
+        self.supplemental_list_ids: FrozenSet[str] = frozenset(s.list_id for s in self.supplemental_tags)
+
+        # Tags this system manages: list tags, their override tags, supplemental tags
+        source_tags = set()
+        for list_configs in config.hubspot.lists.values():
+            for list_config in list_configs:
+                source_tags.add(list_config.tag)
+                source_tags.update(override.tag for override in list_config.tag_overrides)
+        source_tags.update(s.tag for s in self.supplemental_tags)
+        self.source_tags: FrozenSet[str] = frozenset(source_tags)
+
+        # Contact properties to fetch: base + tag override properties
+        fetch_properties = ["email", "firstname", "lastname", config.sync.ori_lists_field]
+        for items in self.overrides_by_list.values():
+            for override in items:
+                if override.property not in fetch_properties:
+                    fetch_properties.append(override.property)
+        self.fetch_properties: Tuple[str, ...] = tuple(fetch_properties)
+
+        self.list_exclusion_rules: Dict[str, FrozenSet[str]] = {
+            list_id: frozenset(excluded) for list_id, excluded in config.list_exclusion_rules.items()
+        }
+
+        self.compliance_mask = self.encode(COMPLIANCE_LISTS)
+        self.sync_mask = self.encode(self.sync_list_ids)
+        self._decisions: Dict[int, MembershipDecision] = {}
+
+    @staticmethod
+    def _referenced_lists(config: V2Config) -> List[str]:
+        list_ids = sorted(COMPLIANCE_LISTS)
+        for name in GROUP_PRIORITY:
+            group = getattr(config.exclusion_matrix, name)
+            list_ids += group.lists + group.exclude
+        exclusions = config.hubspot.exclusions
+        list_ids += exclusions.critical + exclusions.active_deals + exclusions.exit
+        list_ids += [s.list_id for s in config.hubspot.supplemental_tags]
+        list_ids += [s.parent_list_id for s in config.hubspot.supplemental_tags]
+        return list_ids
+
+    def encode(self, list_ids: Iterable[str]) -> int:
+        """Membership bitmask (list IDs the rules never refer to are dropped)."""
+        mask = 0
+        bits = self.list_bits
+        for list_id in list_ids:
+            mask |= bits.get(list_id, 0)
+        return mask
+
+    def decide(self, mask: int) -> MembershipDecision:
+        """Membership decision for one bitmask (memoised - masks repeat across contacts)."""
+        decision = self._decisions.get(mask)
+        if decision is None:
+            decision = self._decisions[mask] = self._evaluate(mask)
+        return decision
+
+    def decide_all(self, masks: Iterable[int]) -> Dict[int, MembershipDecision]:
+        """Decisions for a whole population, evaluated once per distinct mask."""
+        return {mask: self.decide(mask) for mask in set(masks)}
+
+    def _evaluate(self, mask: int) -> MembershipDecision:
+        target_group = target_list = excluding_group = None
+        excluded_groups = []
+        for group in self.groups:
+            if excluding_group is None and group.exclude_mask & mask:
+                excluding_group = group
+            if target_group is not None or not group.list_mask & mask:
+                continue
+            if group.exclude_mask & mask:
+                excluded_groups.append(group.name)
+                continue
+            target_group = group.name
+            target_list = next(list_id for list_id in group.lists if self.list_bits[list_id] & mask)
+
+        return MembershipDecision(
+            compliance=bool(mask & self.compliance_mask),
+            in_sync_list=bool(mask & self.sync_mask),
+            target_group=target_group,
+            target_list=target_list,
+            excluded_groups=tuple(excluded_groups),
+            excluding_group=excluding_group,
+        )
+
+    @property
+    def lists_to_scan(self) -> FrozenSet[str]:
+        """Sync, exclusion and supplemental lists (complete membership detection)."""
+        return self.sync_list_ids | self.exclusion_list_ids | self.supplemental_list_ids
+
+    def first_excluding_group(self, contact_list_ids) -> Optional[CompiledGroup]:
+        """Highest-priority group whose exclusion lists contain the contact, if any."""
+        return self.decide(self.encode(contact_list_ids)).excluding_group
+
+
+_compiled: Dict[str, CompiledRules] = {}
+
+
+def compile_rules(config: V2Config) -> CompiledRules:
+    """CompiledRules for a config, cached by config hash (safety/http don't affect rules)."""
+    config_hash = compute_config_hash(config)
+    rules = _compiled.get(config_hash)
+    if rules is None:
+        rules = _compiled[config_hash] = CompiledRules(config)
+    return rules
@@ -27,11 +27,12 @@ because HubSpot cannot auto-manage static list membership.
 
 import asyncio
 import logging
-from typing import Dict, List, Set, Any, Optional
+from typing import Dict, List, Set, Any, Iterable, Optional
 from datetime import datetime
 from corev2.config.schema import V2Config, SecondaryMappingConfig
 from corev2.clients.hubspot_client import HubSpotClient
 from corev2.clients.mailchimp_client import MailchimpClient
+from corev2.sync.audience_scan import iter_audience
 
 logger = logging.getLogger(__name__)
 
@@ -63,9 +64,16 @@ class SecondaryPlanner:
         # Exempt tags: contacts with ANY of these are skipped entirely
         self.exempt_tags = set(config.secondary_sync.exempt_tags)
 
+    def has_exit_tag(self, member: Dict[str, Any]) -> bool:
+        """AudienceScan filter for the exit-tag scan."""
+        return bool(self.exit_tags.intersection(member.get("tags", [])))
+
     async def generate_plan(
         self,
-        contact_limit: Optional[int] = None
+        contact_limit: Optional[int] = None,
+        members: Optional[Iterable[Dict[str, Any]]] = None,
+        total_scanned: Optional[int] = None,
+        skip_emails: Optional[Set[str]] = None
     ) -> Dict[str, Any]:
         """
         Scan Mailchimp for exit-tagged contacts and generate operations.
@@ -73,6 +81,10 @@ class SecondaryPlanner:
         Args:
             contact_limit: Max contacts to process (None = unlimited).
                            Overrides config.secondary_sync.contact_limit if set.
+            members: Pre-scanned members from a shared AudienceScan
+                     (None = page the audience here)
+            total_scanned: Audience size reported by the shared scan
+            skip_emails: Lowercase emails to ignore (e.g. archived since the shared scan)
 
         Returns:
             Plan dict with operations and summary
@@ -104,7 +116,9 @@ class SecondaryPlanner:
         logger.info("Phase 1: Scanning Mailchimp for exit-tagged contacts...")
         logger.info(f"  Looking for tags: {sorted(self.exit_tags)}")
 
-        tagged_contacts, total_scanned = await self._scan_mailchimp_for_exit_tags()
+        tagged_contacts, member_count = await self._scan_mailchimp_for_exit_tags(members, skip_emails)
+        if total_scanned is None:
+            total_scanned = member_count
         plan["summary"]["total_mailchimp_scanned"] = total_scanned
 
         total_found = sum(len(contacts) for contacts in tagged_contacts.values())
@@ -177,10 +191,18 @@ class SecondaryPlanner:
 
         return plan
 
-    async def _scan_mailchimp_for_exit_tags(self) -> tuple:
+    async def _scan_mailchimp_for_exit_tags(
+        self,
+        members: Optional[Iterable[Dict[str, Any]]] = None,
+        skip_emails: Optional[Set[str]] = None
+    ) -> tuple:
         """
         Scan Mailchimp audience for contacts with exit tags.
 
+        Args:
+            members: Pre-scanned members (None = page the audience)
+            skip_emails: Lowercase emails to ignore
+
         Returns:
             Tuple of (tagged_contacts dict, total_members_scanned)
             tagged_contacts: Dict mapping exit_tag → list of contact dicts
@@ -189,12 +211,15 @@ class SecondaryPlanner:
 
         member_count = 0
 
-        async for member in self.mc_client.get_all_members(count=1000):
+        async for member in iter_audience(self.mc_client, members, count=1000):
             member_count += 1
 
             if member_count % 500 == 0:
                 logger.info(f"  Scanned {member_count} Mailchimp members...")
 
+            if skip_emails and (member.get("email_address") or "").lower() in skip_emails:
+                continue
+
             member_tags = set(member.get("tags", []))
 
             # Check if member has any exit tags
@@ -0,0 +1,5 @@
+"""Persistent per-contact sync state (incremental runs)."""
+
+from .store import SyncStateStore, contact_fingerprint
+
+__all__ = ["SyncStateStore", "contact_fingerprint"]
@@ -0,0 +1,199 @@
+"""
+Sync state store - last-synced fingerprint per contact.
+
+SQLite (WAL mode) keyed by email. Each row records what the last successful
+sync pushed for a contact: HubSpot list membership, relevant properties,
+merge fields and tags, plus a fingerprint of the inputs that produced it.
+
+The planner skips contacts whose fingerprint is unchanged (and younger than
+state.max_age_hours) while their Mailchimp member still holds what was
+pushed; the executor records state once all of a contact's operations
+succeed.
+"""
+
+import hashlib
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from corev2 import codec
+
+
+logger = logging.getLogger(__name__)
+
+
+def contact_fingerprint(
+    list_ids: Iterable[str],
+    properties: Dict[str, Any],
+    config_hash: str,
+    merge_fields: Optional[Dict[str, str]] = None,
+    tags: Optional[Iterable[str]] = None,
+    safety: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Fingerprint the inputs that determine a contact's plan and what it pushes.
+
+    Args:
+        list_ids: HubSpot lists the contact is in
+        properties: Relevant contact properties (only those fetched for planning)
+        config_hash: compute_config_hash() of the active config
+        merge_fields: Merge fields the plan pushes
+        tags: Tags the plan pushes (before first-tag priority)
+        safety: Safety flags that change per-contact operations (excluded
+                from the config hash)
+
+    Returns:
+        16-char hex digest (same format as the config hash)
+    """
+    payload = {
+        "lists": sorted(str(list_id) for list_id in list_ids),
+        "properties": {key: properties.get(key) for key in sorted(properties)},
+        "config_hash": config_hash,
+        "merge_fields": merge_fields or {},
+        "tags": list(tags or []),
+        "safety": safety or {},
+    }
+    encoded = codec.dumps_bytes(payload, sort_keys=True, default=str)
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class SyncStateStore:
+    """SQLite-backed store of per-contact sync state."""
+
+    def __init__(self, path: Path):
+        """
+        Open (or create) the state database.
+
+        Args:
+            path: Path to SQLite file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS contact_state (
+                email TEXT PRIMARY KEY,
+                vid TEXT,
+                fingerprint TEXT NOT NULL,
+                lists TEXT NOT NULL,
+                properties TEXT NOT NULL,
+                merge_fields TEXT NOT NULL,
+                tags TEXT NOT NULL,
+                synced_at TEXT NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+    def get(self, email: str) -> Optional[Dict[str, Any]]:
+        """
+        What did we last push for this contact? (offline, no API calls)
+
+        Returns:
+            {"email", "vid", "fingerprint", "lists", "properties",
+             "merge_fields", "tags", "synced_at"} or None if never synced
+        """
+        row = self.conn.execute(
+            "SELECT * FROM contact_state WHERE email = ?", (email.lower(),)
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            "email": row["email"],
+            "vid": row["vid"],
+            "fingerprint": row["fingerprint"],
+            "lists": codec.loads(row["lists"]),
+            "properties": codec.loads(row["properties"]),
+            "merge_fields": codec.loads(row["merge_fields"]),
+            "tags": codec.loads(row["tags"]),
+            "synced_at": row["synced_at"],
+        }
+
+    def fresh_fingerprints(self, max_age_hours: float = 0) -> Dict[str, str]:
+        """
+        Bulk-load fingerprints for the planner's unchanged-contact check.
+
+        Args:
+            max_age_hours: Ignore rows older than this (0 = no age limit), so
+                           every contact is fully re-planned periodically
+
+        Returns:
+            Dict mapping lowercase email → fingerprint
+        """
+        query = "SELECT email, fingerprint FROM contact_state"
+        params: tuple = ()
+        if max_age_hours > 0:
+            cutoff = (datetime.utcnow() - timedelta(hours=max_age_hours)).isoformat()
+            query += " WHERE synced_at >= ?"
+            params = (cutoff,)
+        return {row["email"]: row["fingerprint"] for row in self.conn.execute(query, params)}
+
+    def record(self, entries: List[Dict[str, Any]]):
+        """
+        Upsert synced state for contacts (one transaction).
+
+        Args:
+            entries: [{"email", "vid", "fingerprint", "lists", "properties",
+                       "merge_fields", "tags"}]
+        """
+        if not entries:
+            return
+        synced_at = datetime.utcnow().isoformat()
+        rows = [
+            (
+                entry["email"].lower(),
+                str(entry.get("vid")) if entry.get("vid") is not None else None,
+                entry["fingerprint"],
+                codec.dumps(sorted(entry.get("lists", []))),
+                codec.dumps(entry.get("properties", {}), sort_keys=True),
+                codec.dumps(entry.get("merge_fields", {}), sort_keys=True),
+                codec.dumps(entry.get("tags", [])),
+                synced_at,
+            )
+            for entry in entries
+        ]
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO contact_state
+                    (email, vid, fingerprint, lists, properties, merge_fields, tags, synced_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(email) DO UPDATE SET
+                    vid = excluded.vid,
+                    fingerprint = excluded.fingerprint,
+                    lists = excluded.lists,
+                    properties = excluded.properties,
+                    merge_fields = excluded.merge_fields,
+                    tags = excluded.tags,
+                    synced_at = excluded.synced_at
+                """,
+                rows
+            )
+
+    def forget(self, emails: Iterable[str]):
+        """Drop state for contacts (e.g. archived), forcing a full re-plan."""
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM contact_state WHERE email = ?",
+                [(email.lower(),) for email in emails]
+            )
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM contact_state").fetchone()[0]
+
+    def close(self):
+        """Close the database (checkpoints the WAL into the main file)."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
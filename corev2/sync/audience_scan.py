@@ -0,0 +1,106 @@
+"""
+Shared Mailchimp audience scan.
+
+Streams the audience through get_all_members ONCE and fans each member out
+to registered consumers (unsubscribe, cleaned, exit-tag, orphan detectors),
+each of which receives only the members matching its own filter.
+"""
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+from corev2.clients.mailchimp_client import MailchimpClient
+
+
+logger = logging.getLogger(__name__)
+
+
+MemberFilter = Callable[[Dict[str, Any]], bool]
+
+
+class AudienceScan:
+    """Single-pass Mailchimp audience scan with per-consumer filtered results."""
+
+    def __init__(self, mc_client: MailchimpClient, count: int = 1000, concurrency: int = 1):
+        """
+        Args:
+            mc_client: Mailchimp API client (inside async with)
+            count: Members per page (max 1000)
+            concurrency: Pages fetched in parallel
+        """
+        self.mc_client = mc_client
+        self.count = count
+        self.concurrency = concurrency
+        self.scanned = 0
+        self._filters: Dict[str, Optional[MemberFilter]] = {}
+        self._results: Dict[str, List[Dict[str, Any]]] = {}
+
+    def register(self, name: str, member_filter: Optional[MemberFilter] = None):
+        """
+        Register a consumer before run().
+
+        Args:
+            name: Consumer name (key for results())
+            member_filter: Predicate selecting the members this consumer needs
+                           (None = every member)
+        """
+        if name in self._filters:
+            raise ValueError(f"Audience scan consumer already registered: {name}")
+        self._filters[name] = member_filter
+        self._results[name] = []
+
+    async def run(self) -> int:
+        """
+        Page the audience once, routing each member to every matching consumer.
+
+        Returns:
+            Number of members scanned
+        """
+        logger.info(f"Scanning Mailchimp audience once for {len(self._filters)} consumer(s): "
+                    f"{sorted(self._filters)}")
+
+        self.scanned = 0
+        for results in self._results.values():
+            results.clear()
+
+        async for member in self.mc_client.get_all_members(count=self.count, concurrency=self.concurrency):
+            self.scanned += 1
+
+            if self.scanned % 1000 == 0:
+                logger.info(f"  Scanned {self.scanned} Mailchimp members...")
+
+            for name, member_filter in self._filters.items():
+                if member_filter is None or member_filter(member):
+                    self._results[name].append(member)
+
+        logger.info(f"  Audience scan complete: {self.scanned} members scanned")
+        for name in sorted(self._results):
+            logger.info(f"    • {name}: {len(self._results[name])} members")
+
+        return self.scanned
+
+    def results(self, name: str) -> List[Dict[str, Any]]:
+        """Members routed to a registered consumer by the last run()."""
+        return self._results[name]
+
+
+async def iter_audience(
+    mc_client: MailchimpClient,
+    members: Optional[Iterable[Dict[str, Any]]] = None,
+    **kwargs
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Iterate pre-scanned members if given, otherwise page the audience.
+
+    Lets scan consumers accept results from a shared AudienceScan while
+    keeping their standalone behaviour.
+
+    Args:
+        mc_client: Mailchimp API client
+        members: Pre-scanned members (e.g. AudienceScan.results(name))
+        **kwargs: Passed to get_all_members when scanning live
+    """
+    if members is not None:
+        for member in members:
+            yield member
+    else:
+        async for member in mc_client.get_all_members(**kwargs):
+            yield member
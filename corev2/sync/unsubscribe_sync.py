@@ -6,10 +6,11 @@ Uses Communication Preferences API to properly opt out contacts.
 """
 import asyncio
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Optional
 from corev2.clients.hubspot_client import HubSpotClient
 from corev2.clients.mailchimp_client import MailchimpClient
 from corev2.config.schema import V2Config
+from corev2.sync.audience_scan import iter_audience
 
 
 logger = logging.getLogger(__name__)
@@ -43,10 +44,24 @@ class UnsubscribeSyncEngine:
             for list_config in list_configs:
                 self.source_tags.add(list_config.tag)
     
-    async def scan_and_sync(self) -> Dict[str, Any]:
+    @staticmethod
+    def is_unsubscribed(member: Dict[str, Any]) -> bool:
+        """AudienceScan filter for scan_and_sync."""
+        return member.get('status') == 'unsubscribed'
+    
+    @staticmethod
+    def is_cleaned(member: Dict[str, Any]) -> bool:
+        """AudienceScan filter for scan_cleaned_and_sync."""
+        return member.get('status') == 'cleaned'
+    
+    async def scan_and_sync(self, members: Optional[Iterable[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Scan Mailchimp for unsubscribed contacts and sync to HubSpot.
         
+        Args:
+            members: Pre-scanned members from a shared AudienceScan
+                     (None = page the audience here)
+        
         Returns:
             {
                 "mailchimp_unsubscribed": int,
@@ -69,12 +84,12 @@ class UnsubscribeSyncEngine:
         # contacts immediately. Step 1 verification checks if contact exists in HubSpot.
         unsubscribed_contacts = []
         
-        async for member in self.mc_client.get_all_members(count=500):
+        async for member in iter_audience(self.mc_client, members, count=500):
             member_tags = set(member.get('tags', []))
             
             # FIXED: Removed "and has_our_tags" condition to catch ALL unsubscribed
             # This prevents multi-run lag for contacts without tags yet
-            if member.get('status') == 'unsubscribed':
+            if self.is_unsubscribed(member):
                 unsubscribed_contacts.append({
                     "email": member.get('email_address'),
                     "tags": list(member_tags)
@@ -202,7 +217,7 @@ class UnsubscribeSyncEngine:
         
         return summary
     
-    async def scan_cleaned_and_sync(self) -> Dict[str, Any]:
+    async def scan_cleaned_and_sync(self, members: Optional[Iterable[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Scan Mailchimp for 'cleaned' (hard-bounced) contacts and sync bounce status to HubSpot.
 
@@ -212,6 +227,10 @@ class UnsubscribeSyncEngine:
 
         NOTE: Mailchimp does NOT allow resubscribing cleaned contacts — do not attempt it.
 
+        Args:
+            members: Pre-scanned members from a shared AudienceScan
+                     (None = page the cleaned segment here)
+
         Returns:
             {
                 "mailchimp_cleaned": int,
@@ -232,7 +251,9 @@ class UnsubscribeSyncEngine:
         }
 
         cleaned_contacts = []
-        async for member in self.mc_client.get_all_members(count=500, status="cleaned"):
+        async for member in iter_audience(self.mc_client, members, count=500, status="cleaned"):
+            if not self.is_cleaned(member):
+                continue
             cleaned_contacts.append({
                 "email": member.get("email_address"),
                 "tags": member.get("tags", [])
@@ -0,0 +1,60 @@
+"""Shared fixtures for unit tests."""
+
+import pytest
+from corev2.config.schema import V2Config
+
+
+def build_config(**overrides) -> V2Config:
+    """
+    Build a production-shaped V2Config in memory (no YAML, no env vars).
+    
+    Lists mirror production.yaml: 969/719/987 (GROUP 1), 784 (GROUP 3),
+    1032 (GROUP 4); exclusions 762/773 (compliance) and 717 (active deals).
+    Keyword overrides replace top-level sections, e.g. sync={...}.
+    """
+    data = {
+        "hubspot": {
+            "api_key": "test-hs-key",
+            "lists": {
+                "general_marketing": [
+                    {"id": "969", "name": "Sanctioned", "tag": "Sanctioned"},
+                    {"id": "719", "name": "Recruitment", "tag": "Recruitment",
+                     "tag_overrides": [{"property": "branches", "condition": "gt:1", "tag": "General Multi"}]},
+                    {"id": "987", "name": "General Mailchimp Import", "tag": "General Single",
+                     "tag_overrides": [{"property": "branches", "condition": "gt:1", "tag": "General Multi"}]},
+                ],
+                "special_campaigns": [],
+                "manual_override": [
+                    {"id": "784", "name": "Manual Inclusion MC", "tag": "General Single",
+                     "additional_tags": ["Manual Inclusion"]},
+                ],
+                "long_term_marketing": [
+                    {"id": "1032", "name": "Long Term Marketing", "tag": "General Single Long Term"},
+                ],
+            },
+            "exclusions": {"critical": ["762", "773"], "active_deals": ["717"], "exit": []},
+        },
+        "mailchimp": {
+            "api_key": "test-mc-key",
+            "server_prefix": "us1",
+            "audience_id": "aud123",
+        },
+        "sync": {},
+        "exclusion_matrix": {
+            "general_marketing": {"lists": ["969", "719", "987"], "exclude": ["762", "773", "717"]},
+            "special_campaigns": {"lists": [], "exclude": ["762", "773", "717"]},
+            "manual_override": {"lists": ["784"], "exclude": ["762", "773"]},
+            "long_term_marketing": {"lists": ["1032"], "exclude": ["762", "773", "717"]},
+        },
+        "list_exclusion_rules": {},
+        "archival": {"exempt_tags": ["Manual Inclusion"], "preservation_patterns": ["^Manual_.*"]},
+        "safety": {"run_mode": "test", "allow_archive": False},
+    }
+    data.update(overrides)
+    return V2Config.model_validate(data)
+
+
+@pytest.fixture
+def v2_config() -> V2Config:
+    """Production-shaped config with archival disabled."""
+    return build_config()
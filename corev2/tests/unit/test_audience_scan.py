@@ -0,0 +1,85 @@
+"""Unit tests for the shared Mailchimp audience scan."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from corev2.clients.hubspot_client import HubSpotClient
+from corev2.clients.mailchimp_client import MailchimpClient
+from corev2.planner.reconciliation import ArchivalReconciliation
+from corev2.sync.audience_scan import AudienceScan
+from corev2.sync.unsubscribe_sync import UnsubscribeSyncEngine
+
+
+AUDIENCE = [
+    {"email_address": "sub@example.com", "status": "subscribed", "tags": ["General Single"], "merge_fields": {}},
+    {"email_address": "unsub@example.com", "status": "unsubscribed", "tags": [], "merge_fields": {}},
+    {"email_address": "bounce@example.com", "status": "cleaned", "tags": ["Recruitment"], "merge_fields": {}},
+]
+
+
+def _mc_client():
+    mc_client = MagicMock(spec=MailchimpClient)
+    calls = []
+
+    async def mock_get_all_members(count=1000, offset=0, status=None, **kwargs):
+        calls.append(status)
+        for member in AUDIENCE:
+            yield member
+
+    mc_client.get_all_members = mock_get_all_members
+    return mc_client, calls
+
+
+@pytest.mark.asyncio
+async def test_scan_pages_audience_once_and_filters_per_consumer():
+    """Every consumer is served from one get_all_members pass."""
+    mc_client, calls = _mc_client()
+
+    scan = AudienceScan(mc_client)
+    scan.register("unsubscribed", UnsubscribeSyncEngine.is_unsubscribed)
+    scan.register("cleaned", UnsubscribeSyncEngine.is_cleaned)
+    scan.register("all")
+    scanned = await scan.run()
+
+    assert calls == [None]
+    assert scanned == 3
+    assert [m["email_address"] for m in scan.results("unsubscribed")] == ["unsub@example.com"]
+    assert [m["email_address"] for m in scan.results("cleaned")] == ["bounce@example.com"]
+    assert len(scan.results("all")) == 3
+
+
+def test_register_rejects_duplicate_consumer():
+    mc_client, _ = _mc_client()
+    scan = AudienceScan(mc_client)
+    scan.register("cleaned")
+
+    with pytest.raises(ValueError):
+        scan.register("cleaned")
+
+
+@pytest.mark.asyncio
+async def test_cleaned_sync_uses_prescanned_members(v2_config):
+    """scan_cleaned_and_sync with members= does not page the audience again."""
+    mc_client, calls = _mc_client()
+    mc_client.remove_tags = AsyncMock(return_value={"success": True})
+    hs_client = MagicMock(spec=HubSpotClient)
+    hs_client.get_contact_by_email = AsyncMock(return_value={"found": False})
+
+    engine = UnsubscribeSyncEngine(v2_config, hs_client, mc_client)
+    summary = await engine.scan_cleaned_and_sync(members=AUDIENCE)
+
+    assert calls == []
+    assert summary["mailchimp_cleaned"] == 1
+    mc_client.remove_tags.assert_awaited_once_with("bounce@example.com", ["Recruitment"])
+
+
+@pytest.mark.asyncio
+async def test_orphan_scan_uses_prescanned_members(v2_config):
+    """scan_for_orphans with members= finds orphans without a live scan."""
+    mc_client, calls = _mc_client()
+
+    reconciler = ArchivalReconciliation(mc_client, v2_config)
+    result = await reconciler.scan_for_orphans(set(), dry_run=True, members=AUDIENCE)
+
+    assert calls == []
+    assert result.total_mailchimp_members == 3
+    assert result.orphaned_members == 2  # source-tagged members absent from HubSpot
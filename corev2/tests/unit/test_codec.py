@@ -0,0 +1,41 @@
+"""Unit tests for the JSON codec (orjson with stdlib fallback)."""
+
+import io
+import json
+import pytest
+from corev2 import codec
+
+
+SAMPLE = {"email": "zoë@example.com", "vid": 42, "operations": [{"type": "apply_mc_tag", "tag": "VIP"}]}
+
+
+@pytest.fixture(params=["default", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(codec, "orjson", None)
+    return request.param
+
+
+def test_round_trip_compact_and_indented(backend):
+    assert codec.loads(codec.dumps(SAMPLE)) == SAMPLE
+    indented = codec.dumps(SAMPLE, indent=True)
+    assert indented == json.dumps(SAMPLE, indent=2, ensure_ascii=False)
+    assert "\n" not in codec.dumps(SAMPLE)
+
+
+def test_backends_produce_identical_compact_output(backend):
+    assert codec.dumps(SAMPLE) == json.dumps(SAMPLE, separators=(",", ":"), ensure_ascii=False)
+    assert codec.dumps({"b": 1, "a": [2]}, sort_keys=True) == '{"a":[2],"b":1}'
+
+
+def test_file_helpers_and_bytes(backend):
+    buffer = io.StringIO()
+    codec.dump(SAMPLE, buffer, indent=True)
+    buffer.seek(0)
+    assert codec.load(buffer) == SAMPLE
+    assert codec.loads(codec.dumps_bytes(SAMPLE)) == SAMPLE
+
+
+def test_values_orjson_rejects_fall_back_to_stdlib():
+    huge = {"n": 2 ** 70}
+    assert codec.loads(codec.dumps(huge)) == huge
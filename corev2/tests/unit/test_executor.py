@@ -0,0 +1,329 @@
+"""Unit tests for SyncExecutor (plan execution)."""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import MagicMock
+from corev2.clients.http_base import RetryBudgetExhausted
+from corev2.clients.hubspot_client import HubSpotClient
+from corev2.clients.mailchimp_client import MailchimpClient
+from corev2.executor.engine import SyncExecutor
+from corev2.tests.unit.conftest import build_config
+
+
+def _plan(emails):
+    return {
+        "metadata": {},
+        "operations": [
+            {
+                "email": email,
+                "vid": index,
+                "operations": [
+                    {"type": "upsert_mc_member", "email": email, "merge_fields": {}},
+                    {"type": "apply_mc_tag", "email": email, "tag": "General Single"},
+                ],
+            }
+            for index, email in enumerate(emails)
+        ],
+    }
+
+
+def _recording_mc_client(calls, in_flight, fail_email=None):
+    """Mailchimp mock that records call order and peak concurrency."""
+    mc_client = MagicMock(spec=MailchimpClient)
+
+    async def track(name, email):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        calls.append((name, email))
+
+    async def upsert_member(email, merge_fields=None, status_if_new="subscribed"):
+        await track("upsert", email)
+        if email == fail_email:
+            raise Exception("Mailchimp upsert failed: 400 - bad request")
+        return {"success": True, "action": "updated", "status": "subscribed"}
+
+    async def add_tags(email, tags):
+        await track("tag", email)
+        return {"success": True, "tags_added": tags}
+
+    mc_client.upsert_member = upsert_member
+    mc_client.add_tags = add_tags
+    return mc_client
+
+
+@pytest.mark.asyncio
+async def test_concurrent_workers_keep_per_contact_order(tmp_path):
+    """Contacts run in parallel; each contact's upsert precedes its tag."""
+    config = build_config(sync={"executor_workers": 4})
+    calls, in_flight = [], {"now": 0, "peak": 0}
+    mc_client = _recording_mc_client(calls, in_flight)
+    emails = [f"c{i}@example.com" for i in range(8)]
+
+    executor = SyncExecutor(config, MagicMock(spec=HubSpotClient), mc_client)
+    summary = await executor.execute_plan(_plan(emails), journal_path=tmp_path / "journal.jsonl")
+
+    assert summary["successful"] == 16
+    assert summary["contacts_processed"] == 8
+    assert in_flight["peak"] > 1
+    for email in emails:
+        assert calls.index(("upsert", email)) < calls.index(("tag", email))
+
+
+@pytest.mark.asyncio
+async def test_dangerous_failure_stops_concurrent_workers(tmp_path, monkeypatch):
+    """A dangerous failure stops all workers and is journaled once."""
+    config = build_config(sync={"executor_workers": 3})
+    calls, in_flight = [], {"now": 0, "peak": 0}
+    mc_client = _recording_mc_client(calls, in_flight, fail_email="c0@example.com")
+    emails = [f"c{i}@example.com" for i in range(20)]
+
+    executor = SyncExecutor(config, MagicMock(spec=HubSpotClient), mc_client)
+
+    original = executor._execute_operation
+
+    async def mark_dangerous(op, journal):
+        result = await original(op, journal)
+        if not result["success"] and not result["skipped"]:
+            result["dangerous"] = True
+        return result
+
+    monkeypatch.setattr(executor, "_execute_operation", mark_dangerous)
+
+    journal_path = tmp_path / "journal.jsonl"
+    summary = await executor.execute_plan(_plan(emails), journal_path=journal_path)
+
+    assert summary["stopped_reason"] == "dangerous_failure"
+    assert summary["contacts_processed"] < len(emails)
+
+    events = [json.loads(line)["event"] for line in journal_path.read_text().splitlines()]
+    assert events.count("execution_stopped") == 1
+    assert "execution_completed" not in events
+
+
+@pytest.mark.asyncio
+async def test_state_recorded_only_for_fully_successful_contacts(tmp_path):
+    """Contacts are recorded in the state store once all their ops succeed."""
+    from corev2.state import SyncStateStore
+
+    config = build_config()
+    calls, in_flight = [], {"now": 0, "peak": 0}
+    mc_client = _recording_mc_client(calls, in_flight, fail_email="bad@example.com")
+
+    plan = _plan(["good@example.com", "bad@example.com"])
+    for entry in plan["operations"]:
+        entry["state"] = {"fingerprint": f"fp-{entry['email']}", "lists": ["987"],
+                          "properties": {}, "merge_fields": {}, "tags": ["General Single"]}
+    plan["in_sync"] = [{"email": "steady@example.com", "vid": 9, "fingerprint": "fp-steady",
+                        "lists": ["987"], "properties": {}, "merge_fields": {}, "tags": []}]
+
+    with SyncStateStore(tmp_path / "state.db") as store:
+        executor = SyncExecutor(config, MagicMock(spec=HubSpotClient), mc_client, state_store=store)
+        await executor.execute_plan(plan, journal_path=tmp_path / "journal.jsonl")
+
+        assert store.fresh_fingerprints() == {
+            "good@example.com": "fp-good@example.com",
+            "steady@example.com": "fp-steady",
+        }
+
+
+@pytest.mark.asyncio
+async def test_subscribed_upserts_use_batch_subscribe(tmp_path):
+    """Known subscribed members are batch-upserted; unsubscribed/unknown stay per-member."""
+    config = build_config()
+    calls, in_flight = [], {"now": 0, "peak": 0}
+    mc_client = _recording_mc_client(calls, in_flight)
+
+    async def batch_upsert_members(members, status_if_new="subscribed", chunk_size=100):
+        calls.append(("batch", tuple(m["email"] for m in members)))
+        return {
+            m["email"].lower(): {"success": True, "action": "updated", "status": "subscribed",
+                                 "email_address": m["email"]}
+            for m in members
+        }
+
+    mc_client.batch_upsert_members = batch_upsert_members
+
+    plan = _plan(["sub@example.com", "unsub@example.com", "new@example.com"])
+    statuses = {"sub@example.com": "subscribed", "unsub@example.com": "unsubscribed", "new@example.com": None}
+    for entry in plan["operations"]:
+        entry["operations"][0]["mc_status"] = statuses[entry["email"]]
+
+    journal_path = tmp_path / "journal.jsonl"
+    summary = await SyncExecutor(config, MagicMock(spec=HubSpotClient), mc_client).execute_plan(
+        plan, journal_path=journal_path
+    )
+
+    assert summary["successful"] == 6
+    assert calls[0] == ("batch", ("sub@example.com",))
+    assert ("upsert", "sub@example.com") not in calls
+    assert ("upsert", "unsub@example.com") in calls
+    assert ("upsert", "new@example.com") in calls
+    # Upsert (batched) still precedes the contact's tag op
+    assert calls.index(("batch", ("sub@example.com",))) < calls.index(("tag", "sub@example.com"))
+
+    entries = [json.loads(line) for line in journal_path.read_text().splitlines()]
+    assert any(e.get("batched") and e["email"] == "sub@example.com" for e in entries)
+
+
+@pytest.mark.asyncio
+async def test_mailchimp_ops_run_as_batches_waves(tmp_path):
+    """Tag/archive ops run as ordered /batches waves; HubSpot ops stay live."""
+    from corev2.clients.mailchimp_batches import LocalBatchTransport, MailchimpBatchEngine
+
+    config = build_config(sync={"batch_operations_min_contacts": 2}, safety={"allow_archive": True})
+    calls, in_flight = [], {"now": 0, "peak": 0}
+    mc_client = _recording_mc_client(calls, in_flight)
+
+    def handler(method, path, body):
+        # Already-archived members 404, which counts as success
+        return (404, {"detail": "not found"}) if method == "DELETE" else (204, None)
+
+    transport = LocalBatchTransport(handler, polls_until_finished=1)
+    engine = MailchimpBatchEngine(transport, audience_id="aud1", poll_interval=0)
+
+    plan = {"metadata": {}, "operations": [
+        {"email": f"x{i}@example.com", "vid": i, "operations": [
+            {"type": "remove_mc_tag", "email": f"x{i}@example.com", "tags": ["General Single"]},
+            {"type": "archive_mc_member", "email": f"x{i}@example.com"},
+        ]}
+        for i in range(3)
+    ]}
+
+    journal_path = tmp_path / "journal.jsonl"
+    summary = await SyncExecutor(
+        config, MagicMock(spec=HubSpotClient), mc_client, batch_engine=engine
+    ).execute_plan(plan, journal_path=journal_path)
+
+    assert summary["successful"] == 6
+    # Wave 1 (untag) fully precedes wave 2 (archive)
+    waves = list(transport.submitted.values())
+    assert [op["method"] for op in waves[0]] == ["POST"] * 3
+    assert [op["method"] for op in waves[1]] == ["DELETE"] * 3
+
+    entries = [json.loads(line) for line in journal_path.read_text().splitlines()]
+    assert sum(1 for e in entries if e.get("batched")) == 6
+
+
+@pytest.mark.asyncio
+async def test_batches_skipped_below_min_contacts(tmp_path):
+    """Below the contact threshold ops run per-member as before."""
+    from corev2.clients.mailchimp_batches import LocalBatchTransport, MailchimpBatchEngine
+
+    config = build_config(sync={"batch_operations_min_contacts": 5})
+    calls, in_flight = [], {"now": 0, "peak": 0}
+    mc_client = _recording_mc_client(calls, in_flight)
+    transport = LocalBatchTransport()
+    engine = MailchimpBatchEngine(transport, audience_id="aud1", poll_interval=0)
+
+    plan = {"metadata": {}, "operations": [
+        {"email": "t@example.com", "vid": 1, "operations": [
+            {"type": "apply_mc_tag", "email": "t@example.com", "tag": "VIP"},
+        ]}
+    ]}
+    summary = await SyncExecutor(
+        config, MagicMock(spec=HubSpotClient), mc_client, batch_engine=engine
+    ).execute_plan(plan, journal_path=tmp_path / "journal.jsonl")
+
+    assert summary["successful"] == 1
+    assert transport.submitted == {}
+    assert calls == [("tag", "t@example.com")]
+
+
+@pytest.mark.asyncio
+async def test_consecutive_tag_ops_coalesce_into_one_call(tmp_path):
+    """Adjacent tag adds/removals become one update_tags call, journaled per op."""
+    config = build_config()
+    calls, in_flight = [], {"now": 0, "peak": 0}
+    mc_client = _recording_mc_client(calls, in_flight)
+
+    async def update_tags(email, add=(), remove=()):
+        calls.append(("update_tags", email, tuple(add), tuple(remove)))
+        return {"success": True, "tags_added": list(add), "tags_removed": list(remove)}
+
+    mc_client.update_tags = update_tags
+
+    plan = {"metadata": {}, "operations": [
+        {"email": "m@example.com", "vid": 1, "operations": [
+            {"type": "upsert_mc_member", "email": "m@example.com", "merge_fields": {}},
+            {"type": "apply_mc_tag", "email": "m@example.com", "tag": "Manual Inclusion"},
+            {"type": "apply_mc_tag", "email": "m@example.com", "tag": "General Single"},
+            {"type": "remove_mc_tag", "email": "m@example.com", "tags": ["Old Group"]},
+        ]}
+    ]}
+
+    journal_path = tmp_path / "journal.jsonl"
+    summary = await SyncExecutor(config, MagicMock(spec=HubSpotClient), mc_client).execute_plan(
+        plan, journal_path=journal_path
+    )
+
+    assert summary["successful"] == 4
+    assert calls == [
+        ("upsert", "m@example.com"),
+        ("update_tags", "m@example.com", ("Manual Inclusion", "General Single"), ("Old Group",)),
+    ]
+    entries = [json.loads(line) for line in journal_path.read_text().splitlines()]
+    assert sum(1 for e in entries if e.get("coalesced")) == 3
+
+
+@pytest.mark.asyncio
+async def test_out_of_budget_ops_are_deferred_not_failed(tmp_path):
+    """RetryBudgetExhausted defers the op: journaled, counted, contact left for re-planning."""
+    from corev2.state import SyncStateStore
+
+    config = build_config()
+    calls, in_flight = [], {"now": 0, "peak": 0}
+    mc_client = _recording_mc_client(calls, in_flight)
+
+    async def add_tags(email, tags):
+        if email == "slow@example.com":
+            raise RetryBudgetExhausted("Mailchimp POST /tags: retry budget exhausted")
+        return {"success": True, "tags_added": tags}
+
+    mc_client.add_tags = add_tags
+
+    plan = _plan(["ok@example.com", "slow@example.com"])
+    for entry in plan["operations"]:
+        entry["state"] = {"fingerprint": f"fp-{entry['email']}", "lists": ["987"],
+                          "properties": {}, "merge_fields": {}, "tags": ["General Single"]}
+
+    journal_path = tmp_path / "journal.jsonl"
+    with SyncStateStore(tmp_path / "state.db") as store:
+        executor = SyncExecutor(config, MagicMock(spec=HubSpotClient), mc_client, state_store=store)
+        summary = await executor.execute_plan(plan, journal_path=journal_path)
+
+        assert store.fresh_fingerprints() == {"ok@example.com": "fp-ok@example.com"}
+
+    assert summary["successful"] == 3
+    assert summary["deferred"] == 1
+    assert summary["failed"] == 0
+    events = [json.loads(line)["event"] for line in journal_path.read_text().splitlines()]
+    assert events.count("operation_deferred") == 1
+    assert "operation_failed" not in events
+
+
+@pytest.mark.asyncio
+async def test_only_successful_archives_are_reported(tmp_path):
+    """archived_emails lists members actually archived, not every planned archive."""
+    config = build_config(safety={"allow_archive": True})
+    mc_client = MagicMock(spec=MailchimpClient)
+
+    async def archive_member(email):
+        if email == "stuck@example.com":
+            raise Exception("Mailchimp archive failed: 500 - server error")
+        return {"success": True, "action": "archived"}
+
+    mc_client.archive_member = archive_member
+
+    plan = {"metadata": {}, "operations": [
+        {"email": email, "vid": None, "operations": [{"type": "archive_mc_member", "email": email}]}
+        for email in ("Gone@example.com", "stuck@example.com")
+    ]}
+
+    executor = SyncExecutor(config, MagicMock(spec=HubSpotClient), mc_client)
+    summary = await executor.execute_plan(plan, journal_path=tmp_path / "journal.jsonl")
+
+    assert summary["failed"] == 1
+    assert executor.archived_emails == {"gone@example.com"}
@@ -18,7 +18,7 @@ class FakeClosedResponse:
         self._text_data = text_data or "test text"
         self._closed = False
     
-    async def json(self):
+    async def json(self, loads=None):
         if self._closed:
             raise RuntimeError("Cannot read from closed response!")
         return self._json_data
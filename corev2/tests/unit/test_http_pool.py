@@ -0,0 +1,53 @@
+"""Unit tests for HTTPBaseClient session sharing and connection pooling."""
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from corev2.clients.http_base import ConnectionPoolSettings, HTTPBaseClient
+
+
+@pytest.mark.asyncio
+async def test_nested_entries_share_one_session():
+    """Inner `async with` reuses the session; the outermost exit closes it."""
+    client = HTTPBaseClient(service_name="Test", base_url="https://api.test.com")
+    
+    async with client:
+        session = client.session
+        async with client:
+            assert client.session is session
+        assert client.session is session
+        assert not session.closed
+    
+    assert session.closed
+    assert client.session is None
+
+
+@pytest.mark.asyncio
+async def test_session_uses_pool_settings():
+    pool = ConnectionPoolSettings(limit=20, limit_per_host=4, connect_timeout=3.0, total_timeout=30.0)
+    client = HTTPBaseClient(service_name="Test", base_url="https://api.test.com", pool=pool)
+    
+    async with client:
+        assert client.session.connector.limit == 20
+        assert client.session.connector.limit_per_host == 4
+        assert client.session.timeout.connect == 3.0
+        assert client.session.timeout.total == 30.0
+
+
+@pytest.mark.asyncio
+async def test_keepalive_connections_are_reused():
+    """Sequential requests reuse one pooled connection (counted via tracing)."""
+    async def handler(request):
+        return web.json_response({"ok": True})
+    
+    app = web.Application()
+    app.router.add_get("/ping", handler)
+    
+    async with TestServer(app) as server:
+        client = HTTPBaseClient(service_name="Test", base_url=str(server.make_url("")))
+        async with client:
+            for _ in range(3):
+                result = await client.get("/ping")
+                assert result["data"] == {"ok": True}
+    
+    assert client.connection_metrics() == {"new": 1, "reused": 2, "reuse_ratio": 0.667}
@@ -1,5 +1,6 @@
 """Unit tests for HubSpot client."""
 
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, patch
 from corev2.clients.hubspot_client import HubSpotClient
@@ -275,3 +276,157 @@ async def test_get_list_members_with_custom_properties(hs_client):
         # Verify custom properties were requested
         call_params = mock_get.call_args[1]["params"]
         assert "custom_field" in call_params["property"]
+
+
+@pytest.mark.asyncio
+async def test_get_list_members_batch_hydrates_each_page(hs_client):
+    """Test get_list_members hydrates a memberships page with ONE batch read (no per-member GET)."""
+    memberships_page = {
+        "status": 200,
+        "headers": {},
+        "data": {
+            "results": [{"recordId": "101"}, {"recordId": "102"}, {"recordId": "103"}],
+            "paging": {}
+        }
+    }
+    batch_response = {
+        "status": 207,  # Multi-status: record 102 could not be read
+        "headers": {},
+        "data": {
+            "status": "COMPLETE",
+            "results": [
+                {"id": "103", "properties": {"email": "c@example.com", "firstname": "C"}},
+                {"id": "101", "properties": {"email": "a@example.com", "firstname": "A"}}
+            ],
+            "errors": [{"status": "error", "context": {"ids": ["102"]}}]
+        }
+    }
+    
+    with patch.object(hs_client, 'get', new_callable=AsyncMock) as mock_get, \
+         patch.object(hs_client, 'post', new_callable=AsyncMock) as mock_post:
+        mock_get.return_value = memberships_page
+        mock_post.return_value = batch_response
+        
+        contacts = []
+        async for contact in hs_client.get_list_members("987", properties=["email", "firstname"]):
+            contacts.append(contact)
+        
+        # Membership order preserved, unreadable record skipped
+        assert [c["vid"] for c in contacts] == ["101", "103"]
+        assert contacts[0]["email"] == "a@example.com"
+        assert contacts[0]["list_memberships"] == {"987": True}
+        
+        # One memberships GET + one batch read POST
+        assert mock_get.call_count == 1
+        mock_post.assert_called_once()
+        assert mock_post.call_args[0][0] == "/crm/v3/objects/contacts/batch/read"
+        payload = mock_post.call_args[1]["json"]
+        assert payload["properties"] == ["email", "firstname"]
+        assert payload["inputs"] == [{"id": "101"}, {"id": "102"}, {"id": "103"}]
+
+
+@pytest.mark.asyncio
+async def test_batch_read_contacts_chunks_at_100(hs_client):
+    """Test batch_read_contacts splits inputs into chunks of 100 IDs."""
+    async def fake_post(path, json=None):
+        return {
+            "status": 200,
+            "headers": {},
+            "data": {"results": [{"id": i["id"], "properties": {}} for i in json["inputs"]]}
+        }
+    
+    with patch.object(hs_client, 'post', side_effect=fake_post) as mock_post:
+        ids = [str(i) for i in range(250)]
+        contacts = await hs_client.batch_read_contacts(ids)
+        
+        assert len(contacts) == 250
+        assert mock_post.call_count == 3
+
+
+def _memberships_pages(pages, fetched):
+    """Mock GET serving memberships pages by cursor; records each cursor requested."""
+    async def get(endpoint, params=None):
+        index = int(params.get("after", 0))
+        fetched.append(index)
+        await asyncio.sleep(0)
+        paging = {"next": {"after": str(index + 1)}} if index + 1 < len(pages) else {}
+        return {"status": 200, "headers": {}, "data": {
+            "results": [{"recordId": rid} for rid in pages[index]], "paging": paging
+        }}
+    return get
+
+
+@pytest.mark.asyncio
+async def test_membership_pages_prefetched_while_page_processed(hs_client):
+    """Next page is fetched while the consumer works on the current one, up to the buffer size."""
+    pages = [[str(p * 10 + i) for i in range(3)] for p in range(6)]
+    fetched = []
+    hs_client.membership_prefetch = 2
+    
+    with patch.object(hs_client, 'get', side_effect=_memberships_pages(pages, fetched)):
+        seen = []
+        async for record_ids in hs_client._iter_membership_pages("987"):
+            for _ in range(10):
+                await asyncio.sleep(0)  # downstream per-record work
+            # Never more than 2 buffered pages + 1 in flight beyond the one being processed
+            assert len(fetched) - len(seen) <= 4
+            if not seen:
+                assert len(fetched) > 1
+            seen.append(record_ids)
+    
+    assert seen == pages
+    assert fetched == list(range(6))
+
+
+@pytest.mark.asyncio
+async def test_membership_prefetch_stops_when_consumer_stops(hs_client):
+    """Breaking out of the scan cancels the look-ahead fetch."""
+    pages = [["1"]] * 50
+    fetched = []
+    
+    with patch.object(hs_client, 'get', side_effect=_memberships_pages(pages, fetched)):
+        scan = hs_client.get_list_membership_ids("987")
+        assert await scan.__anext__() == "1"
+        await scan.aclose()
+        count = len(fetched)
+        await asyncio.sleep(0.01)
+    
+    assert len(fetched) == count
+    assert count <= 1 + hs_client.membership_prefetch + 1
+
+
+@pytest.mark.asyncio
+async def test_membership_prefetch_raises_page_error(hs_client):
+    """A failed look-ahead page surfaces after the pages before it."""
+    ok_page = {"status": 200, "headers": {}, "data": {
+        "results": [{"recordId": "1"}], "paging": {"next": {"after": "x"}}
+    }}
+    error_page = {"status": 500, "headers": {}, "data": {"message": "boom"}}
+    
+    with patch.object(hs_client, 'get', new_callable=AsyncMock) as mock_get:
+        mock_get.side_effect = [ok_page, error_page]
+        seen = []
+        with pytest.raises(Exception, match="HubSpot API error: 500"):
+            async for record_id in hs_client.get_list_membership_ids("987"):
+                seen.append(record_id)
+    
+    assert seen == ["1"]
+
+
+@pytest.mark.asyncio
+async def test_get_contact_list_ids_pages_record_memberships(hs_client):
+    """A contact's list IDs come from the record memberships endpoint, all pages."""
+    pages = [
+        {"status": 200, "headers": {}, "data": {
+            "results": [{"listId": "987"}, {"listId": 717}], "paging": {"next": {"after": "2"}}
+        }},
+        {"status": 200, "headers": {}, "data": {"results": [{"listId": "784"}]}},
+    ]
+    
+    with patch.object(hs_client, 'get', new_callable=AsyncMock) as mock_get:
+        mock_get.side_effect = pages
+        list_ids = await hs_client.get_contact_list_ids("123")
+    
+    assert list_ids == {"987", "717", "784"}
+    assert mock_get.call_args_list[0][0][0] == "/crm/v3/lists/records/0-1/123/memberships"
+    assert mock_get.call_args_list[1][1]["params"] == {"limit": 100, "after": "2"}
@@ -0,0 +1,67 @@
+"""Unit tests for the Mailchimp /batches engine (local fake transport)."""
+
+import json
+import pytest
+from corev2.clients.mailchimp_batches import BatchTransport, LocalBatchTransport, MailchimpBatchEngine
+
+
+@pytest.mark.asyncio
+async def test_batch_cycle_submit_poll_and_parse_archive():
+    """Operations run through submit → pending/started polls → tar.gz results."""
+    transport = LocalBatchTransport(polls_until_finished=2, results_per_file=2)
+    engine = MailchimpBatchEngine(transport, audience_id="aud1", poll_interval=0)
+
+    operations = [
+        engine.tags_operation("a#0", "A@example.com", add=["VIP"], remove=["Old"]),
+        engine.unsubscribe_operation("b#0", "b@example.com"),
+        engine.archive_operation("c#0", "c@example.com"),
+    ]
+    results = await engine.run(operations)
+
+    assert set(results) == {"a#0", "b#0", "c#0"}
+    assert all(r["success"] for r in results.values())
+    (batch_id,) = transport.submitted
+    assert transport._polls[batch_id] == 3
+
+    tag_op = transport.submitted[batch_id][0]
+    assert tag_op["path"].startswith("/lists/aud1/members/") and tag_op["path"].endswith("/tags")
+    assert json.loads(tag_op["body"])["tags"] == [
+        {"name": "VIP", "status": "active"},
+        {"name": "Old", "status": "inactive"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_errors_and_missing_results_are_failures():
+    """4xx responses fail per operation; ops absent from the archive fail too."""
+    def handler(method, path, body):
+        if method == "DELETE":
+            return 404, {"title": "Resource Not Found"}
+        return 204, None
+
+    transport = LocalBatchTransport(handler, polls_until_finished=0)
+    engine = MailchimpBatchEngine(transport, audience_id="aud1", poll_interval=0)
+
+    operations = [
+        engine.archive_operation("gone#0", "gone@example.com"),
+        engine.tags_operation("ok#0", "ok@example.com", add=["VIP"]),
+    ]
+    original_run = transport._run
+    transport._run = lambda batch_id, ops: original_run(batch_id, ops[:1])
+
+    results = await engine.run(operations)
+
+    assert results["gone#0"] == {"status_code": 404, "success": False,
+                                 "response": {"title": "Resource Not Found"}}
+    assert results["ok#0"]["success"] is False
+    assert results["ok#0"]["status_code"] == 0
+
+
+def test_incomplete_transport_cannot_be_built():
+    """A transport missing an interface method fails at construction, not mid-batch."""
+    class SubmitOnly(BatchTransport):
+        async def submit(self, operations):
+            return "b1"
+
+    with pytest.raises(TypeError, match="status"):
+        SubmitOnly()
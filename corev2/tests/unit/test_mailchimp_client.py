@@ -1,5 +1,6 @@
 """Unit tests for Mailchimp client."""
 
+import asyncio
 import pytest
 import base64
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -348,3 +349,160 @@ async def test_subscriber_hash_lowercase(mc_client):
     
     assert hash1 == hash2
     assert hash1 == "55502f40dc8b7c769880b10874abc9d0"  # MD5 of "test@example.com"
+
+
+@pytest.mark.asyncio
+async def test_update_tags_sends_mixed_statuses_in_one_request(mc_client):
+    """Adds and removals go out as one tags POST."""
+    with patch.object(mc_client, 'post', new_callable=AsyncMock) as mock_post:
+        mock_post.return_value = {"status": 204, "headers": {}, "data": None}
+        
+        result = await mc_client.update_tags("test@example.com", add=["VIP"], remove=["Old"])
+        
+        assert mock_post.call_count == 1
+        assert mock_post.call_args[1]["json"]["tags"] == [
+            {"name": "VIP", "status": "active"},
+            {"name": "Old", "status": "inactive"},
+        ]
+        assert result["tags_added"] == ["VIP"]
+        assert result["tags_removed"] == ["Old"]
+
+
+@pytest.mark.asyncio
+async def test_batch_upsert_members_maps_per_email_actions(mc_client):
+    """Batch-subscribe sends status_if_new only and maps created/updated/failed/skipped."""
+    mock_response = {
+        "status": 200,
+        "headers": {},
+        "data": {
+            "new_members": [{"email_address": "New@example.com", "status": "subscribed"}],
+            "updated_members": [{"email_address": "old@example.com", "status": "subscribed"}],
+            "errors": [{"email_address": "bad@example.com", "error": "Invalid address", "error_code": "ERROR_GENERIC"}],
+        }
+    }
+    members = [
+        {"email": "New@example.com", "merge_fields": {"FNAME": "New"}},
+        {"email": "old@example.com", "merge_fields": {"FNAME": "Old"}},
+        {"email": "bad@example.com", "merge_fields": {}},
+        {"email": "same@example.com", "merge_fields": {"FNAME": "Same"}},
+    ]
+    
+    with patch.object(mc_client, 'post', new_callable=AsyncMock) as mock_post:
+        mock_post.return_value = mock_response
+        
+        results = await mc_client.batch_upsert_members(members)
+        
+        payload = mock_post.call_args[1]["json"]
+        assert mock_post.call_args[0][0] == "/lists/abc123"
+        assert payload["update_existing"] is True
+        assert all("status" not in m and m["status_if_new"] == "subscribed" for m in payload["members"])
+        
+        assert results["new@example.com"]["action"] == "created"
+        assert results["old@example.com"]["action"] == "updated"
+        assert results["bad@example.com"]["success"] is False
+        assert results["same@example.com"]["action"] == "skipped"
+
+
+@pytest.mark.asyncio
+async def test_batch_upsert_members_chunks_requests(mc_client):
+    """Members are sent in chunk_size requests."""
+    members = [{"email": f"m{i}@example.com", "merge_fields": {}} for i in range(250)]
+    
+    with patch.object(mc_client, 'post', new_callable=AsyncMock) as mock_post:
+        mock_post.return_value = {"status": 200, "headers": {}, "data": {}}
+        
+        results = await mc_client.batch_upsert_members(members, chunk_size=100)
+        
+        assert [len(c[1]["json"]["members"]) for c in mock_post.call_args_list] == [100, 100, 50]
+        assert len(results) == 250
+
+
+@pytest.mark.asyncio
+async def test_get_all_members_projects_scan_fields(mc_client):
+    """Member pages request only the fields scan consumers read."""
+    page = {
+        "status": 200,
+        "headers": {},
+        "data": {"members": [
+            {"email_address": "a@example.com", "status": "subscribed",
+             "tags": [{"id": 1, "name": "VIP"}], "merge_fields": {"FNAME": "A"}},
+        ]},
+    }
+    
+    with patch.object(mc_client, 'get', new_callable=AsyncMock) as mock_get:
+        mock_get.return_value = page
+        
+        members = [m async for m in mc_client.get_all_members(count=10)]
+        assert mock_get.call_args[1]["params"]["fields"] == (
+            "members.email_address,members.status,members.tags,members.merge_fields"
+        )
+        assert members == [{"email_address": "a@example.com", "status": "subscribed",
+                            "tags": ["VIP"], "merge_fields": {"FNAME": "A"}}]
+        
+        [m async for m in mc_client.get_all_members(count=10, fields=None, exclude_fields=["_links"])]
+        params = mock_get.call_args[1]["params"]
+        assert "fields" not in params
+        assert params["exclude_fields"] == "members._links"
+
+
+def _paged_audience(emails, in_flight=None, total_items=None):
+    """Mock GET serving /members pages by offset from a (mutable) email list."""
+    async def get(endpoint, params=None):
+        if in_flight is not None:
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01 * (3 - params["offset"] // params["count"] % 3))
+        if in_flight is not None:
+            in_flight["now"] -= 1
+        page = emails[params["offset"]:params["offset"] + params["count"]]
+        return {"status": 200, "headers": {}, "data": {
+            "members": [{"email_address": e, "status": "subscribed", "tags": [], "merge_fields": {}} for e in page],
+            "total_items": len(emails) if total_items is None else total_items,
+        }}
+    return get
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_yields_pages_in_offset_order(mc_client):
+    emails = [f"m{i}@example.com" for i in range(95)]
+    in_flight = {"now": 0, "peak": 0}
+    
+    with patch.object(mc_client, 'get', side_effect=_paged_audience(emails, in_flight)) as mock_get:
+        members = [m async for m in mc_client.get_all_members(count=10, concurrency=4)]
+    
+    assert [m["email_address"] for m in members] == emails
+    assert in_flight["peak"] > 1
+    assert "total_items" in mock_get.call_args_list[0][1]["params"]["fields"]
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_from_offset_stops_at_audience_end(mc_client):
+    """total_items is the whole audience: a scan starting mid-list schedules no pages past its end."""
+    emails = [f"m{i}@example.com" for i in range(95)]
+    
+    with patch.object(mc_client, 'get', side_effect=_paged_audience(emails)) as mock_get:
+        members = [m async for m in mc_client.get_all_members(count=10, offset=20, concurrency=4)]
+    
+    assert [m["email_address"] for m in members] == emails[20:]
+    offsets = sorted(call[1]["params"]["offset"] for call in mock_get.call_args_list)
+    assert offsets == list(range(20, 101, 10))  # 20..90, then one tail read
+
+
+@pytest.mark.asyncio
+async def test_parallel_scan_dedupes_and_reads_past_initial_total(mc_client):
+    """Members inserted mid-scan shift others (deduped) and extend the audience (tail read)."""
+    emails = [f"m{i}@example.com" for i in range(30)]
+    serve = _paged_audience(emails, total_items=30)
+    
+    async def get(endpoint, params=None):
+        result = await serve(endpoint, params)
+        if params["offset"] == 0:
+            emails.insert(0, "new1@example.com")
+            emails.insert(0, "new2@example.com")
+        return result
+    
+    with patch.object(mc_client, 'get', side_effect=get):
+        members = [m["email_address"] async for m in mc_client.get_all_members(count=10, concurrency=3, ordered=False)]
+    
+    assert sorted(members) == sorted(set(emails) - {"new1@example.com", "new2@example.com"})
+    assert len(members) == len(set(members))
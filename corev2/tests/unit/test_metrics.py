@@ -0,0 +1,70 @@
+"""Unit tests for per-endpoint request metrics."""
+
+import json
+import pytest
+from unittest.mock import MagicMock, patch
+from corev2 import codec
+from corev2.clients.http_base import HTTPBaseClient
+from corev2.clients.metrics import RequestCall, RequestMetrics, normalize_endpoint, write_run_report
+
+
+def test_normalize_endpoint_templates_ids():
+    assert normalize_endpoint(
+        "/lists/a1b2c3d4e5/members/55502f40dc8b7c769880b10874abc9d0/tags"
+    ) == "/lists/{id}/members/{hash}/tags"
+    assert normalize_endpoint("/crm/v3/lists/718/memberships?limit=100") == "/crm/v3/lists/{id}/memberships"
+    assert normalize_endpoint("/contacts/v1/contact/email/a@b.com/profile") == "/contacts/v1/contact/email/{email}/profile"
+
+
+def test_endpoint_summary_percentiles_and_counters():
+    metrics = RequestMetrics("Test")
+    for index in range(100):
+        call = RequestCall(attempts=2 if index == 0 else 1, throttled=1 if index == 0 else 0, status=200)
+        call.started -= (index + 1) / 1000  # 1ms .. 100ms
+        metrics.record("GET", f"/lists/{index}", call)
+    metrics.record("GET", "/lists/1", RequestCall(status=500, server_errors=3, attempts=3))
+    
+    summary = metrics.summary()
+    stats = summary["endpoints"]["GET /lists/{id}"]
+    assert stats["count"] == 101
+    assert stats["errors"] == 1
+    assert stats["retries"] == 3
+    assert summary["throttled"] == 1
+    assert summary["server_errors"] == 3
+    assert 49 <= stats["latency_ms"]["p50"] <= 52
+    assert 94 <= stats["latency_ms"]["p95"] <= 97
+
+
+class _Response:
+    status = 200
+    headers = {"Content-Type": "application/json"}
+    request_info = MagicMock()
+    history = []
+    
+    async def json(self, loads=None):
+        return {"ok": True}
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *args):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_client_records_requests_and_writes_report(tmp_path):
+    client = HTTPBaseClient(service_name="Test", base_url="https://api.test.com", rate_limit=100.0)
+    
+    async with client:
+        with patch.object(client.session, "request", return_value=_Response()):
+            await client.post("/lists/abc123/members", json={"email_address": "a@example.com"})
+            await client.post("/lists/abc123/members", json={"email_address": "b@example.com"})
+    
+    stats = client.metrics.summary()["endpoints"]["POST /lists/{id}/members"]
+    assert stats["count"] == 2
+    assert stats["bytes_sent"] == 2 * len(codec.dumps_bytes({"email_address": "a@example.com"}))
+    
+    report = write_run_report(tmp_path / "report.json", [client], "plan")
+    assert json.loads((tmp_path / "report.json").read_text()) == report
+    assert report["services"]["Test"]["requests"] == 2
+    assert report["services"]["Test"]["connections"] == {"new": 0, "reused": 0, "reuse_ratio": 0.0}
@@ -446,3 +446,376 @@ async def test_mc_read_failure_skips_contact_strict_mode():
 
 
 
+
+
+def _membership_mock(memberships):
+    """Build get_list_membership_ids mock from {list_id: [record_id, ...]}."""
+    async def mock_get_list_membership_ids(list_id, limit=100):
+        for record_id in memberships.get(list_id, []):
+            yield record_id
+    return mock_get_list_membership_ids
+
+
+@pytest.mark.asyncio
+async def test_overlapping_lists_hydrate_each_contact_once(v2_config):
+    """Contacts in several lists (987, 717, 784) are read from HubSpot exactly once."""
+    hs_client = MagicMock(spec=HubSpotClient)
+    mc_client = MagicMock(spec=MailchimpClient)
+    
+    hs_client.get_list_membership_ids = _membership_mock({
+        "987": ["1", "2"],
+        "717": ["1"],
+        "784": ["1", "3"],
+    })
+    hs_client.batch_read_contacts = AsyncMock(return_value={
+        "1": {"id": "1", "properties": {"email": "one@example.com", "firstname": "One"}},
+        "2": {"id": "2", "properties": {"email": "two@example.com", "firstname": "Two"}},
+        "3": {"id": "3", "properties": {"email": "three@example.com", "firstname": "Three"}},
+    })
+    mc_client.get_member = AsyncMock(return_value={"found": False, "tags": []})
+    
+    planner = SyncPlanner(v2_config, hs_client, mc_client)
+    plan = await planner.generate_plan()
+    
+    # One hydration call covering each unique recordId once
+    hs_client.batch_read_contacts.assert_awaited_once()
+    assert sorted(hs_client.batch_read_contacts.call_args[0][0]) == ["1", "2", "3"]
+    assert plan["summary"]["total_contacts_scanned"] == 3
+    
+    # Contact 1 is in 987 + 717 (excluded from GROUP 1) + 784 (GROUP 3 bypasses 717)
+    ops_by_email = {entry["email"]: entry["operations"] for entry in plan["operations"]}
+    tags_one = [op["tag"] for op in ops_by_email["one@example.com"] if op["type"] == "apply_mc_tag"]
+    assert tags_one == ["General Single", "Manual Inclusion"]
+
+
+def _audience_mock(members):
+    """Build get_all_members mock from a list of Mailchimp member dicts."""
+    async def mock_get_all_members(count=1000, offset=0, status=None, **kwargs):
+        for member in members:
+            yield member
+    return mock_get_all_members
+
+
+@pytest.mark.asyncio
+async def test_plan_reads_mailchimp_state_from_audience_snapshot(v2_config):
+    """Mailchimp state comes from one audience scan, not one get_member per contact."""
+    hs_client = MagicMock(spec=HubSpotClient)
+    mc_client = MagicMock(spec=MailchimpClient)
+    
+    hs_client.get_list_membership_ids = _membership_mock({"987": ["1", "2"]})
+    hs_client.batch_read_contacts = AsyncMock(return_value={
+        "1": {"id": "1", "properties": {"email": "one@example.com"}},
+        "2": {"id": "2", "properties": {"email": "two@example.com"}},
+    })
+    mc_client.get_all_members = _audience_mock([
+        {"email_address": "ONE@example.com", "status": "subscribed",
+         "tags": ["Recruitment"], "merge_fields": {}},
+    ])
+    mc_client.get_member = AsyncMock()
+    
+    planner = SyncPlanner(v2_config, hs_client, mc_client)
+    plan = await planner.generate_plan()
+    
+    mc_client.get_member.assert_not_awaited()
+    
+    # Existing member keeps its snapshot source tag (first-tag priority, already active);
+    # new member gets the list tag
+    ops_by_email = {entry["email"]: entry["operations"] for entry in plan["operations"]}
+    assert [op["type"] for op in ops_by_email["one@example.com"]] == ["update_hs_property"]
+    tags_two = [op["tag"] for op in ops_by_email["two@example.com"] if op["type"] == "apply_mc_tag"]
+    assert tags_two == ["General Single"]
+
+
+@pytest.mark.asyncio
+async def test_plan_drops_noop_operations_and_counts_them(v2_config):
+    """Only real differences become operations; skipped no-ops are counted by reason."""
+    hs_client = MagicMock(spec=HubSpotClient)
+    mc_client = MagicMock(spec=MailchimpClient)
+    
+    hs_client.get_list_membership_ids = _membership_mock({"987": ["1", "2", "3"]})
+    hs_client.batch_read_contacts = AsyncMock(return_value={
+        "1": {"id": "1", "properties": {"email": "same@example.com", "firstname": "Sam", "lastname": "Same",
+                                        "ORI_LISTS": "987"}},
+        "2": {"id": "2", "properties": {"email": "renamed@example.com", "firstname": "New", "ORI_LISTS": "987"}},
+        "3": {"id": "3", "properties": {"email": "untagged@example.com", "firstname": "Una", "ORI_LISTS": ""}},
+    })
+    mc_client.get_all_members = _audience_mock([
+        {"email_address": "same@example.com", "status": "subscribed",
+         "tags": ["General Single"], "merge_fields": {"FNAME": "Sam", "LNAME": "Same"}},
+        {"email_address": "renamed@example.com", "status": "unsubscribed",
+         "tags": ["General Single"], "merge_fields": {"FNAME": "Old", "LNAME": ""}},
+        {"email_address": "untagged@example.com", "status": "subscribed",
+         "tags": [], "merge_fields": {"FNAME": "Una"}},
+    ])
+    
+    planner = SyncPlanner(v2_config, hs_client, mc_client)
+    plan = await planner.generate_plan()
+    
+    ops_by_email = {
+        entry["email"]: [op["type"] for op in entry["operations"]]
+        for entry in plan["operations"]
+    }
+    assert ops_by_email == {
+        "renamed@example.com": ["upsert_mc_member"],
+        "untagged@example.com": ["apply_mc_tag", "update_hs_property"],
+    }
+    assert plan["summary"]["noops_skipped"] == {
+        "hs_property_unchanged": 2, "tag_already_active": 2, "upsert_unchanged": 2
+    }
+
+
+@pytest.mark.asyncio
+async def test_strict_snapshot_misses_fall_back_to_live_lookup():
+    """With strict_snapshot_misses, only contacts missing from the snapshot get a live GET."""
+    from corev2.tests.unit.conftest import build_config
+    config = build_config(sync={"strict_snapshot_misses": True})
+    
+    hs_client = MagicMock(spec=HubSpotClient)
+    mc_client = MagicMock(spec=MailchimpClient)
+    
+    hs_client.get_list_membership_ids = _membership_mock({"987": ["1", "2"]})
+    hs_client.batch_read_contacts = AsyncMock(return_value={
+        "1": {"id": "1", "properties": {"email": "one@example.com"}},
+        "2": {"id": "2", "properties": {"email": "two@example.com"}},
+    })
+    mc_client.get_all_members = _audience_mock([
+        {"email_address": "one@example.com", "status": "subscribed", "tags": [], "merge_fields": {}},
+    ])
+    mc_client.get_member = AsyncMock(return_value={"found": True, "status": "archived", "tags": []})
+    
+    planner = SyncPlanner(config, hs_client, mc_client)
+    await planner.generate_plan()
+    
+    mc_client.get_member.assert_awaited_once_with("two@example.com")
+
+
+@pytest.mark.asyncio
+async def test_snapshot_hits_are_resolved_without_lookup_tasks():
+    """Only live reads go through the bounded pool; results keep email order."""
+    from corev2.clients.audience_snapshot import AudienceSnapshot
+    from corev2.tests.unit.conftest import build_config
+    config = build_config(sync={"strict_snapshot_misses": True})
+    
+    mc_client = MagicMock(spec=MailchimpClient)
+    mc_client.get_member = AsyncMock(return_value={"found": True, "status": "archived", "tags": []})
+    snapshot = AudienceSnapshot()
+    for email in ("a@example.com", "c@example.com"):
+        snapshot.add({"email_address": email, "status": "subscribed", "tags": [], "merge_fields": {}})
+    planner = SyncPlanner(config, MagicMock(spec=HubSpotClient), mc_client, audience_snapshot=snapshot)
+    
+    with patch.object(planner, "_read_member", wraps=planner._read_member) as read_member:
+        results = await planner._read_members(["a@example.com", "b@example.com", "c@example.com"])
+    
+    read_member.assert_called_once_with("b@example.com")
+    assert [result["status"] for result in results] == ["subscribed", "archived", "subscribed"]
+
+
+@pytest.mark.asyncio
+async def test_unchanged_contacts_are_not_replanned(v2_config, tmp_path):
+    """With a state store, only contacts whose fingerprint changed are planned."""
+    from corev2.state import SyncStateStore
+    
+    hs_client = MagicMock(spec=HubSpotClient)
+    mc_client = MagicMock(spec=MailchimpClient)
+    hs_client.get_list_membership_ids = _membership_mock({"987": ["1", "2"]})
+    hs_client.batch_read_contacts = AsyncMock(return_value={
+        "1": {"id": "1", "properties": {"email": "one@example.com", "firstname": "One",
+                                        "lastmodifieddate": "2026-01-01"}},
+        "2": {"id": "2", "properties": {"email": "two@example.com", "firstname": "Two"}},
+    })
+    mc_client.get_all_members = _audience_mock([])
+    
+    with SyncStateStore(tmp_path / "state.db") as store:
+        # First run: everything planned, state carried in the plan
+        first = await SyncPlanner(v2_config, hs_client, mc_client, state_store=store).generate_plan()
+        assert len(first["operations"]) == 2
+        store.record([{"email": e["email"], "vid": e["vid"], **e["state"]} for e in first["operations"]])
+        mc_client.get_all_members = _audience_mock([_pushed_member(e["email"], e["state"]) for e in first["operations"]])
+        
+        # Second run: contact 2 renamed in HubSpot; contact 1 only has a volatile property change
+        hs_client.batch_read_contacts.return_value["1"]["properties"]["lastmodifieddate"] = "2026-02-01"
+        hs_client.batch_read_contacts.return_value["2"]["properties"]["firstname"] = "Deux"
+        second = await SyncPlanner(v2_config, hs_client, mc_client, state_store=store).generate_plan()
+    
+    assert second["summary"]["contacts_unchanged"] == 1
+    assert [entry["email"] for entry in second["operations"]] == ["two@example.com"]
+    assert second["operations"][0]["state"]["merge_fields"]["FNAME"] == "Deux"
+
+
+def _pushed_member(email, state, **changes):
+    """Mailchimp member holding what a recorded sync pushed (changes applied on top)."""
+    return {"email_address": email, "status": "subscribed", "tags": list(state["tags"]),
+            "merge_fields": dict(state["merge_fields"]), **changes}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("drift", ["untagged", "renamed", "archived", "hubspot_writes"])
+async def test_unchanged_contact_is_replanned_after_drift(tmp_path, drift):
+    """A matching fingerprint is not enough: hand edits in Mailchimp and safety flags re-plan the contact."""
+    from corev2.state import SyncStateStore
+    from corev2.tests.unit.conftest import build_config
+    
+    hs_client = MagicMock(spec=HubSpotClient)
+    mc_client = MagicMock(spec=MailchimpClient)
+    hs_client.get_list_membership_ids = _membership_mock({"987": ["1"]})
+    hs_client.batch_read_contacts = AsyncMock(return_value={
+        "1": {"id": "1", "properties": {"email": "one@example.com", "firstname": "One"}},
+    })
+    mc_client.get_all_members = _audience_mock([])
+    config = build_config(safety={"run_mode": "test", "enable_hubspot_writes": False})
+    
+    with SyncStateStore(tmp_path / "state.db") as store:
+        first = await SyncPlanner(config, hs_client, mc_client, state_store=store).generate_plan()
+        state = first["operations"][0]["state"]
+        store.record([{"email": "one@example.com", "vid": "1", **state}])
+        
+        member = _pushed_member("one@example.com", state)
+        if drift == "untagged":
+            member["tags"] = []
+        elif drift == "renamed":
+            member["merge_fields"]["FNAME"] = "Uno"
+        elif drift == "archived":
+            member["status"] = "archived"
+        else:
+            config = build_config(safety={"run_mode": "test", "enable_hubspot_writes": True})
+        mc_client.get_all_members = _audience_mock([member])
+        
+        second = await SyncPlanner(config, hs_client, mc_client, state_store=store).generate_plan()
+    
+    assert second["summary"]["contacts_unchanged"] == 0
+    assert [entry["email"] for entry in second["operations"]] == ["one@example.com"]
+    if drift == "hubspot_writes":
+        assert [op["type"] for op in second["operations"][0]["operations"]] == ["update_hs_property"]
+
+
+@pytest.mark.asyncio
+async def test_live_lookups_run_concurrently_in_plan_order(caplog):
+    """Live get_member calls are bounded by planning_concurrency; plan and logs keep email order."""
+    import asyncio
+    from corev2.tests.unit.conftest import build_config
+    config = build_config(sync={"use_audience_snapshot": False, "planning_concurrency": 3})
+    
+    hs_client = MagicMock(spec=HubSpotClient)
+    mc_client = MagicMock(spec=MailchimpClient)
+    record_ids = [str(n) for n in range(8)]
+    hs_client.get_list_membership_ids = _membership_mock({"987": record_ids})
+    hs_client.batch_read_contacts = AsyncMock(return_value={
+        n: {"id": n, "properties": {"email": f"c{n}@example.com"}} for n in record_ids
+    })
+    
+    in_flight = peak = 0
+    
+    async def get_member(email):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later contacts finish first, so completion order differs from plan order
+        await asyncio.sleep(0.001 * (10 - int(email[1])))
+        in_flight -= 1
+        if email in ("c2@example.com", "c5@example.com"):
+            raise Exception("Mailchimp API error: 500 - boom")
+        return {"found": False, "status": None, "tags": [], "merge_fields": {}, "email_address": email}
+    
+    mc_client.get_member = get_member
+    
+    plan = await SyncPlanner(config, hs_client, mc_client).generate_plan()
+    
+    assert 1 < peak <= 3
+    assert [entry["email"] for entry in plan["operations"]] == [
+        f"c{n}@example.com" for n in range(8) if n not in (2, 5)
+    ]
+    failed_reads = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Failed to fetch")]
+    assert [message.split(" for ")[0].rsplit(" ", 1)[1] for message in failed_reads] == [
+        "c2@example.com", "c5@example.com"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_single_contact_plan_skips_list_and_audience_scans():
+    """--only-email resolves the contact directly; archival only looks at its own member."""
+    from corev2.tests.unit.conftest import build_config
+    config = build_config(safety={"run_mode": "test", "allow_archive": True})
+    
+    hs_client = MagicMock(spec=HubSpotClient)
+    mc_client = MagicMock(spec=MailchimpClient)
+    hs_client.get_contact_by_email = AsyncMock(return_value={
+        "found": True, "vid": 42, "email": "gone@example.com",
+        "properties": {"email": "gone@example.com", "firstname": "Gone"}
+    })
+    # 717 (active deals) excludes the contact; 5555 is not a list the rules scan
+    hs_client.get_contact_list_ids = AsyncMock(return_value={"987", "717", "5555"})
+    mc_client.get_member = AsyncMock(return_value={
+        "found": True, "status": "subscribed", "tags": ["General Single"],
+        "merge_fields": {}, "email_address": "gone@example.com"
+    })
+    
+    plan = await SyncPlanner(config, hs_client, mc_client).generate_plan(only_email="gone@example.com")
+    
+    hs_client.get_list_membership_ids.assert_not_called()
+    mc_client.get_all_members.assert_not_called()
+    hs_client.get_contact_list_ids.assert_awaited_once_with("42")
+    assert len(plan["operations"]) == 1
+    assert [(op["type"], op.get("list_id")) for op in plan["operations"][0]["operations"]] == [
+        ("unsubscribe_mc_member", None), ("remove_mc_tag", None),
+        ("archive_mc_member", None), ("remove_hs_from_list", "987"),
+    ]
+    assert plan["summary"]["total_contacts_scanned"] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("contact", [
+    {"found": False},
+    {"found": True, "vid": 42, "email": "orphan@example.com", "properties": {"email": "orphan@example.com"}},
+])
+async def test_single_contact_plan_archives_unplanned_member(contact):
+    """A contact no scanned list holds (or not in HubSpot) is archived as the orphan a full plan sees."""
+    from corev2.tests.unit.conftest import build_config
+    config = build_config(safety={"run_mode": "test", "allow_archive": True})
+    
+    hs_client = MagicMock(spec=HubSpotClient)
+    mc_client = MagicMock(spec=MailchimpClient)
+    hs_client.get_contact_by_email = AsyncMock(return_value=contact)
+    hs_client.get_contact_list_ids = AsyncMock(return_value={"5555"})
+    mc_client.get_member = AsyncMock(return_value={
+        "found": True, "status": "subscribed", "tags": ["General Single"],
+        "merge_fields": {}, "email_address": "orphan@example.com"
+    })
+    
+    plan = await SyncPlanner(config, hs_client, mc_client).generate_plan(only_email="orphan@example.com")
+    
+    mc_client.get_member.assert_awaited_once_with("orphan@example.com")
+    assert [entry["email"] for entry in plan["operations"]] == ["orphan@example.com"]
+    assert [op["type"] for op in plan["operations"][0]["operations"]] == [
+        "unsubscribe_mc_member", "remove_mc_tag", "archive_mc_member"
+    ]
+    assert plan["summary"]["total_contacts_scanned"] == 0
+
+
+@pytest.mark.asyncio
+async def test_archived_member_keeps_its_source_tag(v2_config):
+    """Archived members are in the snapshot: first-tag priority holds when the upsert restores them."""
+    hs_client = MagicMock(spec=HubSpotClient)
+    mc_client = MagicMock(spec=MailchimpClient)
+    
+    hs_client.get_list_membership_ids = _membership_mock({"987": ["1"]})
+    hs_client.batch_read_contacts = AsyncMock(return_value={
+        "1": {"id": "1", "properties": {"email": "back@example.com", "firstname": "Back"}},
+    })
+    
+    async def mock_get_all_members(count=1000, offset=0, status=None, **kwargs):
+        # The default listing never includes archived members
+        if status == "archived":
+            yield {"email_address": "back@example.com", "status": "archived",
+                   "tags": ["Recruitment"], "merge_fields": {"FNAME": "Back"}}
+    
+    mc_client.get_all_members = mock_get_all_members
+    mc_client.get_member = AsyncMock()
+    
+    plan = await SyncPlanner(v2_config, hs_client, mc_client).generate_plan()
+    
+    mc_client.get_member.assert_not_awaited()
+    operations = plan["operations"][0]["operations"]
+    upsert = next(op for op in operations if op["type"] == "upsert_mc_member")
+    assert upsert["mc_status"] == "archived"
+    # No second source tag: the restored member keeps Recruitment, General Single is not applied
+    assert [op for op in operations if op["type"] in ("apply_mc_tag", "remove_mc_tag")] == []
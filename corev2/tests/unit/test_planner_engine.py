@@ -0,0 +1,110 @@
+"""Unit tests for the offline planning engine."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from corev2.clients.hubspot_client import HubSpotClient
+from corev2.clients.mailchimp_client import MailchimpClient
+from corev2.planner.planner_engine import (
+    HubSpotSnapshot, MailchimpSnapshot, PlannerEngine, load_snapshots, save_snapshots
+)
+from corev2.planner.primary import SyncPlanner
+from corev2.tests.unit.conftest import build_config
+
+
+def _contact(vid, email, list_ids, **properties):
+    return {"vid": vid, "email": email, "properties": {"email": email, **properties}, "list_ids": set(list_ids)}
+
+
+def _hubspot(*contacts):
+    return HubSpotSnapshot(contacts={contact["email"]: contact for contact in contacts})
+
+
+def _without_timestamp(plan):
+    return {**plan, "metadata": {k: v for k, v in plan["metadata"].items() if k != "generated_at"}}
+
+
+def test_engine_plans_from_snapshots_and_replays_saved_inputs(tmp_path):
+    """Planning is a pure function of the snapshots: a saved copy re-plans identically."""
+    engine = PlannerEngine(build_config())
+    hubspot = _hubspot(
+        _contact("1", "one@example.com", {"987"}, firstname="One"),
+        _contact("2", "two@example.com", {"784"}, firstname="Two"),
+        _contact("3", "three@example.com", {"969"}),
+    )
+    mailchimp = MailchimpSnapshot.from_audience([
+        {"email_address": "ONE@example.com", "status": "subscribed", "tags": ["Recruitment"], "merge_fields": {}},
+    ])
+    mailchimp.lookup_errors["three@example.com"] = "500 - server error"
+
+    plan = engine.plan(hubspot, mailchimp)
+
+    ops_by_email = {entry["email"]: entry["operations"] for entry in plan["operations"]}
+    # First-tag priority keeps the existing (already active) source tag; STRICT MODE skips the failed read
+    assert [op["type"] for op in ops_by_email["one@example.com"]] == ["upsert_mc_member", "update_hs_property"]
+    assert plan["summary"]["noops_skipped"] == {"tag_already_active": 1}
+    assert [op["tag"] for op in ops_by_email["two@example.com"] if op["type"] == "apply_mc_tag"] == [
+        "General Single", "Manual Inclusion"
+    ]
+    assert "three@example.com" not in ops_by_email
+
+    save_snapshots(tmp_path / "snapshots.json", hubspot, mailchimp)
+    replay = engine.plan(*load_snapshots(tmp_path / "snapshots.json"))
+    assert _without_timestamp(replay) == _without_timestamp(plan)
+
+
+def test_engine_archives_excluded_contacts_and_removes_them_from_sync_lists():
+    """Excluded contacts in Mailchimp are archived; those not in Mailchimp only leave the HubSpot lists."""
+    engine = PlannerEngine(build_config(safety={"run_mode": "test", "allow_archive": True}))
+    hubspot = _hubspot(
+        _contact("1", "gone@example.com", {"987", "717"}),
+        _contact("2", "never@example.com", {"719", "717"}),
+    )
+    mailchimp = MailchimpSnapshot.from_audience([
+        {"email_address": "gone@example.com", "status": "unsubscribed", "tags": ["General Single"], "merge_fields": {}},
+    ])
+
+    plan = engine.plan(hubspot, mailchimp)
+
+    # One entry per contact; the list removal follows the archive once
+    entries = [(entry["email"], [(op["type"], op.get("list_id")) for op in entry["operations"]])
+               for entry in plan["operations"]]
+    assert entries == [
+        ("gone@example.com", [("remove_mc_tag", None), ("archive_mc_member", None), ("remove_hs_from_list", "987")]),
+        ("never@example.com", [("remove_hs_from_list", "719")]),
+    ]
+    assert plan["summary"]["operations_by_type"] == {
+        "remove_mc_tag": 1, "archive_mc_member": 1, "remove_hs_from_list": 2
+    }
+    assert plan["summary"]["contacts_with_operations"] == 2
+    assert plan["metadata"]["reconciliation"]["archive_operations_generated"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_planner_is_fetch_then_plan(v2_config):
+    """SyncPlanner's plan is exactly the engine's plan of the snapshots it fetched."""
+    hs_client = MagicMock(spec=HubSpotClient)
+    mc_client = MagicMock(spec=MailchimpClient)
+
+    async def membership_ids(list_id, limit=100):
+        for record_id in {"987": ["1", "2"], "762": ["3"]}.get(list_id, []):
+            yield record_id
+
+    async def all_members(count=1000, offset=0, status=None, **kwargs):
+        yield {"email_address": "one@example.com", "status": "subscribed", "tags": [], "merge_fields": {}}
+
+    hs_client.get_list_membership_ids = membership_ids
+    hs_client.batch_read_contacts = AsyncMock(return_value={
+        "1": {"id": "1", "properties": {"email": "one@example.com"}},
+        "2": {"id": "2", "properties": {"email": "two@example.com"}},
+        "3": {"id": "3", "properties": {"email": "optout@example.com"}},
+    })
+    mc_client.get_all_members = all_members
+
+    planner = SyncPlanner(v2_config, hs_client, mc_client)
+    plan = await planner.generate_plan()
+
+    hubspot, mailchimp, _ = planner.snapshots
+    # Only contacts with a target tag need Mailchimp state (compliance contact is not read)
+    assert set(mailchimp.members) == {"one@example.com", "two@example.com"}
+    assert mailchimp.members["two@example.com"]["found"] is False
+    assert _without_timestamp(PlannerEngine(v2_config).plan(hubspot, mailchimp)) == _without_timestamp(plan)
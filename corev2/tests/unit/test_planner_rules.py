@@ -0,0 +1,89 @@
+"""Unit tests for compiled planner rules."""
+
+from unittest.mock import MagicMock
+from corev2.clients.hubspot_client import HubSpotClient
+from corev2.clients.mailchimp_client import MailchimpClient
+from corev2.planner.primary import SyncPlanner
+from corev2.planner.rules import GROUP_PRIORITY, compile_rules, parse_condition
+from corev2.tests.unit.conftest import build_config
+
+
+def _planner(config):
+    return SyncPlanner(config, MagicMock(spec=HubSpotClient), MagicMock(spec=MailchimpClient))
+
+
+def test_parse_condition_gt():
+    greater_than_one = parse_condition("gt:1")
+
+    assert greater_than_one("2")
+    assert not greater_than_one("1")
+    assert not greater_than_one("")
+    assert not greater_than_one("many")
+    assert not parse_condition("gt:x")("5")
+    assert not parse_condition("lt:3")("1")
+
+
+def test_compiled_rules_index_config():
+    rules = compile_rules(build_config())
+
+    assert [group.name for group in rules.groups] == list(GROUP_PRIORITY)
+    assert rules.groups[0].lists == ("969", "719", "987")
+    assert rules.groups[2].exclude == frozenset({"762", "773"})
+    assert rules.lists_by_id["784"].additional_tags == ["Manual Inclusion"]
+    assert rules.sync_list_ids == frozenset({"969", "719", "987", "784", "1032"})
+    assert rules.exclusion_list_ids == frozenset({"762", "773", "717"})
+    assert rules.deal_exit_list_ids == frozenset({"717"})
+    assert "General Multi" in rules.source_tags
+    assert rules.fetch_properties[-1] == "branches"
+    assert rules.first_excluding_group({"987", "717"}).name == "general_marketing"
+    assert rules.first_excluding_group({"987"}) is None
+
+
+def test_compiled_rules_cached_per_config_hash():
+    config = build_config()
+
+    assert compile_rules(config) is compile_rules(build_config())
+    assert compile_rules(config) is not compile_rules(build_config(list_exclusion_rules={"987": ["784"]}))
+
+
+def test_target_tag_decisions_use_compiled_rules():
+    planner = _planner(build_config())
+
+    # Group 1 excluded by active deals → falls through to group 3 (manual override)
+    assert planner._determine_target_tag({"987", "784", "717"}, "m@example.com") == [
+        "General Single", "Manual Inclusion"
+    ]
+    # First list of the group wins, override applies on a matching property
+    assert planner._determine_target_tag({"987", "719"}, "o@example.com", {"branches": "3"}) == ["General Multi"]
+    assert planner._determine_target_tag({"987"}, "s@example.com", {"branches": {"value": "1"}}) == ["General Single"]
+    assert planner._determine_target_tag({"762", "784"}, "x@example.com") is None
+
+
+def test_membership_masks_decide_groups_compliance_and_exclusions():
+    rules = compile_rules(build_config())
+
+    assert rules.encode({"987", "unknown"}) == rules.encode({"987"})
+
+    decision = rules.decide(rules.encode({"987", "784", "717"}))
+    assert decision.target_group == "manual_override"
+    assert decision.target_list == "784"
+    assert decision.excluded_groups == ("general_marketing",)
+    assert decision.excluding_group.name == "general_marketing"
+    assert not decision.compliance
+
+    compliance = rules.decide(rules.encode({"762", "969"}))
+    assert compliance.compliance and compliance.in_sync_list
+    assert compliance.target_list is None
+
+
+def test_decide_all_evaluates_each_distinct_mask_once():
+    rules = compile_rules(build_config())
+    population = [{"987"}, {"719", "987"}, {"987"}, {"1032", "717"}] * 50
+    masks = [rules.encode(list_ids) for list_ids in population]
+
+    decisions = rules.decide_all(masks)
+
+    assert len(decisions) == 3
+    assert decisions[masks[1]].target_list == "719"
+    assert decisions[masks[3]].target_list is None
+    assert decisions[masks[3]].excluding_group.name == "general_marketing"
@@ -0,0 +1,251 @@
+"""Unit tests for the adaptive (AIMD) rate limiter, the 429 pause gate and retry budgets/deadlines."""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from corev2.clients.http_base import (
+    AdaptiveTokenBucket, HTTPBaseClient, PauseGate, RetryBudget, RetryBudgetExhausted, TokenBucket
+)
+from corev2.clients.hubspot_client import HubSpotClient
+
+
+def test_additive_increase_capped_at_ceiling():
+    bucket = AdaptiveTokenBucket(rate=9.0, capacity=20.0, min_rate=1.0, max_rate=10.0, increase=0.5)
+    
+    bucket.record_success()
+    assert bucket.rate == 9.5
+    bucket.record_success()
+    bucket.record_success()
+    assert bucket.rate == 10.0
+
+
+def test_throttle_halves_rate_down_to_floor():
+    bucket = AdaptiveTokenBucket(rate=8.0, capacity=20.0, min_rate=3.0, max_rate=10.0)
+    
+    bucket.record_throttle()
+    assert bucket.rate == 4.0
+    assert bucket.tokens == 0.0
+    bucket.record_throttle()
+    assert bucket.rate == 3.0
+    assert bucket.metrics() == {"rate": 3.0, "ceiling": 10.0, "throttles": 2}
+
+
+def test_quota_lowers_ceiling_and_backs_off_when_nearly_spent():
+    bucket = AdaptiveTokenBucket(rate=40.0, capacity=80.0, min_rate=1.0, max_rate=50.0)
+    
+    bucket.observe_quota(remaining=150, maximum=190, interval_seconds=10.0)
+    assert bucket.ceiling == 19.0
+    assert bucket.rate == 19.0
+    
+    bucket.observe_quota(remaining=5, maximum=190, interval_seconds=10.0)
+    assert bucket.rate == 9.5
+
+
+def test_quota_backs_off_once_per_window():
+    """The last responses of a window all report low remaining - only the first one cuts the rate."""
+    bucket = AdaptiveTokenBucket(rate=10.0, capacity=20.0, min_rate=1.0, max_rate=10.0)
+    
+    with patch("corev2.clients.http_base.time.monotonic", return_value=1000.0):
+        for remaining in range(10, -1, -1):
+            bucket.observe_quota(remaining=remaining, maximum=100, interval_seconds=10.0)
+    assert bucket.rate == 5.0
+    
+    # Next window, still nearly spent → one more decrease
+    with patch("corev2.clients.http_base.time.monotonic", return_value=1010.0):
+        bucket.observe_quota(remaining=5, maximum=100, interval_seconds=10.0)
+        bucket.observe_quota(remaining=4, maximum=100, interval_seconds=10.0)
+    assert bucket.rate == 2.5
+
+
+def test_fixed_rate_client_keeps_plain_bucket():
+    client = HTTPBaseClient(service_name="Test", base_url="https://api.test.com", rate_limit=10.0)
+    
+    assert type(client.rate_limiter) is TokenBucket
+    assert client.rate_limit_metrics() is None
+
+
+def test_hubspot_reads_rate_limit_headers():
+    client = HubSpotClient(api_key="test", rate_limit=10.0, adaptive_rate=True, max_rate=50.0)
+    
+    client._observe_rate_limit(200, {
+        "X-HubSpot-RateLimit-Remaining": "180",
+        "X-HubSpot-RateLimit-Max": "190",
+        "X-HubSpot-RateLimit-Interval-Milliseconds": "10000",
+    })
+    
+    metrics = client.rate_limit_metrics()
+    assert metrics["ceiling"] == 19.0
+    assert metrics["rate"] == pytest.approx(10.1)
+    
+    client._observe_rate_limit(429, {})
+    assert client.rate_limit_metrics()["throttles"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pause_gate_blocks_then_staggers_release():
+    gate = PauseGate(release_interval=0.02)
+    gate.pause(0.05)
+    
+    start = time.monotonic()
+    released = []
+    
+    async def caller():
+        await gate.wait()
+        released.append(time.monotonic() - start)
+    
+    await asyncio.gather(*(caller() for _ in range(3)))
+    
+    assert min(released) >= 0.045
+    assert max(released) - min(released) >= 0.035  # released 0.02s apart, not all at once
+
+
+@pytest.mark.asyncio
+async def test_pause_never_shortens_active_window():
+    gate = PauseGate()
+    gate.pause(10.0)
+    gate.pause(0.01)
+    
+    assert gate.paused_until - time.monotonic() > 9.0
+    assert gate.pauses == 1
+
+
+class _Response:
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self.request_info = MagicMock()
+        self.history = []
+    
+    async def json(self, loads=None):
+        return {"ok": True}
+    
+    async def text(self):
+        return ""
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *args):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_429_pauses_other_requests_on_the_client():
+    """One 429 holds back concurrent requests until Retry-After passes."""
+    client = HTTPBaseClient(service_name="Test", base_url="https://api.test.com")
+    sent = []
+    
+    def request(method, url, **kwargs):
+        sent.append((url, time.monotonic()))
+        if len(sent) == 1:
+            return _Response(429, {"Retry-After": "0.1"})
+        return _Response(200)
+    
+    async with client:
+        with patch.object(client.session, "request", side_effect=request):
+            first = asyncio.create_task(client.get("/first"))
+            await asyncio.sleep(0.01)  # first request has hit the 429
+            results = await asyncio.gather(first, client.get("/second"))
+    
+    assert [r["status"] for r in results] == [200, 200]
+    assert client.pause_gate.pauses == 1
+    throttled_at = sent[0][1]
+    assert all(at - throttled_at >= 0.09 for _, at in sent[1:])
+
+
+def test_retry_budget_caps_retries_at_share_of_requests():
+    budget = RetryBudget(ratio=0.2, window=60.0, min_retries=1)
+    for _ in range(10):
+        budget.record_request()
+    
+    assert budget.try_retry()
+    assert budget.try_retry()
+    assert not budget.try_retry()  # 2 retries = 20% of 10 requests
+    assert budget.metrics() == {"requests": 10, "retries": 2, "exhausted": 1}
+
+
+def test_retry_budget_window_slides():
+    budget = RetryBudget(ratio=0.1, window=0.05, min_retries=1)
+    budget.record_request()
+    assert budget.try_retry()
+    assert not budget.try_retry()
+    
+    time.sleep(0.06)
+    assert budget.try_retry()
+
+
+@pytest.mark.asyncio
+async def test_exhausted_retry_budget_fails_fast_instead_of_sleeping():
+    client = HTTPBaseClient(service_name="Test", base_url="https://api.test.com",
+                            retry_budget=RetryBudget(ratio=0.1, min_retries=0))
+    sent = []
+    
+    def request(method, url, **kwargs):
+        sent.append(url)
+        return _Response(503)
+    
+    async with client:
+        with patch.object(client.session, "request", side_effect=request), \
+             patch.object(client, "_calculate_backoff", return_value=30.0):
+            started = time.monotonic()
+            with pytest.raises(RetryBudgetExhausted, match="retry budget exhausted"):
+                await client.get("/flaky")
+    
+    assert time.monotonic() - started < 1.0
+    assert len(sent) == 1
+    assert client.retry_budget_metrics()["exhausted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_past_request_deadline_fails_fast():
+    """A backoff that would end after the request deadline raises instead of sleeping."""
+    client = HTTPBaseClient(service_name="Test", base_url="https://api.test.com", request_deadline=5.0)
+    
+    async with client:
+        with patch.object(client.session, "request", side_effect=lambda *a, **k: _Response(500)), \
+             patch.object(client, "_calculate_backoff", return_value=10.0):
+            started = time.monotonic()
+            with pytest.raises(RetryBudgetExhausted, match="deadline"):
+                await client.get("/slow")
+    
+    assert time.monotonic() - started < 1.0
+
+
+@pytest.mark.asyncio
+async def test_request_deadline_caps_attempt_timeout():
+    client = HTTPBaseClient(service_name="Test", base_url="https://api.test.com", request_deadline=5.0)
+    seen = {}
+    
+    def request(method, url, **kwargs):
+        seen.update(kwargs)
+        return _Response(200)
+    
+    async with client:
+        with patch.object(client.session, "request", side_effect=request):
+            await client.get("/ok")
+    
+    assert 4.0 < seen["timeout"].total <= 5.0
+
+
+@pytest.mark.asyncio
+async def test_pause_outlasting_deadline_fails_fast():
+    client = HTTPBaseClient(service_name="Test", base_url="https://api.test.com", request_deadline=1.0)
+    client.pause_gate.pause(30.0)
+    
+    async with client:
+        with pytest.raises(RetryBudgetExhausted, match="pause"):
+            await client.get("/paused")
+
+
+@pytest.mark.asyncio
+async def test_requests_fail_fast_once_run_budget_is_used():
+    client = HTTPBaseClient(service_name="Test", base_url="https://api.test.com",
+                            run_deadline=time.monotonic() - 1)
+    
+    async with client:
+        with patch.object(client.session, "request") as request:
+            with pytest.raises(RetryBudgetExhausted, match="run time budget"):
+                await client.post("/write", json={})
+    
+    request.assert_not_called()
@@ -0,0 +1,106 @@
+"""Unit tests for single-flight GETs and the response cache in HTTPBaseClient."""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+from corev2.clients.http_base import HTTPBaseClient
+from corev2.clients.hubspot_client import HubSpotClient
+
+
+class _Response:
+    def __init__(self, status=200, data=None, delay=0.0):
+        self.status = status
+        self.headers = {}
+        self.request_info = MagicMock()
+        self.history = []
+        self._data = data if data is not None else {"n": 1}
+        self._delay = delay
+    
+    async def json(self, loads=None):
+        await asyncio.sleep(self._delay)
+        return self._data
+    
+    async def text(self):
+        return ""
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *args):
+        pass
+
+
+def _counting_request(sent, delay=0.0):
+    def request(method, url, **kwargs):
+        sent.append((method, url, kwargs.get("params")))
+        return _Response(data={"n": len(sent)}, delay=delay)
+    return request
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_gets_share_one_request():
+    client = HTTPBaseClient(service_name="Test", base_url="https://api.test.com")
+    sent = []
+    
+    async with client:
+        with patch.object(client.session, "request", side_effect=_counting_request(sent, delay=0.02)):
+            results = await asyncio.gather(
+                client.get("/lists/1/members/abc"),
+                client.get("/lists/1/members/abc"),
+                client.get("/lists/1/members/abc", params={"fields": "status"}),
+            )
+    
+    assert len(sent) == 2  # params differ for the third GET
+    assert results[0] == results[1]
+    assert results[0] is not results[1]  # joiners get their own copy
+    assert client.metrics.summary()["coalesced"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_reuses_gets_until_the_resource_is_written():
+    client = HTTPBaseClient(service_name="Test", base_url="https://api.test.com", response_cache_ttl=60.0)
+    sent = []
+    
+    async with client:
+        with patch.object(client.session, "request", side_effect=_counting_request(sent)):
+            first = await client.get("/lists/1/members/abc")
+            again = await client.get("/lists/1/members/abc")
+            other = await client.get("/lists/1/members/def")
+            await client.post("/lists/1/members/abc/tags", json={"tags": []})
+            after_write = await client.get("/lists/1/members/abc")
+            other_again = await client.get("/lists/1/members/def")
+    
+    assert first["data"] == again["data"] == {"n": 1}
+    assert after_write["data"] == {"n": 4}  # refetched after the tags write
+    assert other_again["data"] == other["data"]  # unrelated member still cached
+    assert client.metrics.summary()["cache_hits"] == 2
+
+
+def test_hubspot_contact_write_invalidates_email_keyed_reads():
+    client = HubSpotClient(api_key="test", response_cache_ttl=60.0)
+    client._response_cache[("/crm/v3/objects/contacts/a@example.com", True, "{}")] = (float("inf"), {})
+    
+    client._invalidate("/crm/v3/objects/contacts/batch/read")
+    assert len(client._response_cache) == 1
+    
+    client._invalidate("/crm/v3/objects/contacts/123")
+    assert client._response_cache == {}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_owner_does_not_cancel_joiners():
+    client = HTTPBaseClient(service_name="Test", base_url="https://api.test.com")
+    sent = []
+    
+    async with client:
+        with patch.object(client.session, "request", side_effect=_counting_request(sent, delay=0.05)):
+            owner = asyncio.create_task(client.get("/lists/1/members/abc"))
+            await asyncio.sleep(0.01)
+            joiners = asyncio.gather(client.get("/lists/1/members/abc"), client.get("/lists/1/members/abc"))
+            await asyncio.sleep(0.01)
+            owner.cancel()
+            results = await joiners
+    
+    assert owner.cancelled()
+    assert len(sent) == 2  # the joiners re-issue the request once, together
+    assert results[0]["data"] == results[1]["data"] == {"n": 2}
@@ -0,0 +1,68 @@
+"""Unit tests for the sync state store."""
+
+from corev2.state import SyncStateStore, contact_fingerprint
+
+
+def _entry(email, fingerprint="abc"):
+    return {
+        "email": email,
+        "vid": 1001,
+        "fingerprint": fingerprint,
+        "lists": ["987", "784"],
+        "properties": {"firstname": "Ann"},
+        "merge_fields": {"FNAME": "Ann", "LNAME": ""},
+        "tags": ["General Single"],
+    }
+
+
+def test_record_and_get_roundtrip(tmp_path):
+    """Recorded state is readable offline, keyed by lowercase email."""
+    with SyncStateStore(tmp_path / "state.db") as store:
+        store.record([_entry("Ann@Example.com")])
+
+        state = store.get("ann@example.com")
+        assert state["vid"] == "1001"
+        assert state["lists"] == ["784", "987"]
+        assert state["merge_fields"] == {"FNAME": "Ann", "LNAME": ""}
+        assert state["tags"] == ["General Single"]
+        assert store.get("nobody@example.com") is None
+
+
+def test_store_uses_wal_and_persists(tmp_path):
+    path = tmp_path / "state.db"
+    with SyncStateStore(path) as store:
+        assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        store.record([_entry("ann@example.com", "v1")])
+        store.record([_entry("ann@example.com", "v2")])
+
+    with SyncStateStore(path) as store:
+        assert len(store) == 1
+        assert store.fresh_fingerprints() == {"ann@example.com": "v2"}
+
+
+def test_fresh_fingerprints_respects_max_age(tmp_path):
+    with SyncStateStore(tmp_path / "state.db") as store:
+        store.record([_entry("ann@example.com")])
+        store.conn.execute("UPDATE contact_state SET synced_at = '2000-01-01T00:00:00'")
+
+        assert store.fresh_fingerprints(max_age_hours=24) == {}
+        assert store.fresh_fingerprints(max_age_hours=0) == {"ann@example.com": "abc"}
+
+
+def test_forget_drops_contact(tmp_path):
+    with SyncStateStore(tmp_path / "state.db") as store:
+        store.record([_entry("ann@example.com")])
+        store.forget(["ANN@example.com"])
+        assert len(store) == 0
+
+
+def test_fingerprint_ignores_list_order_and_tracks_changes():
+    base = contact_fingerprint(["987", "784"], {"firstname": "Ann"}, "cfg1")
+    assert base == contact_fingerprint(["784", "987"], {"firstname": "Ann"}, "cfg1")
+    assert base != contact_fingerprint(["987"], {"firstname": "Ann"}, "cfg1")
+    assert base != contact_fingerprint(["987", "784"], {"firstname": "Anne"}, "cfg1")
+    assert base != contact_fingerprint(["987", "784"], {"firstname": "Ann"}, "cfg2")
+    assert base != contact_fingerprint(["987", "784"], {"firstname": "Ann"}, "cfg1", tags=["General Single"])
+    assert base != contact_fingerprint(["987", "784"], {"firstname": "Ann"}, "cfg1", merge_fields={"FNAME": "Ann"})
+    assert base != contact_fingerprint(["987", "784"], {"firstname": "Ann"}, "cfg1",
+                                       safety={"enable_hubspot_writes": True})